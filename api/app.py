@@ -2,9 +2,12 @@
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.views import router
+from api.views import router, admin_router
+from api.executors import shutdown_executors
+from api.services.admin_services import start_version_sync
 
-from media_rs.utils.data_cache import DataCache
+from media_rs.utils.data_cache import get_data_cache
+from media_rs.serving.recommender.registry import get_model_registry
 
 app = FastAPI(title="Media Recommender API")
 
@@ -26,11 +29,18 @@ app.add_middleware(
 )
 
 app.include_router(router)
+app.include_router(admin_router)
 
 # Startup event
 @app.on_event("startup")
 async def startup_event():
-    global cache
-    cache = DataCache(repo_id=os.getenv("HF_REPO_ID"))
-    cache.warmup()  # if warmup is async; otherwise just cache.warmup()
-    print("DataCache warmup finished")
\ No newline at end of file
+    # No reference kept here, a reload must be able to free the old version
+    get_data_cache()
+    print("DataCache warmup finished")
+    get_model_registry().warmup()
+    start_version_sync()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_executors()
+    get_model_registry().close()
@@ -0,0 +1,132 @@
+# executors.py
+import os
+import asyncio
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+class ExecutorSaturated(RuntimeError):
+    """
+    Raised when a request arrives at an executor whose queue is full.
+    """
+
+
+class BoundedExecutor:
+    """
+    Thread pool for one class of blocking request work, with a limit on
+    how many calls may wait for a thread.
+
+    Calls beyond `max_workers + max_queue` in flight are rejected straight
+    away with ExecutorSaturated instead of queueing without bound, so an
+    overloaded endpoint sheds load while others keep their latency.
+    """
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        """
+        Initialisation
+
+        Args:
+            name (str): Name of the pool, used in thread names and errors
+            max_workers (int): Threads running calls
+            max_queue (int): Calls allowed to wait for a free thread
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.capacity = self.max_workers + max(0, max_queue)
+
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run func(*args, **kwargs) on the pool and await its result.
+
+        Raises:
+            ExecutorSaturated: If the pool and its queue are full
+        """
+        with self.lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise ExecutorSaturated(f"{self.name} executor is saturated, retry later")
+            self.in_flight += 1
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"api-{self.name}"
+                )
+            executor = self.executor
+
+        try:
+            future = executor.submit(func, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+
+        # Released when the call finishes, even if the client went away
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    def _release(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "workers": self.max_workers,
+                "capacity": self.capacity,
+                "in_flight": self.in_flight,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ----------------------------------------------------------------------
+# Executors of the heavy endpoints
+# ----------------------------------------------------------------------
+
+# SBERT encoding of free-text descriptions. Each worker blocks on one
+# description until its batch is encoded, so the workers cap how many reach
+# the BatchingEncoder at once, by default enough to fill SBERT_BATCH_SIZE.
+ENCODE_EXECUTOR = BoundedExecutor(
+    "encode",
+    max_workers=_env_int("API_ENCODE_WORKERS", _env_int("SBERT_BATCH_SIZE", 32)),
+    max_queue=_env_int("API_ENCODE_QUEUE", 32)
+)
+
+# User-CF search and aggregation, alone or as part of hybrid
+COLLAB_EXECUTOR = BoundedExecutor(
+    "collab",
+    max_workers=_env_int("API_COLLAB_WORKERS", 4),
+    max_queue=_env_int("API_COLLAB_QUEUE", 64)
+)
+
+# Metadata and title search from external services, mostly waiting on I/O
+METADATA_EXECUTOR = BoundedExecutor(
+    "metadata",
+    max_workers=_env_int("API_METADATA_WORKERS", 16),
+    max_queue=_env_int("API_METADATA_QUEUE", 64)
+)
+
+EXECUTORS = (ENCODE_EXECUTOR, COLLAB_EXECUTOR, METADATA_EXECUTOR)
+
+
+def executor_stats() -> Dict[str, Dict[str, int]]:
+    return {e.name: e.stats() for e in EXECUTORS}
+
+
+def shutdown_executors():
+    for e in EXECUTORS:
+        e.shutdown()
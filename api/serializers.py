@@ -1,9 +1,16 @@
 # serializers.py
-from typing import List, Literal
+import os
+
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field, model_validator
 
 Embedding = Literal["SBERT", "TFIDF"]
 Medium = Literal["movies", "books"]
+Normalization = Literal["none", "minmax", "zscore", "rrf"]
+
+# Largest number of profiles in one user-CF batch request, bigger jobs are
+# split into several requests
+USER_CF_BATCH_MAX_PROFILES = int(os.getenv("USER_CF_BATCH_MAX_PROFILES", "256"))
 # -----------------------------
 # Input models
 # -----------------------------
@@ -32,6 +39,16 @@ class UserCFInput(BaseModel):
     k_similar_users: int = Field(50, ge=1)
     embedding_method: Embedding = "SBERT"
 
+class ReloadInput(BaseModel):
+    revision: Optional[str] = None
+
+class UserCFBatchInput(BaseModel):
+    profiles: List[List[Rating]] = Field(..., min_length=1, max_length=USER_CF_BATCH_MAX_PROFILES)
+    medium: Medium
+    top_n: int = Field(10, ge=1)
+    k_similar_users: int = Field(50, ge=1)
+    embedding_method: Embedding = "SBERT"
+
 class HybridInput(BaseModel):
     title: str
     medium: Medium
@@ -41,6 +58,8 @@ class HybridInput(BaseModel):
     top_n: int = Field(10, ge=1)
     k_similar_users: int = Field(50, ge=1)
     embedding_method: Embedding = "SBERT"
+    candidate_pool: Optional[int] = Field(None, ge=1, le=1000)
+    normalization: Normalization = "none"
 
     @model_validator(mode="after")
     def check_alpha_beta(cls, model):
@@ -0,0 +1,93 @@
+import time
+import threading
+
+from media_rs.utils.data_cache import (
+    CACHE_SYNC_INTERVAL,
+    get_data_cache,
+    published_version,
+    reload_data_cache,
+    reload_in_progress,
+    sync_data_cache,
+)
+from media_rs.serving.recommender.registry import get_model_registry
+from api.executors import executor_stats
+
+from typing import Any, Dict, Optional
+
+# Outcome of the last background reload
+_RELOAD_STATUS: Dict[str, Any] = {"last_error": None, "previous_version": None}
+
+
+def get_version_info() -> Dict[str, Any]:
+    """
+    Service function to report the active artifact version.
+    """
+    return {
+        "version": get_data_cache().version,
+        "published_version": (published_version() or {}).get("version"),
+        "reloading": reload_in_progress(),
+        **_RELOAD_STATUS,
+    }
+
+
+def get_cache_metrics() -> Dict[str, Any]:
+    """
+    Service function to report DataCache load times and sizes, lookups of
+    each shared model, description-embedding cache hit rates, the component
+    latencies of the hybrid models and executor load.
+    """
+    registry = get_model_registry()
+    return {
+        **get_data_cache().metrics(),
+        "model_lookups": registry.lookup_counts(),
+        "embedding_caches": registry.embedding_cache_stats(),
+        "hybrid_timings": registry.hybrid_timings(),
+        "executors": executor_stats(),
+    }
+
+
+def start_reload(revision: Optional[str] = None):
+    """
+    Service function to reload artifacts in the background.
+
+    Raises:
+        RuntimeError: If a reload is already in progress
+    """
+    if reload_in_progress():
+        raise RuntimeError("DataCache reload already in progress")
+
+    def run():
+        previous = get_data_cache().version
+        try:
+            reload_data_cache(revision)
+            # Build the new version's models before traffic reaches them
+            get_model_registry().warmup()
+            _RELOAD_STATUS.update(last_error=None, previous_version=previous)
+        except Exception as e:
+            print(f"DataCache reload failed: {e}")
+            _RELOAD_STATUS.update(last_error=str(e))
+
+    threading.Thread(target=run, name="data-cache-reload", daemon=True).start()
+
+
+def start_version_sync(interval: float = CACHE_SYNC_INTERVAL):
+    """
+    Service function to make this worker follow versions published by
+    reloads in other workers, checking every interval seconds.
+    """
+    if interval <= 0:
+        return
+
+    def run():
+        while True:
+            time.sleep(interval)
+            previous = get_data_cache().version
+            try:
+                if sync_data_cache():
+                    get_model_registry().warmup()
+                    _RELOAD_STATUS.update(last_error=None, previous_version=previous)
+            except Exception as e:
+                print(f"DataCache version sync failed: {e}")
+                _RELOAD_STATUS.update(last_error=str(e))
+
+    threading.Thread(target=run, name="data-cache-sync", daemon=True).start()
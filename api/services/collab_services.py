@@ -1,9 +1,4 @@
-from media_rs.utils.item_index import ItemIndex
-from media_rs.serving.recommender.build.build_collab_model import (
-    get_item_cf_model,
-    get_user_cf_model
-)
-from media_rs.utils.data_cache import get_data_cache
+from media_rs.serving.recommender.registry import get_model_registry
 from media_rs.rs_types.rating import Rating, get_index_ratings
 from typing import List
 from media_rs.rs_types.model import EmbeddingMethod, Medium
@@ -13,14 +8,60 @@ def get_item_cf_recommendations(
     medium: Medium,
     top_n: int = 10
 ) -> List[str]:
-    cache = get_data_cache()
-    item_idx = ItemIndex(cache.get(f"{medium.value}/item_index.pkl"))
+    registry = get_model_registry()
+    item_idx = registry.item_index(medium)
     
-    rs = get_item_cf_model(cache=cache, medium=medium)
+    rs = registry.item_cf_model(medium)
 
     recommendations = rs.recommend(item_idx.title_to_idx(title), top_n=top_n)
     return [item_idx.idx_to_title(r[0]) for r in recommendations]
 
+def get_user_cf_recommendations_batch(
+    ratings_batch: List[List[Rating]],
+    top_n: int,
+    k_similar_users: int,
+    method: EmbeddingMethod,
+    medium: Medium
+) -> List[List[str]]:
+    """
+    Service function to get user-CF recommendations of many profiles.
+
+    Unknown titles are dropped from their profile, and a profile left
+    without valid ratings gets no recommendations, so one bad profile does
+    not fail the rest of the batch.
+    """
+    registry = get_model_registry()
+    item_idx = registry.item_index(medium)
+
+    positions = []
+    index_ratings_batch = []
+    for position, ratings in enumerate(ratings_batch):
+        index_ratings = {}
+        for r in ratings:
+            try:
+                index_ratings[item_idx.title_to_idx(r["name"])] = r["value"]
+            except ValueError:
+                continue
+        if index_ratings:
+            positions.append(position)
+            index_ratings_batch.append(index_ratings)
+
+    results: List[List[str]] = [[] for _ in ratings_batch]
+    if not index_ratings_batch:
+        return results
+
+    rs = registry.user_cf_model(medium, method)
+
+    recommendations_batch = rs.recommend_batch(
+        ratings_batch=index_ratings_batch,
+        top_n=top_n,
+        k_similar_users=k_similar_users
+    )
+
+    for position, recommendations in zip(positions, recommendations_batch):
+        results[position] = [item_idx.idx_to_title(r[0]) for r in recommendations]
+    return results
+
 def get_user_cf_recommendations(
     ratings: List[Rating],
     top_n: int,
@@ -28,14 +69,14 @@ def get_user_cf_recommendations(
     method: EmbeddingMethod,
     medium: Medium
 ) -> List[str]:
-    cache = get_data_cache()
-    item_idx = ItemIndex(cache.get(f"{medium.value}/item_index.pkl"))
+    registry = get_model_registry()
+    item_idx = registry.item_index(medium)
 
     index_ratings = get_index_ratings(ratings, item_idx)
     if not index_ratings:
         raise ValueError("No valid user ratings after normalization")
 
-    rs = get_user_cf_model(cache, method, medium)
+    rs = registry.user_cf_model(medium, method)
 
     recommendations = rs.recommend(
         ratings=index_ratings,
@@ -1,6 +1,4 @@
-from media_rs.serving.recommender.build.build_content_model import get_content_similarity_model
-from media_rs.utils.item_index import ItemIndex
-from media_rs.utils.data_cache import get_data_cache
+from media_rs.serving.recommender.registry import get_model_registry
 from media_rs.rs_types.model import EmbeddingMethod, Medium
 
 from typing import List
@@ -14,10 +12,10 @@ def get_content_recommendations(
     """
     Service function to get content-based recommendations.
     """
-    cache = get_data_cache()
-    item_idx = ItemIndex(cache.get(f"{medium.value}/item_index.pkl"))
+    registry = get_model_registry()
+    item_idx = registry.item_index(medium)
     
-    rs_content = get_content_similarity_model(cache, method, medium)
+    rs_content = registry.content_model(medium, method)
     
     recommendations = rs_content.recommend(item_idx.title_to_idx(title), top_n)
     return [item_idx.idx_to_title(r[0]) for r in recommendations]
@@ -31,10 +29,10 @@ def get_content_recommendations_from_description(
     """
     Service function to get content-based recommendations.
     """
-    cache = get_data_cache()
-    item_idx = ItemIndex(cache.get(f"{medium.value}/item_index.pkl"))
+    registry = get_model_registry()
+    item_idx = registry.item_index(medium)
     
-    rs_content = get_content_similarity_model(cache, method, medium)
+    rs_content = registry.content_model(medium, method)
     
     recommendations = rs_content.recommend_from_description(description, top_n)
     return [item_idx.idx_to_title(r[0]) for r in recommendations]
\ No newline at end of file
@@ -1,5 +1,5 @@
 import os
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 from typing import List, Dict, Any, Optional
 from fastapi import Response
 
@@ -16,13 +16,20 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 SUPABASE_MOVIE_TABLE = os.getenv("SUPABASE_MOVIE_TABLE")
 SUPABASE_BOOK_TABLE = os.getenv("SUPABASE_BOOK_TABLE")
 
+# Seconds before a Supabase query is abandoned
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "5"))
+
 rate_limiter = RateLimiter(
     max_requests=20, 
     window_seconds=1    
 )
 
 try:
-    client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    client = create_client(
+        SUPABASE_URL,
+        SUPABASE_KEY,
+        options=ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT)
+    )
     print("Supabase ping successful")
 except Exception as e:
     print("Supabase ping failed:", e)
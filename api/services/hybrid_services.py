@@ -1,13 +1,8 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from media_rs.utils.item_index import ItemIndex
-from media_rs.serving.recommender.build.build_hybrid_model import (
-    get_hybrid_model,
-    get_hybrid_embeddings
-)
-from media_rs.utils.data_cache import get_data_cache
+from media_rs.serving.recommender.registry import get_model_registry
 from media_rs.rs_types.rating import get_index_ratings
-from media_rs.rs_types.model import EmbeddingMethod, Medium
+from media_rs.rs_types.model import EmbeddingMethod, Medium, ScoreNormalization
 
 def get_hybrid_recommendations(
     title: str,
@@ -17,27 +12,27 @@ def get_hybrid_recommendations(
     top_n: int,
     k_similar_users: int,
     method: EmbeddingMethod,
-    medium: Medium
+    medium: Medium,
+    candidate_pool: Optional[int] = None,
+    normalization: ScoreNormalization = ScoreNormalization.NONE
 ) -> List[str]:
-    cache = get_data_cache()
-    item_idx = ItemIndex(cache.get(f"{medium.value}/item_index.pkl"))
+    registry = get_model_registry()
+    item_idx = registry.item_index(medium)
     
     index_ratings = get_index_ratings(ratings, item_idx)
     if not index_ratings:
         raise ValueError("No valid user ratings after normalization")
     
-    rs = get_hybrid_model(
-        cache=cache,
-        method=method,
-        medium=medium,
-        alpha=alpha, 
-        beta=beta
-    )
+    rs = registry.hybrid_model(medium, method)
     
     recommendations = rs.recommend(
         item_idx.title_to_idx(title), 
         index_ratings,
         k_similar_users,
         top_n,
+        alpha=alpha,
+        beta=beta,
+        candidate_pool=candidate_pool,
+        normalization=normalization
     )
     return [item_idx.idx_to_title(r[0]) for r in recommendations]
\ No newline at end of file
@@ -6,6 +6,7 @@ from media_rs.utils.session import get_or_create_session_id
 from media_rs.rs_types.model import Medium
 from api.services.database_query import query_database
 from api.services.media_data.open_library import get_open_library_details
+from api.services.media_data.concurrent_fetch import fetch_all
 
 @dataclass
 class BookData:
@@ -45,10 +46,8 @@ def get_book_data(title: str) -> BookData:
         return BookData(title=title)
 
 def get_multiple_book_data(titles: List[str]) -> List[BookData]:
-    data: List[BookData] = []
-    for title in titles:
-        try:
-            data.append(get_book_data(title))
-        except Exception:
-            data.append(BookData(title=title))
-    return data
\ No newline at end of file
+    return fetch_all(
+        titles,
+        fetch=get_book_data,
+        fallback=lambda title: BookData(title=title)
+    )
\ No newline at end of file
@@ -0,0 +1,131 @@
+import os
+import time
+import threading
+import requests
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from api.executors import METADATA_EXECUTOR
+
+T = TypeVar("T")
+
+# Titles of one request fetched at once
+MEDIA_DATA_CONCURRENCY = int(os.getenv("MEDIA_DATA_CONCURRENCY", "10"))
+
+# Threads of the shared fetch pool, also the size of the HTTP connection
+# pool. Enough by default for every metadata request to run at full
+# concurrency, so titles never wait behind another request's.
+MEDIA_DATA_WORKERS = int(os.getenv(
+    "MEDIA_DATA_WORKERS",
+    str(METADATA_EXECUTOR.max_workers * MEDIA_DATA_CONCURRENCY)
+))
+
+# Seconds allowed for connecting to and reading from an external API
+MEDIA_DATA_TIMEOUT = float(os.getenv("MEDIA_DATA_TIMEOUT", "5"))
+
+# Seconds a title may take once its fetch has started, late titles get
+# placeholders
+MEDIA_DATA_DEADLINE = float(os.getenv("MEDIA_DATA_DEADLINE", "8"))
+
+_SESSION: Optional[requests.Session] = None
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_LOCK = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Keep-alive HTTP session shared by the metadata fetchers, pooling up to
+    MEDIA_DATA_WORKERS connections per host.
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=MEDIA_DATA_WORKERS,
+                    pool_maxsize=MEDIA_DATA_WORKERS
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
+def get_fetch_executor() -> ThreadPoolExecutor:
+    """
+    Bounded thread pool shared by every fetch_all call.
+    """
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=MEDIA_DATA_WORKERS,
+                    thread_name_prefix="media-data"
+                )
+    return _EXECUTOR
+
+
+def fetch_all(
+    titles: List[str],
+    fetch: Callable[[str], T],
+    fallback: Callable[[str], T],
+    deadline: float = MEDIA_DATA_DEADLINE,
+    max_concurrency: int = MEDIA_DATA_CONCURRENCY
+) -> List[T]:
+    """
+    Fetch the data of every title concurrently, in the order of titles.
+
+    At most max_concurrency titles of the call are in flight at once. A
+    title whose fetch raises, or runs for longer than deadline, gets
+    fallback(title) so the rest of the page is still returned.
+
+    Args:
+        titles (List[str]): Titles to fetch
+        fetch (Callable[[str], T]): Fetches the data of one title
+        fallback (Callable[[str], T]): Placeholder data of a title
+        deadline (float): Seconds each title may take from the start of its fetch
+        max_concurrency (int): Titles of this call fetched at once
+
+    Returns:
+        List[T]: Data of each title
+    """
+    executor = get_fetch_executor()
+    data: List[Optional[T]] = [None] * len(titles)
+    started: Dict[int, float] = {}
+    pending: Dict[Future, int] = {}
+    next_title = 0
+
+    def run(i: int) -> T:
+        started[i] = time.monotonic()
+        return fetch(titles[i])
+
+    while next_title < len(titles) or pending:
+        while next_title < len(titles) and len(pending) < max(1, max_concurrency):
+            pending[executor.submit(run, next_title)] = next_title
+            next_title += 1
+
+        # Wake up for the next result or the earliest deadline
+        now = time.monotonic()
+        deadlines = [started[i] + deadline for i in pending.values() if i in started]
+        timeout = max(0.0, min(deadlines) - now) if deadlines else deadline
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            i = pending.pop(future)
+            if future.exception() is not None:
+                data[i] = fallback(titles[i])
+            else:
+                data[i] = future.result()
+
+        # Give up on titles past their deadline, the HTTP timeouts end them
+        now = time.monotonic()
+        for future, i in list(pending.items()):
+            if i in started and now - started[i] >= deadline:
+                del pending[future]
+                data[i] = fallback(titles[i])
+
+    return data
@@ -1,14 +1,17 @@
 import os
-import requests
 
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict
 
 
 from media_rs.utils.item_index import ItemIndex
-from media_rs.utils.data_cache import get_data_cache
-
-cache = get_data_cache()
+from media_rs.rs_types.model import Medium
+from media_rs.serving.recommender.registry import get_model_registry
+from api.services.media_data.concurrent_fetch import (
+    MEDIA_DATA_TIMEOUT,
+    fetch_all,
+    get_http_session
+)
 
 TMDB_KEY = os.getenv("TMDB_KEY")
     
@@ -34,7 +37,7 @@ def get_movie_details(tmdb_id: int) -> MovieData:
         "Authorization": f"Bearer {TMDB_KEY}"
     }
 
-    response = requests.get(url, headers=headers)
+    response = get_http_session().get(url, headers=headers, timeout=MEDIA_DATA_TIMEOUT)
     response.raise_for_status()
     data = response.json()
 
@@ -55,8 +58,9 @@ def get_movie_details(tmdb_id: int) -> MovieData:
         vote_average=data.get("vote_average")
     )
 
-def get_movie_data(title: str) -> MovieData:
-    item_idx = ItemIndex(cache.get("movies/item_index.pkl"))
+def get_movie_data(title: str, item_idx: Optional[ItemIndex] = None) -> MovieData:
+    if item_idx is None:
+        item_idx = get_model_registry().item_index(Medium.MOVIES)
     
     movie_id = item_idx.title_to_itemId[title]
     if movie_id is None:
@@ -83,10 +87,9 @@ def get_first_image_by_language(images_list: list, lang: str = "en") -> str | No
     return images_list[0].get("file_path")
 
 def get_multiple_movie_data(titles: List[str]) -> List[MovieData]:
-    data: List[MovieData] = []
-    for title in titles:
-        try:
-            data.append(get_movie_data(title))
-        except Exception:
-            data.append(MovieData(title=title))
-    return data
\ No newline at end of file
+    item_idx = get_model_registry().item_index(Medium.MOVIES)
+    return fetch_all(
+        titles,
+        fetch=lambda title: get_movie_data(title, item_idx),
+        fallback=lambda title: MovieData(title=title)
+    )
\ No newline at end of file
@@ -1,26 +1,40 @@
 # views.py
-from fastapi import APIRouter, HTTPException, Query, Request, Response, Body
-from typing import List
+import os
+import hmac
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, Body, Header
+from typing import List, Optional
 from api.services.content_services import (
     get_content_recommendations,
     get_content_recommendations_from_description,
 )
 from api.services.collab_services import (
     get_item_cf_recommendations,
-    get_user_cf_recommendations
+    get_user_cf_recommendations,
+    get_user_cf_recommendations_batch
 )
 from api.services.hybrid_services import get_hybrid_recommendations
 from api.services.media_data.get_media_data import get_media_data
 from api.services.database_query import query_database
-from media_rs.rs_types.model import EmbeddingMethod, Medium
+from api.services.admin_services import get_version_info, get_cache_metrics, start_reload
+from api.executors import (
+    ENCODE_EXECUTOR,
+    COLLAB_EXECUTOR,
+    METADATA_EXECUTOR,
+    ExecutorSaturated
+)
+from media_rs.rs_types.model import EmbeddingMethod, Medium, ScoreNormalization
+from media_rs.serving.recommender.registry import get_model_registry
 
 from .serializers import (
     ContentRecommendationInput,
     ContentDescriptionInput,
     UserCFInput,
+    UserCFBatchInput,
     HybridInput,
     MovieSearchInput,
-    RecommendationListOutput
+    RecommendationListOutput,
+    ReloadInput
 )
 
 # -----------------------------
@@ -31,6 +45,14 @@ router = APIRouter(
     tags=["recommendations"]
 )
 
+admin_router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"]
+)
+
+# Shared secret for admin endpoints, which are disabled when unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
 # -----------------------------
 # Helper
 # -----------------------------
@@ -48,12 +70,20 @@ def get_medium(medium: str) -> Medium:
         return Medium.BOOKS
     raise ValueError("Invalid medium")
 
+def service_unavailable(e: ExecutorSaturated) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
 
 # -----------------------------
 # Endpoints
 # -----------------------------
+# Graph lookups are cheap and run on the event loop once their models are
+# built. Building them (lazy caches, right after a reload), encoding,
+# user-CF, hybrid and external fetches run on bounded executors
+# (api/executors.py) and answer 503 when theirs is saturated.
+
 @router.get("/recommend/content", response_model=List[str])
-def content_recommendation(
+async def content_recommendation(
     title: str = Query(...),
     medium: str = Query(...),
     top_n: int = Query(10, ge=1),
@@ -61,15 +91,21 @@ def content_recommendation(
 ):
     method = get_embedding_method(embedding_method)
     medium_enum = get_medium(medium)
-    return get_content_recommendations(
+    kwargs = dict(
         title=title, 
         method=method, 
         top_n=top_n, 
         medium=medium_enum
     )
+    if get_model_registry().content_model_built(medium_enum, method):
+        return get_content_recommendations(**kwargs)
+    try:
+        return await ENCODE_EXECUTOR.run(get_content_recommendations, **kwargs)
+    except ExecutorSaturated as e:
+        raise service_unavailable(e)
 
 @router.get("/recommend/content-description", response_model=List[str])
-def content_description_recommendation(
+async def content_description_recommendation(
     description: str = Query(...),
     medium: str = Query(...),
     top_n: int = Query(10, ge=1),
@@ -77,47 +113,79 @@ def content_description_recommendation(
 ):
     method = get_embedding_method(embedding_method)
     medium_enum = get_medium(medium)
-    return get_content_recommendations_from_description(
-        description=description,
-        method=method,
-        top_n=top_n, 
-        medium=medium_enum
-    )
+    try:
+        return await ENCODE_EXECUTOR.run(
+            get_content_recommendations_from_description,
+            description=description,
+            method=method,
+            top_n=top_n, 
+            medium=medium_enum
+        )
+    except ExecutorSaturated as e:
+        raise service_unavailable(e)
 
 @router.get("/recommend/item-cf", response_model=List[str])
-def item_cf_recommendation(
+async def item_cf_recommendation(
     title: str = Query(...),
     medium: str = Query(...),
     top_n: int = Query(10, ge=1)
 ):
     medium_enum = get_medium(medium)
-    return get_item_cf_recommendations(
+    kwargs = dict(
         title=title, 
         top_n=top_n, 
         medium=medium_enum
     )
+    if get_model_registry().item_cf_model_built(medium_enum):
+        return get_item_cf_recommendations(**kwargs)
+    try:
+        return await COLLAB_EXECUTOR.run(get_item_cf_recommendations, **kwargs)
+    except ExecutorSaturated as e:
+        raise service_unavailable(e)
 
 @router.post("/recommend/user-cf", response_model=List[str])
-def user_cf_recommendation(payload: UserCFInput = Body(...)):
+async def user_cf_recommendation(payload: UserCFInput = Body(...)):
     method = get_embedding_method(payload.embedding_method)
     medium = get_medium(payload.medium)
     try:
-        return get_user_cf_recommendations(
+        return await COLLAB_EXECUTOR.run(
+            get_user_cf_recommendations,
             ratings=[r.dict() for r in payload.ratings],
             top_n=payload.top_n,
             k_similar_users=payload.k_similar_users,
             method=method,
             medium=medium
         )
+    except ExecutorSaturated as e:
+        raise service_unavailable(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/recommend/user-cf/batch", response_model=List[List[str]])
+async def user_cf_batch_recommendation(payload: UserCFBatchInput = Body(...)):
+    method = get_embedding_method(payload.embedding_method)
+    medium = get_medium(payload.medium)
+    try:
+        return await COLLAB_EXECUTOR.run(
+            get_user_cf_recommendations_batch,
+            ratings_batch=[[r.dict() for r in profile] for profile in payload.profiles],
+            top_n=payload.top_n,
+            k_similar_users=payload.k_similar_users,
+            method=method,
+            medium=medium
+        )
+    except ExecutorSaturated as e:
+        raise service_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 @router.post("/recommend/hybrid", response_model=List[str])
-def hybrid_recommendation(input: HybridInput):
+async def hybrid_recommendation(input: HybridInput):
     method = get_embedding_method(input.embedding_method)
     medium = get_medium(input.medium)
     try:
-        recs = get_hybrid_recommendations(
+        recs = await COLLAB_EXECUTOR.run(
+            get_hybrid_recommendations,
             title=input.title,
             ratings=[r.dict() for r in input.ratings],
             alpha=input.alpha,
@@ -125,14 +193,18 @@ def hybrid_recommendation(input: HybridInput):
             top_n=input.top_n,
             k_similar_users=input.k_similar_users,
             method=method,
-            medium=medium
+            medium=medium,
+            candidate_pool=input.candidate_pool,
+            normalization=ScoreNormalization(input.normalization)
         )
         return recs
+    except ExecutorSaturated as e:
+        raise service_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/medium/search")
-def medium_search(
+async def medium_search(
     medium: str,
     query: str,
     limit: int = Query(10, ge=1, le=100),
@@ -144,7 +216,8 @@ def medium_search(
     response = Response()
     mediumEnum = get_medium(medium)
     try:
-        results = query_database(
+        results = await METADATA_EXECUTOR.run(
+            query_database,
             response=response,
             title=query,
             medium=mediumEnum,
@@ -156,11 +229,13 @@ def medium_search(
         response.body = results.json().encode() if hasattr(results, "json") else str(results).encode()
         return results
 
+    except ExecutorSaturated as e:
+        raise service_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/data")
-def movie_data(
+async def movie_data(
     titles: List[str] = Query(...),
     medium: str = Query(...)
 ):
@@ -168,7 +243,45 @@ def movie_data(
     if not titles:
         raise HTTPException(status_code=400, detail="At least one title required")
     try:
-        data = get_media_data(titles, mediumEnum)
+        data = await METADATA_EXECUTOR.run(get_media_data, titles, mediumEnum)
         return [d.__dict__ for d in data]
+    except ExecutorSaturated as e:
+        raise service_unavailable(e)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# -----------------------------
+# Admin endpoints
+# -----------------------------
+def check_admin_token(token: Optional[str]):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not token or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+@admin_router.get("/version")
+def artifact_version(x_admin_token: Optional[str] = Header(None)):
+    check_admin_token(x_admin_token)
+    return get_version_info()
+
+@admin_router.get("/metrics")
+def cache_metrics(x_admin_token: Optional[str] = Header(None)):
+    check_admin_token(x_admin_token)
+    return get_cache_metrics()
+
+@admin_router.post("/reload", status_code=202)
+def reload_artifacts(
+    payload: Optional[ReloadInput] = Body(None),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Load a new artifact version in the background and swap it in once
+    validated. Poll /api/admin/version for the outcome.
+    """
+    check_admin_token(x_admin_token)
+    try:
+        start_reload(payload.revision if payload else None)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return get_version_info()
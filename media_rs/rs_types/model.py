@@ -15,4 +15,10 @@ TitleToIdx = Dict[str, int]
 
 class Medium(str, Enum):
     MOVIES = "movies"
-    BOOKS = "books"
\ No newline at end of file
+    BOOKS = "books"
+
+class ScoreNormalization(str, Enum):
+    NONE = "none"
+    MINMAX = "minmax"
+    ZSCORE = "zscore"
+    RRF = "rrf"
\ No newline at end of file
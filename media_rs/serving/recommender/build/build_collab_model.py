@@ -3,6 +3,7 @@ from media_rs.serving.recommender.models.collab import (
     UserCollaborativeModel,
 )
 from media_rs.utils.data_cache import DataCache
+from media_rs.utils.topk_graph import TopKGraph
 from media_rs.rs_types.model import EmbeddingMethod, Medium
 
 def get_item_cf_model(
@@ -10,7 +11,10 @@ def get_item_cf_model(
     medium: Medium
 ) -> ItemItemCollaborativeModel:
     return ItemItemCollaborativeModel(
-        topk_graph=cache.get(f"{medium.value}/item_topk_cf.pkl")
+        topk_graph=TopKGraph(
+            indices=cache.get(f"{medium.value}/item_topk_cf_indices.npy"),
+            scores=cache.get(f"{medium.value}/item_topk_cf_scores.npy"),
+        )
     )
     
 def get_user_sbert_cf_model(
@@ -3,40 +3,59 @@ from media_rs.serving.recommender.models.content import (
     ContentSimilarityTFIDFModel
 )
 from media_rs.utils.data_cache import DataCache
+from media_rs.utils.topk_graph import TopKGraph
+from media_rs.utils.embedding_cache import EmbeddingCache
+from media_rs.utils.batch_encoder import BatchingEncoder
 from media_rs.rs_types.model import EmbeddingMethod, Medium
 
-from typing import Union
+from sentence_transformers import SentenceTransformer
+from typing import Optional, Union
 
 def get_content_similarity_tfidf_model(
     cache: DataCache,
-    medium: Medium
+    medium: Medium,
+    embedding_cache: Optional[EmbeddingCache] = None
 ) -> ContentSimilarityTFIDFModel:
     return ContentSimilarityTFIDFModel(
-        topk_graph=cache.get(f"{medium.value}/tfidf/item_topk_content.pkl"),
+        topk_graph=TopKGraph(
+            indices=cache.get(f"{medium.value}/tfidf/item_topk_content_indices.npy"),
+            scores=cache.get(f"{medium.value}/tfidf/item_topk_content_scores.npy"),
+        ),
         embeddings=cache.get(f"{medium.value}/tfidf/item_embeddings.npy"),
         vectorizer=cache.get(f"{medium.value}/tfidf/tfidf_vectorizer.pkl"),
-        svd=cache.get(f"{medium.value}/tfidf/svd.pkl")
+        svd=cache.get(f"{medium.value}/tfidf/svd.pkl"),
+        faiss_index=cache.get(f"{medium.value}/tfidf/faiss_index_items.index"),
+        embedding_cache=embedding_cache
     )
     
 def get_content_similarity_sbert_model(
     cache: DataCache, 
-    medium: Medium
+    medium: Medium,
+    embedding_cache: Optional[EmbeddingCache] = None,
+    transformer: Optional[Union[BatchingEncoder, SentenceTransformer]] = None
 ) -> ContentSimilaritySBERTModel:
     return ContentSimilaritySBERTModel(
-        topk_graph=cache.get(f"{medium.value}/sbert/item_topk_content.pkl"),
+        topk_graph=TopKGraph(
+            indices=cache.get(f"{medium.value}/sbert/item_topk_content_indices.npy"),
+            scores=cache.get(f"{medium.value}/sbert/item_topk_content_scores.npy"),
+        ),
         embeddings=cache.get(f"{medium.value}/sbert/item_embeddings.npy"),
-        transformer=cache.get(f"{medium.value}/sbert/sbert_model")
+        transformer=transformer or cache.get(f"{medium.value}/sbert/sbert_model"),
+        faiss_index=cache.get(f"{medium.value}/sbert/faiss_index_items.index"),
+        embedding_cache=embedding_cache
     )
     
 def get_content_similarity_model(
     cache: DataCache,
     method: EmbeddingMethod,
-    medium: Medium  
+    medium: Medium,
+    embedding_cache: Optional[EmbeddingCache] = None,
+    transformer: Optional[Union[BatchingEncoder, SentenceTransformer]] = None
 ) -> Union[
     ContentSimilaritySBERTModel, 
     ContentSimilarityTFIDFModel
 ]:
     if method==EmbeddingMethod.SBERT:
-        return get_content_similarity_sbert_model(cache, medium)
+        return get_content_similarity_sbert_model(cache, medium, embedding_cache, transformer)
     if method==EmbeddingMethod.TFIDF:
-        return get_content_similarity_tfidf_model(cache, medium)
\ No newline at end of file
+        return get_content_similarity_tfidf_model(cache, medium, embedding_cache)
\ No newline at end of file
@@ -5,6 +5,7 @@ from scipy.sparse import csr_matrix
 
 from typing import List, Dict, Tuple, Union
 from media_rs.rs_types.model import ContentSimilarity
+from media_rs.utils.topk_graph import TopKGraph, TopKDict, topk_neighbours
 
 class ItemItemCollaborativeModel:
     """
@@ -12,13 +13,13 @@ class ItemItemCollaborativeModel:
     """
     def __init__(
         self, 
-        topk_graph:  Dict[int, List[ContentSimilarity]],
+        topk_graph: Union[TopKGraph, TopKDict],
     ):
         """
         Initialisation
 
         Args:
-            topk_graph (Dict[int, List[ContentSimilarity]]): Top K most similar neighbours of each item
+            topk_graph (Union[TopKGraph, TopKDict]): Top K most similar neighbours of each item
         """
         self.topk_graph = topk_graph
 
@@ -35,7 +36,7 @@ class ItemItemCollaborativeModel:
                 List of results.
                 Tuple of ID of item and similarity score for each result in list
         """
-        return self.topk_graph[item_id][:top_n]
+        return topk_neighbours(self.topk_graph, item_id, top_n)
     
 class UserCollaborativeModel:
     """
@@ -127,29 +128,17 @@ class UserCollaborativeModel:
         similarities = D[0]
 
         # ---- SPARSE AGGREGATION ----
-        # Accumulate weighted rows into a sparse vector
-        agg_scores = None  # csr_matrix (1, num_items)
-
-        for sim_user_idx, sim in zip(similar_users, similarities):
-            if sim <= 0:
-                continue
-
-            row = self.user_item_matrix.getrow(sim_user_idx)
-            if row.nnz == 0:
-                continue
-
-            weighted_row = row.multiply(sim)
-
-            if agg_scores is None:
-                agg_scores = weighted_row
-            else:
-                agg_scores += weighted_row
+        # Positively similar users only (FAISS pads missing results with -1)
+        keep = (similarities > 0) & (similar_users >= 0)
+        if not keep.any():
+            return []
 
-        if agg_scores is None:
+        # Single row selection, then (1, k) @ (k, num_items) weighted sum
+        neighbour_rows = self.user_item_matrix[similar_users[keep]]
+        if neighbour_rows.nnz == 0:
             return []
 
-        # Convert ONCE to dense
-        scores = agg_scores.toarray().ravel()
+        scores = np.asarray(neighbour_rows.T @ similarities[keep]).ravel()
 
         # ---- MASK ALREADY RATED ITEMS ----
         if isinstance(rated_mask, csr_matrix):
@@ -157,12 +146,87 @@ class UserCollaborativeModel:
         else:
             scores[rated_mask] = -np.inf
 
-        # ---- TOP-N ----
+        return self._top_n(scores, top_n)
+
+    def recommend_batch(
+        self,
+        ratings_batch: List[Dict[int, float]],
+        top_n: int,
+        k_similar_users: int
+    ) -> List[List[ContentSimilarity]]:
+        """
+        Recommend n most similar items for many rating profiles at once.
+        
+        All user embeddings are built as one matrix, searched with a single
+        FAISS call and aggregated with one sparse product.
+
+        Args:
+            ratings_batch (List[Dict[int, float]]): 
+                Ratings of each profile to use in 
+                user-user collaborative filtering.
+                
+            top_n (int): 
+                Number of results to return per profile
+                
+            k_similar_users (int):
+                Number of similar users to use in computation
+
+        Returns:
+            List[List[ContentSimilarity]]: 
+                Results of each profile, in the same order as ratings_batch
+        """
+        num_queries = len(ratings_batch)
+        if num_queries == 0:
+            return []
+
+        # ---- RATINGS AS ONE SPARSE (queries, items) MATRIX ----
+        rows = np.repeat(np.arange(num_queries), [len(r) for r in ratings_batch])
+        cols = np.fromiter(
+            (i for r in ratings_batch for i in r.keys()), dtype=np.int64, count=len(rows)
+        )
+        values = np.fromiter(
+            (v for r in ratings_batch for v in r.values()), dtype=np.float32, count=len(rows)
+        )
+        ratings_matrix = csr_matrix(
+            (values, (rows, cols)), shape=(num_queries, self.num_items), dtype=np.float32
+        )
+
+        # ---- EMBED AND SEARCH ALL QUERIES ----
+        user_embs = np.ascontiguousarray(ratings_matrix @ self.item_embeddings, dtype=np.float32)
+        faiss.normalize_L2(user_embs)
+        D, I = self.index.search(user_embs, k_similar_users)
+
+        # ---- SPARSE AGGREGATION ----
+        # (queries, num_users) neighbour weights @ (num_users, num_items)
+        keep = (D > 0) & (I >= 0)
+        weights = csr_matrix(
+            (D[keep], (np.nonzero(keep)[0], I[keep])),
+            shape=(num_queries, self.user_item_matrix.shape[0]),
+        )
+        agg_scores = (weights @ self.user_item_matrix).tocsr()
+
+        results = []
+        for q in range(num_queries):
+            if agg_scores.indptr[q] == agg_scores.indptr[q + 1]:
+                results.append([])
+                continue
+
+            scores = agg_scores[q].toarray().ravel()
+            rated = ratings_matrix.indices[ratings_matrix.indptr[q]:ratings_matrix.indptr[q + 1]]
+            scores[rated] = -np.inf
+            results.append(self._top_n(scores, top_n))
+
+        return results
+
+    def _top_n(self, scores: np.ndarray, top_n: int) -> List[ContentSimilarity]:
+        """
+        Top-N (item_idx, score) from dense scores, masked items (-inf) removed
+        """
         top_n = min(top_n, len(scores))
         top_indices = np.argpartition(-scores, top_n-1)[:top_n]
         top_indices = top_indices[np.argsort(-scores[top_indices])]
         
         # Remove masked items (score = -inf)
-        top_indices = [i for i in top_indices if scores[i] != -np.inf]
+        top_indices = top_indices[scores[top_indices] != -np.inf]
 
         return [(int(i), float(scores[i])) for i in top_indices]
\ No newline at end of file
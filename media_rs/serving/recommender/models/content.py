@@ -1,12 +1,56 @@
+import faiss
 import numpy as np
 
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union
 
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.decomposition import TruncatedSVD
 from sentence_transformers import SentenceTransformer
 
 from media_rs.rs_types.model import IdType, ContentSimilarity
+from media_rs.utils.topk_graph import TopKGraph, TopKDict, topk_neighbours
+from media_rs.utils.embedding_cache import EmbeddingCache
+
+
+def search_item_embeddings(
+    emb: np.ndarray,
+    embeddings: np.ndarray,
+    top_n: int,
+    faiss_index: Optional[faiss.Index] = None
+) -> List[ContentSimilarity]:
+    """
+    Top-N items by cosine similarity to a normalised query embedding.
+
+    Uses the persisted item FAISS index (flat or ANN) when given, otherwise
+    an exact dot product with argpartition so only top_n scores are sorted.
+
+    Args:
+        emb (np.ndarray): Normalised query embedding of shape (1, embedding_dim)
+        embeddings (np.ndarray): Normalised item embeddings
+        top_n (int): Number of results to return
+        faiss_index (Optional[faiss.Index]): Inner product index over embeddings
+
+    Returns:
+        List[ContentSimilarity]: (item index, similarity) sorted by similarity
+    """
+    top_n = min(top_n, embeddings.shape[0])
+    if top_n <= 0:
+        return []
+
+    if faiss_index is not None:
+        scores, indices = faiss_index.search(np.ascontiguousarray(emb, dtype=np.float32), top_n)
+        return [
+            (int(i), float(s)) 
+            for i, s in zip(indices[0], scores[0]) 
+            if i >= 0
+        ]
+
+    sims = (emb @ embeddings.T).ravel()
+
+    top_indices = np.argpartition(-sims, top_n - 1)[:top_n]
+    top_indices = top_indices[np.argsort(-sims[top_indices], kind="stable")]
+
+    return [(int(i), float(sims[i])) for i in top_indices]
 
 
 class ContentSimilaritySBERTModel:
@@ -15,15 +59,17 @@ class ContentSimilaritySBERTModel:
     """
     def __init__(
         self,
-        topk_graph:  Dict[int, List[Tuple[int, float]]],
+        topk_graph: Union[TopKGraph, TopKDict],
         embeddings: np.ndarray,
         transformer: SentenceTransformer,
+        faiss_index: Optional[faiss.Index] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
     ):
         """
         Initialisation
 
         Args:
-            topk_graph (Dict[int, List[ContentSimilarity]]): 
+            topk_graph (Union[TopKGraph, TopKDict]): 
                 Top K most similar neighbours of each item
             
             embeddings (np.ndarray): 
@@ -31,12 +77,22 @@ class ContentSimilaritySBERTModel:
                 where each row represents an item in a latent vector space.
                 
             transformer (SentenceTransformer): 
-                Fitted SBERT sentence transformer.
+                Fitted SBERT sentence transformer, or a BatchingEncoder
+                wrapping one.
+
+            faiss_index (Optional[faiss.Index]):
+                Item FAISS index used for description search.
+                Defaults to an exact search over embeddings.
+
+            embedding_cache (Optional[EmbeddingCache]):
+                Cache of description embeddings. Defaults to no caching.
         """
         
         self.topk_graph = topk_graph
         self.embeddings = embeddings
         self.transformer = transformer
+        self.faiss_index = faiss_index
+        self.embedding_cache = embedding_cache
 
     def recommend(
         self, 
@@ -56,7 +112,7 @@ class ContentSimilaritySBERTModel:
                 Tuple of ID of item and similarity score for each result in list
         """
         
-        return self.topk_graph[item_id][:top_n]
+        return topk_neighbours(self.topk_graph, item_id, top_n)
     
     def recommend_from_description(
         self, 
@@ -75,17 +131,18 @@ class ContentSimilaritySBERTModel:
                 List of results.
                 Tuple of ID of item and similarity score for each result in list
         """
-        # Compute SBERT embedding
-        emb = self.transformer.encode([description], convert_to_numpy=True, normalize_embeddings=True)
+        if self.embedding_cache is not None:
+            emb = self.embedding_cache.get_or_compute(description, self.encode_description)
+        else:
+            emb = self.encode_description(description)
         
-        # Compute cosine similarity
-        sims = emb @ self.embeddings.T  # (1, num_items)
-        sims = sims.ravel()
-        
-        # Top-N indices
-        top_indices = np.argsort(-sims)[:top_n]
-        
-        return [(int(i), float(sims[i])) for i in top_indices]
+        return search_item_embeddings(emb, self.embeddings, top_n, self.faiss_index)
+
+    def encode_description(self, description: str) -> np.ndarray:
+        """
+        Normalised SBERT embedding of shape (1, embedding_dim)
+        """
+        return self.transformer.encode([description], convert_to_numpy=True, normalize_embeddings=True)
     
 class ContentSimilarityTFIDFModel:
     """
@@ -93,16 +150,18 @@ class ContentSimilarityTFIDFModel:
     """
     def __init__(
         self,
-        topk_graph: Dict[int, List[Tuple[int, float]]],
+        topk_graph: Union[TopKGraph, TopKDict],
         embeddings: np.ndarray,
         vectorizer: TfidfVectorizer,
         svd: TruncatedSVD,
+        faiss_index: Optional[faiss.Index] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
     ):
         """
         Initialisation
 
         Args:
-            topk_graph (Dict[int, List[ContentSimilarity]]):
+            topk_graph (Union[TopKGraph, TopKDict]):
                 Top K most similar neighbours of each item
 
             embeddings (np.ndarray):
@@ -114,11 +173,20 @@ class ContentSimilarityTFIDFModel:
 
             svd (TruncatedSVD):
                 Fitted SVD model used to project TF-IDF vectors
+
+            faiss_index (Optional[faiss.Index]):
+                Item FAISS index used for description search.
+                Defaults to an exact search over embeddings.
+
+            embedding_cache (Optional[EmbeddingCache]):
+                Cache of description embeddings. Defaults to no caching.
         """
         self.topk_graph = topk_graph
         self.embeddings = embeddings
         self.vectorizer = vectorizer
         self.svd = svd
+        self.faiss_index = faiss_index
+        self.embedding_cache = embedding_cache
 
     def recommend(
         self,
@@ -128,7 +196,7 @@ class ContentSimilarityTFIDFModel:
         """
         Recommend n most similar items for item_id
         """
-        return self.topk_graph[item_id][:top_n]
+        return topk_neighbours(self.topk_graph, item_id, top_n)
 
     def recommend_from_description(
         self,
@@ -138,7 +206,18 @@ class ContentSimilarityTFIDFModel:
         """
         Recommend n most similar items based on free-text description
         """
+        if self.embedding_cache is not None:
+            emb = self.embedding_cache.get_or_compute(description, self.encode_description)
+        else:
+            emb = self.encode_description(description)
+
+        # ---- Cosine similarity top-N ----
+        return search_item_embeddings(emb, self.embeddings, top_n, self.faiss_index)
 
+    def encode_description(self, description: str) -> np.ndarray:
+        """
+        Normalised TF-IDF → SVD embedding of shape (1, embedding_dim)
+        """
         # ---- TF-IDF → SVD ----
         tfidf = self.vectorizer.transform([description])      # (1, vocab)
         emb = self.svd.transform(tfidf).astype(np.float32)   # (1, dim)
@@ -148,11 +227,4 @@ class ContentSimilarityTFIDFModel:
         if norm > 0:
             emb /= norm
 
-        # ---- Cosine similarity ----
-        sims = emb @ self.embeddings.T
-        sims = sims.ravel()
-
-        # ---- Top-N ----
-        top_indices = np.argsort(-sims)[:top_n]
-
-        return [(int(i), float(sims[i])) for i in top_indices]
\ No newline at end of file
+        return emb
\ No newline at end of file
@@ -1,9 +1,12 @@
 # src/models/hybrid.py
-import pandas as pd
+import os
+import time
+import threading
 import numpy as np
 
-from typing import List, Dict, Union
-from media_rs.rs_types.model import ContentSimilarity
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Dict, Union, Optional, Tuple
+from media_rs.rs_types.model import ContentSimilarity, ScoreNormalization
 
 from media_rs.serving.recommender.models.content import (
     ContentSimilaritySBERTModel,
@@ -14,6 +17,127 @@ from media_rs.serving.recommender.models.collab import (
     UserCollaborativeModel
 )
 
+# Candidates of one component: item indices and their scores
+ScoreArrays = Tuple[np.ndarray, np.ndarray]
+
+# Rank offset of reciprocal rank fusion, 60 as in the original RRF paper
+RRF_K = 60
+
+# Run the three component recommenders of a hybrid call concurrently.
+# FAISS search and NumPy/SciPy work release the GIL, so they overlap.
+HYBRID_PARALLEL = os.getenv("HYBRID_PARALLEL", "false").lower() in ("1", "true", "yes")
+
+# Threads of the pool shared by every HybridModel
+HYBRID_WORKERS = int(os.getenv("HYBRID_WORKERS", "8"))
+
+COMPONENTS = ("content", "item_cf", "user_cf")
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_component_executor() -> ThreadPoolExecutor:
+    """
+    Thread pool shared by the hybrid models for their component calls.
+    """
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=HYBRID_WORKERS,
+                    thread_name_prefix="hybrid-component"
+                )
+    return _EXECUTOR
+
+
+class ComponentTimings:
+    """
+    Thread-safe running latency totals of named components.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self.totals: Dict[str, float] = {}
+        self.maxima: Dict[str, float] = {}
+
+    def record(self, name: str, seconds: float):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+            self.totals[name] = self.totals.get(name, 0.0) + seconds
+            self.maxima[name] = max(self.maxima.get(name, 0.0), seconds)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns:
+            Dict[str, Dict[str, float]]: count, mean_ms and max_ms of each component
+        """
+        with self.lock:
+            return {
+                name: {
+                    "count": count,
+                    "mean_ms": self.totals[name] * 1000 / count,
+                    "max_ms": self.maxima[name] * 1000,
+                }
+                for name, count in self.counts.items()
+            }
+
+
+def to_score_arrays(recommendations: List[ContentSimilarity]) -> ScoreArrays:
+    """
+    (index, score) tuples as int64 index and float64 score arrays.
+    """
+    if not recommendations:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    ids, scores = zip(*recommendations)
+    return np.asarray(ids, dtype=np.int64), np.asarray(scores, dtype=np.float64)
+
+
+def normalize_scores(
+    ids: np.ndarray,
+    scores: np.ndarray,
+    method: ScoreNormalization,
+    rrf_k: int = RRF_K
+) -> np.ndarray:
+    """
+    Put one component's candidate scores on a common scale.
+
+    Args:
+        ids (np.ndarray): Item indices of the candidates
+        scores (np.ndarray): Raw scores of the candidates
+        method (ScoreNormalization):
+            none keeps raw scores, minmax maps them to [0, 1], zscore to
+            zero mean and unit variance, and rrf replaces them with
+            1 / (rrf_k + rank), ranks starting at 1 and ties broken by index
+        rrf_k (int): Rank offset of reciprocal rank fusion
+
+    Returns:
+        np.ndarray: Normalized scores, aligned with ids
+    """
+    method = ScoreNormalization(method)
+    if len(scores) == 0 or method == ScoreNormalization.NONE:
+        return scores
+
+    # Constant scores carry no ranking signal, and their std is not
+    # reliably 0 in floating point
+    constant = scores.max() == scores.min()
+
+    if method == ScoreNormalization.MINMAX:
+        if constant:
+            return np.ones_like(scores)
+        return (scores - scores.min()) / (scores.max() - scores.min())
+
+    if method == ScoreNormalization.ZSCORE:
+        if constant:
+            return np.zeros_like(scores)
+        return (scores - scores.mean()) / scores.std()
+
+    # RRF
+    ranks = np.empty(len(scores), dtype=np.float64)
+    ranks[np.lexsort((ids, -scores))] = np.arange(1, len(scores) + 1)
+    return 1.0 / (rrf_k + ranks)
+
+
 class HybridModel:
     """
     Recommendation system model based on a hybrid of item-item and 
@@ -27,8 +151,11 @@ class HybridModel:
         ],
         item_collab_model: ItemItemCollaborativeModel,
         user_collab_model: UserCollaborativeModel,
-        alpha: float,
-        beta: float
+        alpha: float = 0.5,
+        beta: float = 0.3,
+        candidate_pool: Optional[int] = None,
+        normalization: Union[str, ScoreNormalization] = ScoreNormalization.NONE,
+        parallel: Optional[bool] = None
     ):
         """_summary_
 
@@ -43,10 +170,21 @@ class HybridModel:
                 Recommendation system model based on user-user collaborative filtering.
             
             alpha (float): 
-                Weighting of content similarity score.
+                Default weighting of content similarity score.
                 
             beta (float): 
-                Weighting of item collaborative filtering score.
+                Default weighting of item collaborative filtering score.
+
+            candidate_pool (Optional[int]):
+                Default number of candidates fetched from each component
+                before fusion. None fetches top_n.
+
+            normalization (Union[str, ScoreNormalization]):
+                Default normalization of each component's scores before fusion.
+
+            parallel (Optional[bool]):
+                Run the component recommenders concurrently on the shared
+                thread pool. Defaults to HYBRID_PARALLEL.
         """
         
         self.content_model = content_model
@@ -55,13 +193,21 @@ class HybridModel:
         self.alpha = alpha
         self.beta = beta
         self.gamma = 1.0 - alpha - beta
+        self.candidate_pool = candidate_pool
+        self.normalization = ScoreNormalization(normalization)
+        self.parallel = HYBRID_PARALLEL if parallel is None else parallel
+        self.timings = ComponentTimings()
 
     def recommend(
         self,
         item_idx: int,
         ratings: Dict[int, float],
         k_similar_users: int,
-        top_n: int
+        top_n: int,
+        alpha: Optional[float] = None,
+        beta: Optional[float] = None,
+        candidate_pool: Optional[int] = None,
+        normalization: Optional[Union[str, ScoreNormalization]] = None
     ) -> List[ContentSimilarity]:
         """
         Recommend n most similar items
@@ -84,51 +230,137 @@ class HybridModel:
             top_n (int, optional): 
                 Number of results to return
 
+            alpha (Optional[float]):
+                Weighting of content similarity score for this call.
+                Defaults to the model's alpha.
+
+            beta (Optional[float]):
+                Weighting of item collaborative filtering score for this call.
+                Defaults to the model's beta.
+
+            candidate_pool (Optional[int]):
+                Candidates fetched from each component for this call, at
+                least top_n. Defaults to the model's candidate_pool.
+
+            normalization (Optional[Union[str, ScoreNormalization]]):
+                Score normalization for this call.
+                Defaults to the model's normalization.
+
         Returns:
             List[ContentSimilarity]: 
                 List of results.
                 Tuple of index of item and similarity score for each result
         """
-        
-        # 1. Content scores
-        content_scores = dict(self.content_model.recommend(item_idx, top_n))
+        candidate_pool = candidate_pool or self.candidate_pool or top_n
+        pool = max(top_n, candidate_pool)
 
-        # 2. Item-item CF scores
-        item_scores = dict(self.item_collab_model.recommend(item_idx, top_n))
-
-        # 3. User-user CF scores using new user ratings
-        user_scores = dict(self.user_collab_model.recommend(
-            ratings=ratings, 
-            top_n=top_n,
-            k_similar_users=k_similar_users,
-        ))
+        # 1-3. Content, item-item CF and user-user CF scores
+        content_scores, item_scores, user_scores = self._run_components([
+            lambda: self.content_model.recommend(item_idx, pool),
+            lambda: self.item_collab_model.recommend(item_idx, pool),
+            lambda: self.user_collab_model.recommend(
+                ratings=ratings, 
+                top_n=pool,
+                k_similar_users=k_similar_users,
+            ),
+        ])
 
         # 4. Combine scores
-        combined_scores = self._combine_scores(content_scores, item_scores, user_scores)
+        start = time.perf_counter()
+        ids, scores = self._combine_scores(
+            content_scores,
+            item_scores,
+            user_scores,
+            alpha=alpha,
+            beta=beta,
+            normalization=normalization
+        )
 
         # 5. Return top-N
-        return self._top_n(combined_scores, top_n)
+        recommendations = self._top_n(ids, scores, top_n)
+        self.timings.record("fusion", time.perf_counter() - start)
+        return recommendations
+
+    def _run_components(self, calls: List[Callable[[], List[ContentSimilarity]]]) -> List[ScoreArrays]:
+        """
+        Run the component recommenders, in order or concurrently, timing each.
+        """
+        def timed(name: str, call: Callable[[], List[ContentSimilarity]]) -> ScoreArrays:
+            start = time.perf_counter()
+            scores = to_score_arrays(call())
+            self.timings.record(name, time.perf_counter() - start)
+            return scores
+
+        if not self.parallel:
+            return [timed(name, call) for name, call in zip(COMPONENTS, calls)]
+
+        # The calling thread runs the first component itself
+        executor = get_component_executor()
+        futures = [
+            executor.submit(timed, name, call)
+            for name, call in zip(COMPONENTS[1:], calls[1:])
+        ]
+        first = timed(COMPONENTS[0], calls[0])
+        return [first] + [f.result() for f in futures]
+
+    def timing_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Latency of each component and of fusion over the model's lifetime.
+        """
+        return self.timings.stats()
 
     def _combine_scores(
         self,
-        content_scores: Dict[int, float],
-        item_scores: Dict[int, float],
-        user_scores: Dict[int, float]
-    ) -> Dict[int, float]:
+        content_scores: ScoreArrays,
+        item_scores: ScoreArrays,
+        user_scores: ScoreArrays,
+        alpha: Optional[float] = None,
+        beta: Optional[float] = None,
+        normalization: Optional[Union[str, ScoreNormalization]] = None
+    ) -> ScoreArrays:
         """
-        Combine scores with weighted sum
+        Combine scores with weighted sum over the union of candidates,
+        after normalizing each component. Items missing from a component
+        score 0 for it.
+
+        Returns:
+            ScoreArrays: Sorted unique item indices and their combined scores
         """
-        all_ids = set(content_scores) | set(item_scores) | set(user_scores)
-        return {
-            i: self.alpha * content_scores.get(i, 0.0) +
-               self.beta  * item_scores.get(i, 0.0) +
-               self.gamma * user_scores.get(i, 0.0)
-            for i in all_ids
-        }
-
-    def _top_n(self, scores: Dict[int, float], top_n: int) -> List[ContentSimilarity]:
+        alpha = self.alpha if alpha is None else alpha
+        beta = self.beta if beta is None else beta
+        gamma = 1.0 - alpha - beta
+        normalization = ScoreNormalization(normalization or self.normalization)
+
+        components = (content_scores, item_scores, user_scores)
+        ids = np.unique(np.concatenate([c[0] for c in components]))
+        combined = np.zeros(len(ids), dtype=np.float64)
+
+        # Scatter each weighted component into its rows of the union
+        for weight, (component_ids, component_scores) in zip((alpha, beta, gamma), components):
+            rows = np.searchsorted(ids, component_ids)
+            combined[rows] += weight * normalize_scores(
+                component_ids, component_scores, normalization
+            )
+
+        return ids, combined
+
+    def _top_n(
+        self,
+        ids: np.ndarray,
+        scores: np.ndarray,
+        top_n: int
+    ) -> List[ContentSimilarity]:
         """
-        Sort and return top-N items as (item_idx, score)
+        Return top-N items as (item_idx, score), highest score first
+        and ties broken by item index
         """
-        sorted_items = pd.Series(scores).sort_values(ascending=False).head(top_n)
-        return [(i, float(sorted_items[i])) for i in sorted_items.index]
\ No newline at end of file
+        top_n = min(top_n, len(ids))
+        if top_n <= 0:
+            return []
+
+        # Everything scoring at least the N-th best, so ties at the
+        # boundary are all considered before breaking them by index
+        threshold = np.partition(scores, len(scores) - top_n)[len(scores) - top_n]
+        top = np.flatnonzero(scores >= threshold)
+        top = top[np.lexsort((ids[top], -scores[top]))][:top_n]
+        return [(int(ids[i]), float(scores[i])) for i in top]
\ No newline at end of file
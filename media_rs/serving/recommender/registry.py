@@ -0,0 +1,243 @@
+import os
+import threading
+
+from collections import Counter
+from enum import Enum
+from sentence_transformers import SentenceTransformer
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
+from media_rs.serving.recommender.models.content import (
+    ContentSimilaritySBERTModel,
+    ContentSimilarityTFIDFModel
+)
+from media_rs.serving.recommender.models.collab import (
+    ItemItemCollaborativeModel,
+    UserCollaborativeModel
+)
+from media_rs.serving.recommender.models.hybrid import HybridModel
+from media_rs.serving.recommender.build.build_content_model import get_content_similarity_model
+from media_rs.serving.recommender.build.build_collab_model import get_item_cf_model, get_user_cf_model
+from media_rs.utils.data_cache import DataCache, get_data_cache
+from media_rs.utils.embedding_cache import EmbeddingCache
+from media_rs.utils.batch_encoder import BatchingEncoder, SBERT_BATCH_SIZE
+from media_rs.utils.item_index import ItemIndex
+from media_rs.rs_types.model import EmbeddingMethod, Medium
+
+# Count lookups of each shared object for the metrics endpoint, which takes
+# a lock on every request.
+REGISTRY_METRICS = os.getenv("REGISTRY_METRICS", "false").lower() in ("1", "true", "yes")
+
+
+class ModelRegistry:
+    """
+    Shared model instances of one DataCache version.
+
+    Models, ItemIndex objects, description-embedding caches and SBERT
+    encoders are built once per (medium, embedding method) on first use
+    and handed out to every request. Models are read-only after
+    construction, so they are safe to share between threads.
+    """
+    def __init__(self, cache: DataCache, count_lookups: Optional[bool] = None):
+        """
+        Initialisation
+
+        Args:
+            cache (DataCache): Warmed artifact cache the models are built from
+            count_lookups (Optional[bool]): Count lookups of each object,
+                defaults to REGISTRY_METRICS
+        """
+        self.cache = cache
+        self.version = cache.version
+        self.objects: Dict[Hashable, Any] = {}
+        # Re-entrant, composite models build their parts under the lock
+        self.lock = threading.RLock()
+        # Lookups of each object, i.e. requests served with it
+        self.count_lookups = REGISTRY_METRICS if count_lookups is None else count_lookups
+        self.lookups = Counter()
+        self.lookups_lock = threading.Lock()
+
+    def _get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        if self.count_lookups:
+            with self.lookups_lock:
+                self.lookups[key] += 1
+
+        obj = self.objects.get(key)
+        if obj is not None:
+            return obj
+
+        with self.lock:
+            obj = self.objects.get(key)
+            if obj is None:
+                obj = self.objects[key] = build()
+            return obj
+
+    def built(self, *keys: Hashable) -> bool:
+        """
+        Whether every object of keys is built, without taking the lock.
+        """
+        return all(key in self.objects for key in keys)
+
+    def content_model_built(self, medium: Medium, method: EmbeddingMethod) -> bool:
+        return self.built(("item_index", medium), ("content", medium, method))
+
+    def item_cf_model_built(self, medium: Medium) -> bool:
+        return self.built(("item_index", medium), ("item_cf", medium))
+
+    # ------------------------------------------------
+    # Shared objects
+    # ------------------------------------------------
+
+    def item_index(self, medium: Medium) -> ItemIndex:
+        return self._get(
+            ("item_index", medium),
+            lambda: ItemIndex(self.cache.get(f"{medium.value}/item_index.pkl"))
+        )
+
+    def embedding_cache(self, medium: Medium, method: EmbeddingMethod) -> EmbeddingCache:
+        return self._get(("embedding_cache", medium, method), EmbeddingCache)
+
+    def sbert_encoder(self, medium: Medium) -> Union[BatchingEncoder, SentenceTransformer]:
+        """
+        Micro-batching encoder of the medium's SBERT model, or the model
+        itself when batching is disabled.
+        """
+        def build():
+            transformer = self.cache.get(f"{medium.value}/sbert/sbert_model")
+            if SBERT_BATCH_SIZE <= 1:
+                return transformer
+            return BatchingEncoder(transformer)
+
+        return self._get(("sbert_encoder", medium), build)
+
+    # ------------------------------------------------
+    # Models
+    # ------------------------------------------------
+
+    def content_model(
+        self,
+        medium: Medium,
+        method: EmbeddingMethod
+    ) -> Union[ContentSimilaritySBERTModel, ContentSimilarityTFIDFModel]:
+        return self._get(
+            ("content", medium, method),
+            lambda: get_content_similarity_model(
+                self.cache,
+                method,
+                medium,
+                embedding_cache=self.embedding_cache(medium, method),
+                transformer=self.sbert_encoder(medium) if method == EmbeddingMethod.SBERT else None
+            )
+        )
+
+    def item_cf_model(self, medium: Medium) -> ItemItemCollaborativeModel:
+        return self._get(
+            ("item_cf", medium),
+            lambda: get_item_cf_model(self.cache, medium)
+        )
+
+    def user_cf_model(self, medium: Medium, method: EmbeddingMethod) -> UserCollaborativeModel:
+        return self._get(
+            ("user_cf", medium, method),
+            lambda: get_user_cf_model(self.cache, method, medium)
+        )
+
+    def hybrid_model(self, medium: Medium, method: EmbeddingMethod) -> HybridModel:
+        """
+        Hybrid of the shared sub-models. Weights are passed per call to
+        HybridModel.recommend.
+        """
+        return self._get(
+            ("hybrid", medium, method),
+            lambda: HybridModel(
+                content_model=self.content_model(medium, method),
+                item_collab_model=self.item_cf_model(medium),
+                user_collab_model=self.user_cf_model(medium, method)
+            )
+        )
+
+    @staticmethod
+    def _label(key: Hashable) -> str:
+        return "/".join(
+            (part.name.lower() if isinstance(part.value, int) else part.value)
+            if isinstance(part, Enum) else str(part)
+            for part in key
+        )
+
+    def lookup_counts(self) -> Dict[str, int]:
+        """
+        Lookups of each shared object, e.g. content/movies/sbert, since the
+        registry was created. Empty unless lookups are counted.
+        """
+        with self.lookups_lock:
+            return {self._label(key): count for key, count in self.lookups.items()}
+
+    def embedding_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Size, hits and misses of each description-embedding cache built so
+        far, keyed by medium/method.
+        """
+        return {
+            self._label(key[1:]): cache.stats()
+            for key, cache in list(self.objects.items())
+            if key[0] == "embedding_cache"
+        }
+
+    def hybrid_timings(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Component latencies of each hybrid model built so far, keyed by
+        medium/method.
+        """
+        return {
+            f"{key[1].value}/{key[2].name.lower()}": model.timing_stats()
+            for key, model in list(self.objects.items())
+            if key[0] == "hybrid"
+        }
+
+    def warmup(self):
+        """
+        Build every model up front. Skipped for lazy caches, where it would
+        force every artifact to load.
+        """
+        if self.cache.lazy:
+            return
+
+        for medium in Medium:
+            self.item_index(medium)
+            self.item_cf_model(medium)
+            for method in EmbeddingMethod:
+                self.hybrid_model(medium, method)
+
+    def close(self):
+        """
+        Stop background encoders. Late callers fall back to direct encoding.
+        """
+        for key, obj in list(self.objects.items()):
+            if key[0] == "sbert_encoder" and isinstance(obj, BatchingEncoder):
+                obj.close()
+
+
+# ----------------------------------------------------------------------
+# Global accessor
+# ----------------------------------------------------------------------
+
+_REGISTRY: Optional[ModelRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Registry of the active DataCache, replaced when the cache is reloaded.
+    """
+    global _REGISTRY
+    cache = get_data_cache()
+
+    registry = _REGISTRY
+    if registry is not None and registry.cache is cache:
+        return registry
+
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None or _REGISTRY.cache is not cache:
+            if _REGISTRY is not None:
+                _REGISTRY.close()
+            _REGISTRY = ModelRegistry(cache)
+        return _REGISTRY
@@ -1,13 +1,20 @@
 import faiss
 import numpy as np
 
-from typing import Tuple
+from typing import Tuple, Dict
 
-from media_rs.training.features.faiss import build_faiss_index, FaissMethod
+from media_rs.training.features.faiss import (
+    build_faiss_index,
+    evaluate_faiss_index,
+    FaissMethod,
+    FaissIndexType
+)
 
 def build_faiss_indices(
     item_embeddings: np.ndarray, 
-    user_embeddings: np.ndarray
+    user_embeddings: np.ndarray,
+    user_index_type: FaissIndexType = FaissIndexType.FLAT,
+    **index_kwargs
 ) -> Tuple[faiss.Index, faiss.Index]:
     """
     Returns FAISS indices of item and user embeddings
@@ -15,14 +22,59 @@ def build_faiss_indices(
     Args:
         item_embeddings (np.ndarray): Item embeddings
         user_embeddings (np.ndarray): User embeddings
+        user_index_type (FaissIndexType): 
+            Index type of the user index. Defaults to exact FLAT search.
+        **index_kwargs: 
+            ANN options passed to build_faiss_index (nlist, pq_m, hnsw_m,
+            nprobe, ef_search, train_size)
 
     Returns:
-        _type_: _description_
+        Tuple[faiss.Index, faiss.Index]: Item index and user index
     """
     
     faiss_index_content = build_faiss_index(item_embeddings, metric=FaissMethod.COSINE)
 
-    faiss_index_users = faiss.IndexFlatIP(user_embeddings.shape[1])
-    faiss_index_users.add(user_embeddings)
+    faiss_index_users = build_faiss_index(
+        user_embeddings,
+        metric=FaissMethod.COSINE,
+        index_type=user_index_type,
+        **index_kwargs
+    )
 
     return faiss_index_content, faiss_index_users
+
+def report_user_index(
+    faiss_index_users: faiss.Index,
+    user_embeddings: np.ndarray,
+    num_queries: int = 1000,
+    k: int = 50
+) -> Dict[str, float]:
+    """
+    Prints recall@k and latency of a user index against a FLAT baseline,
+    using a sample of users as queries.
+
+    Args:
+        faiss_index_users (faiss.Index): User index to evaluate
+        user_embeddings (np.ndarray): User embeddings the index was built from
+        num_queries (int): Number of sampled query users. Defaults to 1000.
+        k (int): Number of neighbours compared. Defaults to 50.
+
+    Returns:
+        Dict[str, float]: Report from evaluate_faiss_index
+    """
+    baseline = build_faiss_index(user_embeddings.copy(), metric=FaissMethod.COSINE)
+
+    rng = np.random.default_rng(0)
+    sample = rng.choice(
+        user_embeddings.shape[0],
+        size=min(num_queries, user_embeddings.shape[0]),
+        replace=False
+    )
+
+    report = evaluate_faiss_index(faiss_index_users, baseline, user_embeddings[sample], k=k)
+    print(
+        f"User index recall@{k}={report[f'recall@{k}']:.3f} "
+        f"latency={report['latency_ms']:.3f}ms "
+        f"(flat {report['baseline_latency_ms']:.3f}ms)"
+    )
+    return report
@@ -1,17 +1,118 @@
+import os
+import tempfile
 import numpy as np
 import faiss
-from sklearn.metrics.pairwise import cosine_similarity
-from scipy.sparse import csr_matrix
+from concurrent.futures import ProcessPoolExecutor
+from scipy.sparse import csr_matrix, spmatrix
 
-from typing import List
+from typing import Optional, Tuple, Union
+
+from media_rs.utils.topk_graph import (
+    TopKGraph,
+    TopKDict,
+    select_topk,
+    drop_self_matches
+)
+
+# Rough peak bytes per cell of a (batch_items, num_items) similarity block:
+# sparse product (data + indices), dense float32 block and the argpartition
+# workspace used by select_topk.
+SIM_BLOCK_BYTES_PER_CELL = 32
+
+def normalize_item_rows(user_item_matrix: spmatrix) -> Tuple[csr_matrix, csr_matrix]:
+    """
+    L2-normalise every item's rating vector once, in float32.
+
+    Args:
+        user_item_matrix (spmatrix): 
+            Sparse user–item interaction matrix of shape (num_users, num_items)
+
+    Returns:
+        Tuple[csr_matrix, csr_matrix]: 
+            1. Item-major matrix (num_items, num_users) with unit-norm rows
+            2. Its transpose (num_users, num_items), also CSR
+    """
+    item_user = csr_matrix(user_item_matrix.T, dtype=np.float32)
+
+    norms = np.sqrt(np.asarray(item_user.multiply(item_user).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    item_user.data /= np.repeat(norms, np.diff(item_user.indptr)).astype(np.float32)
+
+    return item_user, item_user.T.tocsr()
+
+
+def batch_size_for_budget(num_items: int, memory_budget_mb: float) -> int:
+    """
+    Largest number of items per batch whose similarity block fits the budget.
+    """
+    budget = memory_budget_mb * 1024 * 1024
+    return max(1, int(budget // (num_items * SIM_BLOCK_BYTES_PER_CELL)))
+
+
+def cf_topk_block(
+    item_user: csr_matrix,
+    user_item: csr_matrix,
+    start: int,
+    end: int,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k item-CF neighbours of items start..end from normalised matrices.
+    """
+    # Shape: (batch_items, num_items), row slice of CSR is cheap
+    sim = (item_user[start:end] @ user_item).toarray()
+
+    # Top k per row with self excluded, for the whole batch at once
+    return select_topk(sim, k, row_offset=start, inplace=True)
+
+
+# ------------------------------------------------
+# Process pool workers
+# ------------------------------------------------
+
+# Normalised matrices attached by each worker process from memmapped files
+_WORKER_MATRICES: Optional[Tuple[csr_matrix, csr_matrix]] = None
+
+
+def _save_csr(matrix: csr_matrix, prefix: str):
+    np.save(f"{prefix}_data.npy", matrix.data)
+    np.save(f"{prefix}_indices.npy", matrix.indices)
+    np.save(f"{prefix}_indptr.npy", matrix.indptr)
+
+
+def _load_csr(prefix: str, shape: Tuple[int, int]) -> csr_matrix:
+    return csr_matrix(
+        (
+            np.load(f"{prefix}_data.npy", mmap_mode="r"),
+            np.load(f"{prefix}_indices.npy", mmap_mode="r"),
+            np.load(f"{prefix}_indptr.npy", mmap_mode="r"),
+        ),
+        shape=shape,
+        copy=False,
+    )
+
+
+def _init_cf_worker(tmp_dir: str, shape: Tuple[int, int]):
+    global _WORKER_MATRICES
+    _WORKER_MATRICES = (
+        _load_csr(os.path.join(tmp_dir, "item_user"), shape),
+        _load_csr(os.path.join(tmp_dir, "user_item"), shape[::-1]),
+    )
+
+
+def _cf_topk_worker(start: int, end: int, k: int) -> Tuple[int, np.ndarray, np.ndarray]:
+    item_user, user_item = _WORKER_MATRICES
+    return (start, *cf_topk_block(item_user, user_item, start, end, k))
 
-from media_rs.rs_types.model import ContentSimilarity
 
 def build_item_cf_topk(
     user_item_matrix: csr_matrix,
     k: int = 100,
-    batch_size: int = 1000
-) -> List[ContentSimilarity]:
+    batch_size: int = 1000,
+    as_dict: bool = False,
+    memory_budget_mb: Optional[float] = None,
+    workers: int = 1
+) -> Union[TopKGraph, TopKDict]:
     """
     Builds similarity graph of nearest K users using cosine similarity.
 
@@ -26,9 +127,23 @@ def build_item_cf_topk(
         
         batch_size (int, optional): 
             Size of batch to compute at any one time. Defaults to 1000.
+        
+        as_dict (bool, optional): 
+            Return the legacy dict-of-lists format instead of a TopKGraph.
+            Defaults to False.
+        
+        memory_budget_mb (Optional[float], optional): 
+            Approximate peak memory for one similarity block. Overrides
+            batch_size when set. Defaults to None.
+        
+        workers (int, optional): 
+            Number of processes computing batches in parallel. Workers
+            share the normalised matrices through memmapped files and
+            each holds one similarity block at a time. Output is identical
+            to the serial build. Defaults to 1.
 
     Returns:
-        List[ContentSimilarity]: Top K nearest neighbour graph
+        Union[TopKGraph, TopKDict]: Top K nearest neighbour graph
     """
 
     if k <= 0:
@@ -42,40 +157,54 @@ def build_item_cf_topk(
     # Clamp k to a safe maximum
     k = min(k, num_items - 1)
 
-    topk_cf: dict[int, ContentSimilarity] = {}
-
-    for start in range(0, num_items, batch_size):
-        end = min(start + batch_size, num_items)
-
-        # Shape: (batch_items, num_users)
-        batch_matrix = user_item_matrix[:, start:end].T
-
-        # Shape: (batch_items, num_items)
-        sim = cosine_similarity(batch_matrix, user_item_matrix.T)
-
-        for i, item_idx in enumerate(range(start, end)):
-            # Get top k+1 to exclude self
-            top_indices = np.argpartition(
-                -sim[i], kth=k + 1
-            )[: k + 1]
-
-            neighbors = [
-                (j, float(sim[i, j]))
-                for j in top_indices
-                if j != item_idx
-            ]
-
-            # Sort final neighbors
-            neighbors.sort(key=lambda x: x[1], reverse=True)
-            topk_cf[item_idx] = neighbors[:k]
-
-    return topk_cf
+    if memory_budget_mb is not None:
+        batch_size = batch_size_for_budget(num_items, memory_budget_mb)
+
+    # Normalise once so cosine similarity is a plain sparse product
+    item_user, user_item = normalize_item_rows(user_item_matrix)
+
+    indices = np.empty((num_items, k), dtype=np.int32)
+    scores = np.empty((num_items, k), dtype=np.float32)
+
+    batches = [
+        (start, min(start + batch_size, num_items))
+        for start in range(0, num_items, batch_size)
+    ]
+
+    if workers <= 1:
+        for start, end in batches:
+            indices[start:end], scores[start:end] = cf_topk_block(
+                item_user, user_item, start, end, k
+            )
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _save_csr(item_user, os.path.join(tmp_dir, "item_user"))
+            _save_csr(user_item, os.path.join(tmp_dir, "user_item"))
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_cf_worker,
+                initargs=(tmp_dir, item_user.shape),
+            ) as pool:
+                futures = [
+                    pool.submit(_cf_topk_worker, start, end, k)
+                    for start, end in batches
+                ]
+                for future in futures:
+                    start, block_indices, block_scores = future.result()
+                    end = start + block_indices.shape[0]
+                    indices[start:end] = block_indices
+                    scores[start:end] = block_scores
+
+    topk_cf = TopKGraph(indices, scores)
+    return topk_cf.to_dict() if as_dict else topk_cf
 
 
 def build_topk_content(
     item_embeddings:np.ndarray, 
-    top_k: int=100
-) -> List[ContentSimilarity]:
+    top_k: int=100,
+    as_dict: bool = False
+) -> Union[TopKGraph, TopKDict]:
     """
     Builds similarity graph of nearest K users using FAISS.
 
@@ -85,9 +214,13 @@ def build_topk_content(
             where each row represents an item in a latent vector space.
         
         top_k (int, optional): Number of nearest users to graph. Defaults to 100.
+        
+        as_dict (bool, optional): 
+            Return the legacy dict-of-lists format instead of a TopKGraph.
+            Defaults to False.
 
     Returns:
-        List[ContentSimilarity]: Top K nearest neighbour graph
+        Union[TopKGraph, TopKDict]: Top K nearest neighbour graph
     """
     
     if top_k <= 0:
@@ -113,15 +246,5 @@ def build_topk_content(
     # +1 to remove self-match
     distances, indices = index.search(item_embeddings, top_k + 1)
 
-    topk_content: dict[int, ContentSimilarity] = {}
-
-    for i in range(num_items):
-        neighbors = [
-            (int(n), float(d))
-            for n, d in zip(indices[i], distances[i])
-            if n != i
-        ][:top_k]
-
-        topk_content[i] = neighbors
-
-    return topk_content
\ No newline at end of file
+    topk_content = TopKGraph(*drop_self_matches(indices, distances, top_k))
+    return topk_content.to_dict() if as_dict else topk_content
\ No newline at end of file
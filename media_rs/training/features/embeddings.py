@@ -94,26 +94,63 @@ def compute_tfidf_embeddings(
 def compute_user_embeddings(
     user_item_matrix: csr_matrix,
     item_embeddings: np.ndarray,
+    chunk_size: int = 10000,
 ) -> np.ndarray:
+    """
+    Embeds each user as the mean of their rated items' embeddings,
+    weighted by mean-centred ratings.
 
-    num_users = user_item_matrix.shape[0]
-    emb_dim = item_embeddings.shape[1]
+    Computed as a sparse (users, items) @ dense (items, dim) product over
+    chunks of users, divided by each user's number of ratings.
 
-    user_embeddings = np.zeros((num_users, emb_dim), dtype=np.float32)
+    Args:
+        user_item_matrix (csr_matrix): 
+            Sparse user–item interaction matrix of shape
+            (num_users, num_items)
+            
+        item_embeddings (np.ndarray): 
+            Item embedding matrix of shape (num_items, embedding_dim)
+            
+        chunk_size (int): 
+            Number of users per chunk, bounds temporary memory.
+            Defaults to 10000.
 
-    for uid in range(num_users):
-        row = user_item_matrix.getrow(uid)
+    Returns:
+        np.ndarray: L2-normalised user embeddings of shape (num_users, embedding_dim)
+    """
 
-        if row.nnz == 0:
-            continue
+    user_item_matrix = csr_matrix(user_item_matrix, dtype=np.float32)
+    item_embeddings = np.asarray(item_embeddings, dtype=np.float32)
 
-        item_ids = row.indices
-        ratings = row.data.astype(np.float32)
+    num_users = user_item_matrix.shape[0]
+    emb_dim = item_embeddings.shape[1]
 
-        ratings = ratings - ratings.mean()
+    user_embeddings = np.zeros((num_users, emb_dim), dtype=np.float32)
+
+    for start in range(0, num_users, chunk_size):
+        end = min(start + chunk_size, num_users)
+
+        chunk = user_item_matrix[start:end]
+        nnz = np.diff(chunk.indptr)
+        rated = nnz > 0
+
+        # Mean-centre each user's ratings (new matrix, input left untouched)
+        sums = np.asarray(chunk.sum(axis=1), dtype=np.float32).ravel()
+        means = np.zeros(end - start, dtype=np.float32)
+        means[rated] = sums[rated] / nnz[rated]
+
+        centred = csr_matrix(
+            (
+                chunk.data[:chunk.indptr[-1]] - np.repeat(means, nnz),
+                chunk.indices[:chunk.indptr[-1]],
+                chunk.indptr,
+            ),
+            shape=chunk.shape,
+        )
 
-        vectors = item_embeddings[item_ids] * ratings[:, None]
-        user_embeddings[uid] = vectors.mean(axis=0)
+        chunk_embeddings = centred @ item_embeddings
+        chunk_embeddings[rated] /= nnz[rated, None]
+        user_embeddings[start:end] = chunk_embeddings
 
     faiss.normalize_L2(user_embeddings)
     return user_embeddings
@@ -1,20 +1,37 @@
+import time
 import faiss
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Union, Optional
 
 from enum import Enum
 
+from media_rs.utils.topk_graph import TopKGraph, TopKDict, drop_self_matches
+
 class FaissMethod(str, Enum):
     COSINE = "cosine"
     L2 = "l2"
 
+class FaissIndexType(str, Enum):
+    FLAT = "flat"
+    IVF_FLAT = "ivf_flat"
+    IVF_PQ = "ivf_pq"
+    HNSW = "hnsw"
+
 # ----------------------------
 # 1. Build FAISS index
 # ----------------------------
 def build_faiss_index(
     embeddings: np.ndarray,
     n_dims: int = None,
-    metric: FaissMethod = FaissMethod.COSINE
+    metric: FaissMethod = FaissMethod.COSINE,
+    index_type: FaissIndexType = FaissIndexType.FLAT,
+    nlist: Optional[int] = None,
+    pq_m: Optional[int] = None,
+    hnsw_m: int = 32,
+    nprobe: int = 16,
+    ef_search: int = 64,
+    train_size: int = 100_000,
+    seed: int = 42
 ) -> faiss.Index:
     """
     Build a FAISS index for approximate nearest neighbors
@@ -28,9 +45,37 @@ def build_faiss_index(
         
         metric (FaissMethod): 
             Method to use for calculating
+        
+        index_type (FaissIndexType): 
+            Exhaustive FLAT search (default) or an approximate
+            IVF_FLAT, IVF_PQ or HNSW index
+        
+        nlist (Optional[int]): 
+            Number of IVF cells. Defaults to 4 * sqrt(num_items).
+        
+        pq_m (Optional[int]): 
+            Number of PQ sub-quantizers, must divide n_dims.
+            Defaults to the largest divisor of n_dims up to 32.
+        
+        hnsw_m (int): 
+            Number of HNSW graph neighbours per node. Defaults to 32.
+        
+        nprobe (int): 
+            IVF cells visited per search, persisted with the index.
+            Defaults to 16.
+        
+        ef_search (int): 
+            HNSW search depth, persisted with the index. Defaults to 64.
+        
+        train_size (int): 
+            Maximum number of embeddings sampled to train IVF indices.
+            Defaults to 100000.
+        
+        seed (int): 
+            Seed of the training sample. Defaults to 42.
 
     Raises:
-        ValueError: If invalid FaissMethod
+        ValueError: If invalid FaissMethod or FaissIndexType
 
     Returns:
         faiss.Index: 
@@ -43,27 +88,136 @@ def build_faiss_index(
     if metric.value == "cosine":
         # Normalize embeddings for cosine similarity
         faiss.normalize_L2(embeddings)
-        index = faiss.IndexFlatIP(n_dims)  # Inner product = cosine for normalized vectors
+        # Inner product = cosine for normalized vectors
+        faiss_metric = faiss.METRIC_INNER_PRODUCT
     elif metric.value == "l2":
-        index = faiss.IndexFlatL2(n_dims)
+        faiss_metric = faiss.METRIC_L2
     else:
         raise ValueError("metric must be 'cosine' or 'l2'")
 
+    index_type = FaissIndexType(index_type)
+    num_vectors = embeddings.shape[0]
+
+    if index_type == FaissIndexType.FLAT:
+        if faiss_metric == faiss.METRIC_INNER_PRODUCT:
+            index = faiss.IndexFlatIP(n_dims)
+        else:
+            index = faiss.IndexFlatL2(n_dims)
+
+    elif index_type == FaissIndexType.HNSW:
+        index = faiss.IndexHNSWFlat(n_dims, hnsw_m, faiss_metric)
+        index.hnsw.efSearch = ef_search
+
+    elif index_type in (FaissIndexType.IVF_FLAT, FaissIndexType.IVF_PQ):
+        if nlist is None:
+            nlist = int(4 * np.sqrt(num_vectors))
+        nlist = max(1, min(nlist, num_vectors))
+
+        quantizer = (
+            faiss.IndexFlatIP(n_dims)
+            if faiss_metric == faiss.METRIC_INNER_PRODUCT
+            else faiss.IndexFlatL2(n_dims)
+        )
+
+        if index_type == FaissIndexType.IVF_FLAT:
+            index = faiss.IndexIVFFlat(quantizer, n_dims, nlist, faiss_metric)
+        else:
+            if pq_m is None:
+                pq_m = max(m for m in range(1, min(n_dims, 32) + 1) if n_dims % m == 0)
+            index = faiss.IndexIVFPQ(quantizer, n_dims, nlist, pq_m, 8, faiss_metric)
+
+        # Train on a sample, the full set is rarely needed for k-means
+        rng = np.random.default_rng(seed)
+        sample = rng.choice(num_vectors, size=min(num_vectors, train_size), replace=False)
+        index.train(np.ascontiguousarray(embeddings[np.sort(sample)]))
+        index.nprobe = nprobe
+
+    else:
+        raise ValueError(f"Unsupported index type '{index_type}'")
+
     index.add(embeddings)
     return index
 
+def set_search_params(
+    index: faiss.Index,
+    nprobe: Optional[int] = None,
+    ef_search: Optional[int] = None
+) -> faiss.Index:
+    """
+    Override search parameters of a loaded index where applicable.
+    
+    nprobe only applies to IVF indices and ef_search to HNSW indices;
+    both are otherwise ignored.
+
+    Args:
+        index (faiss.Index): FAISS index
+        nprobe (Optional[int]): IVF cells visited per search
+        ef_search (Optional[int]): HNSW search depth
+
+    Returns:
+        faiss.Index: The same index
+    """
+    if nprobe is not None:
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            ivf.nprobe = nprobe
+
+    if ef_search is not None and hasattr(index, "hnsw"):
+        index.hnsw.efSearch = ef_search
+
+    return index
+
+def evaluate_faiss_index(
+    index: faiss.Index,
+    baseline: faiss.Index,
+    queries: np.ndarray,
+    k: int = 50
+) -> Dict[str, float]:
+    """
+    Recall@k and search latency of an ANN index against an exact baseline.
+
+    Args:
+        index (faiss.Index): Index to evaluate
+        baseline (faiss.Index): Exact (FLAT) index over the same vectors
+        queries (np.ndarray): Query embeddings of shape (num_queries, dim)
+        k (int): Number of neighbours compared. Defaults to 50.
+
+    Returns:
+        Dict[str, float]: 
+            recall@k, and per-query latency in ms of index and baseline
+    """
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+    num_queries = queries.shape[0]
+
+    start = time.perf_counter()
+    _, expected = baseline.search(queries, k)
+    baseline_ms = (time.perf_counter() - start) * 1000 / num_queries
+
+    start = time.perf_counter()
+    _, found = index.search(queries, k)
+    index_ms = (time.perf_counter() - start) * 1000 / num_queries
+
+    hits = sum(
+        len(np.intersect1d(e[e >= 0], f[f >= 0]))
+        for e, f in zip(expected, found)
+    )
+    total = int((expected >= 0).sum())
+
+    return {
+        f"recall@{k}": hits / total if total else 1.0,
+        "latency_ms": index_ms,
+        "baseline_latency_ms": baseline_ms,
+    }
+
 # ----------------------------
 # 2. Query Top-K neighbors
 # ----------------------------
 def query_faiss_topk(
     index: faiss.Index,
     embeddings: np.ndarray,
-    k: int = 100
-) -> Dict[int, List[Tuple[int, float]]]:
-    """
-    Query top-K neighbors for each embedding in embeddings
-    Returns dictionary: item_id -> list of (neighbor_id, score)
-    """
+    k: int = 100,
+    as_dict: bool = False
+) -> Union[TopKGraph, TopKDict]:
     """
     Query top-K neighbors for each embedding in embeddings
 
@@ -76,11 +230,15 @@ def query_faiss_topk(
             
         k (int):
             Number of nearest neighbours to query. Defaults to 100.
+            
+        as_dict (bool):
+            Return the legacy dictionary of node index to list of 
+            (neighbour index, distance) instead of a TopKGraph.
+            Defaults to False.
 
     Returns:
-        Dict[int, List[Tuple[int, float]]]: 
-            Dictionary of node index, and it's K nearest neighbours index
-            position and distance
+        Union[TopKGraph, TopKDict]: 
+            K nearest neighbours index position and distance of each node
         
     """
     if k <= 0:
@@ -92,7 +250,11 @@ def query_faiss_topk(
     num_queries = embeddings.shape[0]
 
     if num_queries == 0:
-        return {}
+        empty = TopKGraph(
+            np.empty((0, k), dtype=np.int32),
+            np.empty((0, k), dtype=np.float32)
+        )
+        return {} if as_dict else empty
 
     # FAISS requires float32
     embeddings = embeddings.astype(np.float32, copy=False)
@@ -108,15 +270,5 @@ def query_faiss_topk(
     # Search k+1 so we can drop self-matches
     distances, indices = index.search(embeddings, k + 1)
 
-    topk_dict: Dict[int, List[Tuple[int, float]]] = {}
-
-    for i in range(num_queries):
-        neighbors = [
-            (int(n), float(d))
-            for n, d in zip(indices[i], distances[i])
-            if n != i
-        ][:k]
-
-        topk_dict[i] = neighbors
-
-    return topk_dict
\ No newline at end of file
+    topk = TopKGraph(*drop_self_matches(indices, distances, k))
+    return topk.to_dict() if as_dict else topk
\ No newline at end of file
@@ -0,0 +1,129 @@
+import json
+import time
+import numpy as np
+
+from pathlib import Path
+from typing import Dict, List, Union
+
+from sentence_transformers import SentenceTransformer
+
+from media_rs.utils.sbert_backend import (
+    PARITY_REPORT,
+    SbertBackend,
+    SBERT_QUANTIZATION,
+    load_sbert_model,
+    onnx_file_name
+)
+
+def export_sbert_onnx(
+    model_dir: Union[str, Path],
+    quantization: str = SBERT_QUANTIZATION
+):
+    """
+    Export a saved SBERT model to ONNX and an int8 dynamically quantized ONNX,
+    written to `{model_dir}/onnx/`.
+
+    Requires sentence-transformers[onnx].
+
+    Args:
+        model_dir (Union[str, Path]): Saved model directory
+        quantization (str): Target instruction set (arm64, avx2, avx512, avx512_vnni)
+    """
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    # Loading a torch checkpoint with the ONNX backend exports it
+    onnx_model = SentenceTransformer(str(model_dir), backend="onnx")
+    onnx_model.save(str(model_dir))
+
+    export_dynamic_quantized_onnx_model(onnx_model, quantization, str(model_dir))
+
+def compare_sbert_backends(
+    reference: SentenceTransformer,
+    candidate: SentenceTransformer,
+    texts: List[str],
+    threshold: float = 0.99,
+    repeats: int = 3
+) -> Dict[str, float]:
+    """
+    Embedding parity and encode latency of a candidate backend against the
+    reference model.
+
+    Args:
+        reference (SentenceTransformer): Reference (torch) model
+        candidate (SentenceTransformer): Model under test
+        texts (List[str]): Texts to encode
+        threshold (float): Minimum acceptable per-text cosine similarity
+        repeats (int): Timed encode passes per model, best one is reported
+
+    Returns:
+        Dict[str, float]:
+            min_cosine, mean_cosine, reference_ms and candidate_ms per text,
+            and passed (1.0 when min_cosine >= threshold)
+    """
+    def best_time(model: SentenceTransformer) -> float:
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+            times.append(time.perf_counter() - start)
+        return min(times) * 1000 / len(texts)
+
+    ref = reference.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    cand = candidate.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    cosine = np.sum(ref * cand, axis=1)
+
+    return {
+        "min_cosine": float(cosine.min()),
+        "mean_cosine": float(cosine.mean()),
+        "reference_ms": best_time(reference),
+        "candidate_ms": best_time(candidate),
+        "passed": float(cosine.min() >= threshold),
+    }
+
+def report_sbert_backends(
+    model_dir: Union[str, Path],
+    texts: List[str],
+    threshold: float = 0.99
+) -> Dict[SbertBackend, Dict[str, float]]:
+    """
+    Prints parity and latency of each exported ONNX backend against torch
+    and writes them to PARITY_REPORT in the model directory.
+    load_sbert_model only serves exports whose report passed.
+
+    Args:
+        model_dir (Union[str, Path]): Saved and exported model directory
+        texts (List[str]): Sample texts to encode
+        threshold (float): Minimum acceptable per-text cosine similarity
+
+    Returns:
+        Dict[SbertBackend, Dict[str, float]]: Report of each backend
+    """
+    reference = load_sbert_model(model_dir, SbertBackend.TORCH)
+
+    reports = {}
+    saved = {}
+    for backend in (SbertBackend.ONNX, SbertBackend.ONNX_INT8):
+        file_name = onnx_file_name(backend)
+        if not Path(model_dir, file_name).exists():
+            continue
+
+        # Loaded directly, load_sbert_model refuses exports without a report
+        candidate = SentenceTransformer(
+            str(model_dir),
+            backend="onnx",
+            model_kwargs={"file_name": file_name}
+        )
+        report = compare_sbert_backends(reference, candidate, texts, threshold)
+        reports[backend] = report
+        saved[file_name] = {**report, "passed": bool(report["passed"]), "threshold": threshold}
+
+        print(
+            f"SBERT {backend.value}: min cosine={report['min_cosine']:.4f} "
+            f"mean cosine={report['mean_cosine']:.4f} "
+            f"latency={report['candidate_ms']:.2f}ms/text "
+            f"(torch {report['reference_ms']:.2f}ms/text)"
+            f"{'' if report['passed'] else ' BELOW THRESHOLD, not served'}"
+        )
+
+    Path(model_dir, PARITY_REPORT).write_text(json.dumps(saved, indent=2))
+    return reports
@@ -0,0 +1,165 @@
+import os
+import time
+import queue
+import threading
+import numpy as np
+
+from concurrent.futures import Future
+from typing import List, Tuple, Union
+
+from sentence_transformers import SentenceTransformer
+
+# Largest number of descriptions encoded in one forward pass.
+SBERT_BATCH_SIZE = int(os.getenv("SBERT_BATCH_SIZE", "32"))
+
+# Milliseconds the first request of a batch waits for others to join.
+SBERT_BATCH_WAIT_MS = float(os.getenv("SBERT_BATCH_WAIT_MS", "5"))
+
+
+class BatchingEncoder:
+    """
+    Micro-batching front end for a SentenceTransformer.
+
+    Concurrent encode() calls are queued and a background thread encodes
+    them together, up to `max_batch_size` texts or `max_wait_ms` after the
+    first one arrives, then hands each caller its own rows.
+    """
+    def __init__(
+        self,
+        transformer: SentenceTransformer,
+        max_batch_size: int = SBERT_BATCH_SIZE,
+        max_wait_ms: float = SBERT_BATCH_WAIT_MS
+    ):
+        """
+        Initialisation
+
+        Args:
+            transformer (SentenceTransformer): Model used for encoding
+            max_batch_size (int): Maximum texts per forward pass
+            max_wait_ms (float): Maximum time spent collecting a batch
+        """
+        self.transformer = transformer
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+
+        self.requests: "queue.Queue[Tuple[str, bool, Future]]" = queue.Queue()
+        self.lock = threading.Lock()
+        self.worker = None
+        self.closed = False
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        **kwargs
+    ) -> np.ndarray:
+        """
+        Same call shape as SentenceTransformer.encode, returning a numpy array.
+
+        Extra keyword arguments are not batchable and go straight to the
+        transformer.
+        """
+        if kwargs or not convert_to_numpy:
+            return self.transformer.encode(
+                sentences,
+                convert_to_numpy=convert_to_numpy,
+                normalize_embeddings=normalize_embeddings,
+                **kwargs
+            )
+
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return self.transformer.encode(
+                texts, convert_to_numpy=True, normalize_embeddings=normalize_embeddings
+            )
+
+        futures = [Future() for _ in texts]
+        with self.lock:
+            closed = self.closed
+            if not closed:
+                self._ensure_worker()
+                for text, future in zip(texts, futures):
+                    self.requests.put((text, normalize_embeddings, future))
+
+        if closed:
+            # Late callers of a replaced encoder encode on their own
+            return self.transformer.encode(
+                sentences, convert_to_numpy=True, normalize_embeddings=normalize_embeddings
+            )
+
+        embeddings = np.stack([f.result() for f in futures])
+        return embeddings[0] if single else embeddings
+
+    def _ensure_worker(self):
+        # Called with self.lock held
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(
+                target=self._run, name="sbert-batcher", daemon=True
+            )
+            self.worker.start()
+
+    def close(self):
+        """
+        Stop the worker once queued requests are encoded.
+        """
+        with self.lock:
+            self.closed = True
+            if self.worker is not None:
+                self.requests.put(None)
+
+    def _collect_batch(self) -> Tuple[List[Tuple[str, bool, Future]], bool]:
+        """
+        Block for one request, then gather more until full or timed out.
+
+        Returns:
+            Tuple[List[Tuple[str, bool, Future]], bool]:
+                Requests of the batch and whether close() was called
+        """
+        batch = []
+        request = self.requests.get()
+        deadline = time.monotonic() + self.max_wait
+
+        while request is not None:
+            batch.append(request)
+            if len(batch) >= self.max_batch_size:
+                return batch, False
+
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    request = self.requests.get(timeout=remaining)
+                else:
+                    # Past the deadline, only take what is already queued
+                    request = self.requests.get_nowait()
+            except queue.Empty:
+                return batch, False
+
+        return batch, True
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch, stop = self._collect_batch()
+
+            # normalize_embeddings applies to the whole forward pass
+            for normalize in (False, True):
+                group = [r for r in batch if r[1] == normalize]
+                if not group:
+                    continue
+
+                try:
+                    embeddings = self.transformer.encode(
+                        [text for text, _, _ in group],
+                        convert_to_numpy=True,
+                        normalize_embeddings=normalize
+                    )
+                except Exception as e:
+                    for _, _, future in group:
+                        future.set_exception(e)
+                    continue
+
+                for (_, _, future), emb in zip(group, embeddings):
+                    future.set_result(emb)
+
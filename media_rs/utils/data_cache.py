@@ -1,21 +1,72 @@
 import os
+import re
+import json
+import hashlib
 import pickle
+import threading
+import time
+import faiss
 import numpy as np
 
-from scipy.sparse import load_npz
-from huggingface_hub import hf_hub_download, snapshot_download
-from sentence_transformers import SentenceTransformer
+from concurrent.futures import ThreadPoolExecutor
+from scipy.sparse import load_npz, issparse
+from huggingface_hub import HfApi, hf_hub_download, snapshot_download
 from media_rs.utils.load_data import load_faiss_index
+from media_rs.utils.sbert_backend import load_sbert_model
+from media_rs.utils.shm_store import (
+    SHM_STORE_DIR,
+    attach_npy,
+    attach_csr,
+    prune_store,
+    register_keys,
+)
+from media_rs.training.features.faiss import set_search_params
 from media_rs.rs_types.model import Medium
 
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Iterable
 
 
 HF_TOKEN = os.getenv("HF_TOKEN")
 HF_REPO = os.getenv("HF_REPO_ID")
 CACHE_FOLDER = os.getenv("CACHE_FOLDER")
 
+# Comma separated artifacts to memory-map (e.g. "sbert/item_embeddings.npy"),
+# "none" to disable. Unset uses DataCache.MMAP_FILES.
+CACHE_MMAP = os.getenv("CACHE_MMAP")
+
+# Lazy mode loads artifacts on first get() instead of during warmup().
+CACHE_LAZY = os.getenv("CACHE_LAZY", "false").lower() in ("1", "true", "yes")
+
+# Comma separated artifacts (or prefixes, e.g. "movies/tfidf") to load
+# during warmup() in lazy mode.
+CACHE_PRELOAD = os.getenv("CACHE_PRELOAD")
+
+# Optional overrides of the search parameters persisted in ANN indices.
+FAISS_NPROBE = os.getenv("FAISS_NPROBE")
+FAISS_EF_SEARCH = os.getenv("FAISS_EF_SEARCH")
+
+# Share one loaded object between artifacts with identical content
+# (e.g. the same SBERT checkpoint saved for every medium). Local files are
+# only fully hashed when a cheap fingerprint matches another artifact's.
+CACHE_DEDUP = os.getenv("CACHE_DEDUP", "true").lower() in ("1", "true", "yes")
+
+# Serve numeric artifacts (.npy arrays, CSR matrices) from a shared store
+# under SHM_STORE_DIR, written once and mapped read-only by every worker.
+CACHE_SHM = os.getenv("CACHE_SHM", "false").lower() in ("1", "true", "yes")
+
+# Threads used to download and load artifacts concurrently during warmup().
+CACHE_WARMUP_WORKERS = int(os.getenv("CACHE_WARMUP_WORKERS", "8"))
+
+# File where a reload publishes the version it switched to, shared by the
+# workers of a host so they follow it.
+CACHE_VERSION_FILE = os.getenv(
+    "CACHE_VERSION_FILE", os.path.join(SHM_STORE_DIR, ".active_version")
+)
+
+# Seconds between checks of CACHE_VERSION_FILE by each worker, 0 disables.
+CACHE_SYNC_INTERVAL = float(os.getenv("CACHE_SYNC_INTERVAL", "10"))
+
 if not HF_REPO:
     raise ValueError("HF_REPO_ID environment variable not defined.")
 if not HF_TOKEN:
@@ -25,11 +76,154 @@ if not CACHE_FOLDER:
 
 print(f"[DataCache] Using CACHE_FOLDER={CACHE_FOLDER}")
 
+
+def parse_artifact_list(value: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse a comma separated list of artifact names from an env variable.
+
+    Args:
+        value (Optional[str]): Raw env variable value
+
+    Returns:
+        Optional[List[str]]:
+            None if unset, empty list for "none", otherwise the names
+    """
+    if value is None:
+        return None
+    if value.strip().lower() == "none":
+        return []
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def artifact_nbytes(obj: Any, path: Optional[Path] = None) -> int:
+    """
+    Approximate memory footprint of a loaded artifact.
+
+    Arrays, sparse matrices and FAISS indices report their buffers, other
+    objects (pickles, models) fall back to their size on disk.
+
+    Args:
+        obj (Any): Loaded artifact
+        path (Optional[Path]): Artifact file or directory
+
+    Returns:
+        int: Size in bytes
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if issparse(obj):
+        return sum(
+            getattr(obj, name).nbytes
+            for name in ("data", "indices", "indptr")
+            if hasattr(obj, name)
+        )
+    if isinstance(obj, faiss.Index):
+        index = faiss.downcast_index(obj)
+        storage = getattr(index, "storage", None)
+        if storage is not None:
+            index = faiss.downcast_index(storage)
+        return getattr(index, "code_size", 0) * obj.ntotal
+
+    if path is None or not Path(path).exists():
+        return 0
+    path = Path(path)
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+    return path.stat().st_size
+
+
+def content_hash(path: Path) -> str:
+    """
+    Hash of a file or directory's content.
+
+    Files in the HuggingFace cache are symlinks to blobs already named by
+    their content hash, so only local files are read and hashed.
+
+    Args:
+        path (Path): File or directory
+
+    Returns:
+        str: Hex digest
+    """
+    path = Path(path)
+
+    if path.is_dir():
+        h = hashlib.sha256()
+        for f in sorted(p for p in path.rglob("*") if p.is_file()):
+            h.update(f.relative_to(path).as_posix().encode())
+            h.update(content_hash(f).encode())
+        return h.hexdigest()
+
+    real = Path(os.path.realpath(path))
+    if real.parent.name == "blobs":
+        return real.name
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# Bytes read from each end of a file for its quick_key
+QUICK_KEY_BYTES = 1 << 16
+
+
+def quick_key(path: Path) -> str:
+    """
+    Cheap fingerprint of a file or directory's content. Identical content
+    always has the same key, different keys prove different content.
+
+    HuggingFace blobs are keyed by their name, their full content hash.
+    Other files by their size and their first and last QUICK_KEY_BYTES.
+
+    Args:
+        path (Path): File or directory
+
+    Returns:
+        str: Hex digest
+    """
+    path = Path(path)
+
+    if path.is_dir():
+        h = hashlib.sha256()
+        for f in sorted(p for p in path.rglob("*") if p.is_file()):
+            h.update(f.relative_to(path).as_posix().encode())
+            h.update(quick_key(f).encode())
+        return h.hexdigest()
+
+    real = Path(os.path.realpath(path))
+    if real.parent.name == "blobs":
+        return real.name
+
+    size = path.stat().st_size
+    h = hashlib.sha256(str(size).encode())
+    with open(path, "rb") as f:
+        h.update(f.read(QUICK_KEY_BYTES))
+        if size > QUICK_KEY_BYTES:
+            f.seek(max(QUICK_KEY_BYTES, size - QUICK_KEY_BYTES))
+            h.update(f.read())
+    return h.hexdigest()
+
+
 class DataCache:
     """
     EAGER, IN-MEMORY cache.
     Everything loaded once during warmup().
     Optimized for fast requests, slow startup.
+    Large arrays (embeddings, top-K graphs) are memory-mapped (see MMAP_FILES).
+
+    In lazy mode only the preload list is loaded during warmup(),
+    everything else is downloaded and loaded on first get().
+
+    Artifacts with identical content are loaded once and shared
+    (see CACHE_DEDUP).
+
+    In shared memory mode numeric artifacts are attached read-only from a
+    store shared by all worker processes (see CACHE_SHM).
+
+    Each instance holds one artifact version. reload_data_cache() loads a
+    new version alongside it and swaps the active instance.
     """
 
     _instance = None
@@ -53,11 +247,16 @@ class DataCache:
         # ---- FAISS ----
         "tfidf/faiss_index_users.index",
         "sbert/faiss_index_users.index",
+        "tfidf/faiss_index_items.index",
+        "sbert/faiss_index_items.index",
 
-        # ---- precomputed graphs ----
-        "item_topk_cf.pkl",
-        "tfidf/item_topk_content.pkl",
-        "sbert/item_topk_content.pkl",
+        # ---- precomputed graphs (see TopKGraph) ----
+        "item_topk_cf_indices.npy",
+        "item_topk_cf_scores.npy",
+        "tfidf/item_topk_content_indices.npy",
+        "tfidf/item_topk_content_scores.npy",
+        "sbert/item_topk_content_indices.npy",
+        "sbert/item_topk_content_scores.npy",
 
         # ---- ML artifacts ----
         "tfidf/tfidf_vectorizer.pkl",
@@ -66,94 +265,428 @@ class DataCache:
         # ---- models LAST ----
         "sbert/sbert_model",
     ]
-    
+
+    # ---- large read-only arrays, memory-mapped by default ----
+    # Workers share these through the page cache instead of each
+    # holding a private copy.
+    MMAP_FILES = [
+        "tfidf/item_embeddings.npy",
+        "tfidf/user_embeddings.npy",
+        "sbert/item_embeddings.npy",
+        "sbert/user_embeddings.npy",
+        "item_topk_cf_indices.npy",
+        "item_topk_cf_scores.npy",
+        "tfidf/item_topk_content_indices.npy",
+        "tfidf/item_topk_content_scores.npy",
+        "sbert/item_topk_content_indices.npy",
+        "sbert/item_topk_content_scores.npy",
+    ]
+
     for f in files:
         for medium in Medium:
             FILES_ORDERED.append(f"{medium.value}/{f}")
 
-    def __new__(cls, repo_id: str, local_dir: Optional[str] = None):
+    def __new__(
+        cls,
+        repo_id: str,
+        local_dir: Optional[str] = None,
+        mmap_files: Optional[Iterable[str]] = None,
+        lazy: Optional[bool] = None,
+        preload: Optional[Iterable[str]] = None,
+        warmup_workers: Optional[int] = None,
+        dedup: Optional[bool] = None,
+        shm_dir: Optional[str] = None,
+        revision: Optional[str] = None,
+    ):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.repo_id = repo_id
-            cls._instance.local_dir = Path(local_dir) if local_dir else None
-            cls._instance.paths = {}
-            cls._instance.data = {}
-            cls._instance._resolve_paths()
+            cls._instance = cls._create(
+                repo_id,
+                local_dir=local_dir,
+                mmap_files=mmap_files,
+                lazy=lazy,
+                preload=preload,
+                warmup_workers=warmup_workers,
+                dedup=dedup,
+                shm_dir=shm_dir,
+                revision=revision,
+            )
         return cls._instance
 
+    @classmethod
+    def _create(
+        cls,
+        repo_id: str,
+        local_dir: Optional[str] = None,
+        mmap_files: Optional[Iterable[str]] = None,
+        lazy: Optional[bool] = None,
+        preload: Optional[Iterable[str]] = None,
+        warmup_workers: Optional[int] = None,
+        dedup: Optional[bool] = None,
+        shm_dir: Optional[str] = None,
+        revision: Optional[str] = None,
+    ) -> "DataCache":
+        """
+        New, unregistered instance, used for the singleton and for reloads.
+        """
+        if mmap_files is None:
+            mmap_files = parse_artifact_list(CACHE_MMAP)
+        if mmap_files is None:
+            mmap_files = cls.MMAP_FILES
+        if lazy is None:
+            lazy = CACHE_LAZY
+        if preload is None:
+            preload = parse_artifact_list(CACHE_PRELOAD) or []
+        if dedup is None:
+            dedup = CACHE_DEDUP
+        if shm_dir is None and CACHE_SHM:
+            shm_dir = SHM_STORE_DIR
+
+        cache = super().__new__(cls)
+        cache.repo_id = repo_id
+        cache.local_dir = Path(local_dir) if local_dir else None
+        cache.mmap_files = set(mmap_files)
+        cache.lazy = lazy
+        cache.preload = list(preload)
+        cache.warmup_workers = warmup_workers or CACHE_WARMUP_WORKERS
+        cache.dedup = dedup
+        cache.shm_dir = Path(shm_dir) if shm_dir else None
+        cache.revision = revision
+        cache.version = None
+        cache.paths = {}
+        cache.data = {}
+        cache.timings = {}
+        cache.owners = {}
+        cache.hashes = {}
+        cache._shared = {}
+        cache.sizes = {}
+        cache._warm = False
+        cache._locks = {}
+        cache._locks_guard = threading.Lock()
+        return cache
+
     # ------------------------------------------------
-    # Resolve file paths only
+    # Versioning
     # ------------------------------------------------
 
-    def _resolve_paths(self):
-        for f in self.FILES_ORDERED:
-            if self.local_dir:
-                path = self.local_dir / f
-                if not path.exists():
-                    raise FileNotFoundError(path)
-                self.paths[f] = path
-            else:
-                if "." not in f:
-                    root = snapshot_download(
-                        repo_id=self.repo_id,
-                        repo_type="dataset",
-                        token=HF_TOKEN,
-                        allow_patterns=[f + "/*"],
-                        cache_dir=CACHE_FOLDER,
-                    )
-                    self.paths[f] = Path(root) / f
-                else:
-                    self.paths[f] = Path(
-                        hf_hub_download(
-                            repo_id=self.repo_id,
-                            filename=f,
-                            repo_type="dataset",
-                            token=HF_TOKEN,
-                            cache_dir=CACHE_FOLDER,
-                        )
+    def resolve_version(self, strict: bool = False) -> str:
+        """
+        Pin the artifact version this instance serves and return its id.
+
+        On HuggingFace this is the dataset commit, which every later download
+        uses, so a version never mixes files of different commits. Locally it
+        is derived from the names, sizes and modification times of the files.
+
+        When the Hub cannot be reached (offline mode or an outage) the version
+        is left unpinned and downloads fall back to the local HF cache, unless
+        strict is set.
+
+        Args:
+            strict (bool): Raise instead of falling back when the Hub is unreachable
+        """
+        if self.version is not None:
+            return self.version
+
+        if self.local_dir:
+            h = hashlib.sha256()
+            for f in sorted(p for p in self.local_dir.rglob("*") if p.is_file()):
+                stat = f.stat()
+                h.update(f"{f.relative_to(self.local_dir).as_posix()}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+            self.version = f"local-{h.hexdigest()[:12]}"
+        else:
+            try:
+                info = HfApi(token=HF_TOKEN).dataset_info(self.repo_id, revision=self.revision)
+                self.revision = self.version = info.sha
+            except Exception as e:
+                if strict:
+                    raise
+                self.version = self._cached_ref() or "unpinned"
+                print(f"Could not resolve artifact version ({e}), serving cached version {self.version} unpinned")
+
+        return self.version
+
+    def _cached_ref(self) -> Optional[str]:
+        """
+        Commit the local HF cache holds for the requested revision, if any.
+        """
+        ref = self.revision or "main"
+        if re.fullmatch(r"[0-9a-f]{40}", ref):
+            return ref
+
+        path = Path(CACHE_FOLDER) / f"datasets--{self.repo_id.replace('/', '--')}" / "refs" / ref
+        if path.is_file():
+            return path.read_text().strip()
+        return None
+
+    def validate(self):
+        """
+        Check that the loaded artifacts of each medium agree on the number
+        of items and users.
+
+        Raises:
+            ValueError: If the artifacts are inconsistent
+        """
+        for medium in Medium:
+            items: Dict[str, int] = {}
+            users: Dict[str, int] = {}
+
+            def loaded(name: str):
+                return self.data.get(f"{medium.value}/{name}")
+
+            item_index = loaded("item_index.pkl")
+            if isinstance(item_index, dict) and "num_items" in item_index:
+                items["item_index.pkl"] = item_index["num_items"]
+
+            matrix = loaded("user_item_matrix.npz")
+            if hasattr(matrix, "shape"):
+                users["user_item_matrix.npz"], items["user_item_matrix.npz"] = matrix.shape
+
+            for name in self.files:
+                obj = loaded(name)
+                if name.endswith(".index") and hasattr(obj, "ntotal"):
+                    counts = users if "users" in name else items
+                    counts[name] = obj.ntotal
+                elif name.endswith(".npy") and hasattr(obj, "shape"):
+                    counts = users if "user_" in name else items
+                    counts[name] = obj.shape[0]
+
+            for kind, counts in (("items", items), ("users", users)):
+                if len(set(counts.values())) > 1:
+                    raise ValueError(
+                        f"Inconsistent number of {kind} for {medium.value}: {counts}"
                     )
 
+    # ------------------------------------------------
+    # Resolve file paths only
+    # ------------------------------------------------
+
+    def _resolve_path(self, f: str) -> Path:
+        if self.local_dir:
+            path = self.local_dir / f
+            if not path.exists():
+                raise FileNotFoundError(path)
+            return path
+
+        if "." not in f:
+            root = snapshot_download(
+                repo_id=self.repo_id,
+                repo_type="dataset",
+                token=HF_TOKEN,
+                allow_patterns=[f + "/*"],
+                cache_dir=CACHE_FOLDER,
+                revision=self.revision,
+            )
+            return Path(root) / f
+
+        return Path(
+            hf_hub_download(
+                repo_id=self.repo_id,
+                filename=f,
+                repo_type="dataset",
+                token=HF_TOKEN,
+                cache_dir=CACHE_FOLDER,
+                revision=self.revision,
+            )
+        )
+
     # ------------------------------------------------
     # WARMUP (called once)
     # ------------------------------------------------
 
     def warmup(self):
         """
-        Load ALL assets into memory.
+        Load ALL assets into memory (or only the preload list in lazy mode).
         Call once before serving traffic.
         """
-        if self.data:
+        if self._warm:
             return  # already warm
 
-        print("DataCache warmup started")
+        print(f"DataCache warmup started (version {self.resolve_version()})")
+        start = time.perf_counter()
+
+        # Downloads and FAISS/pickle reads are I/O bound, so threads overlap
+        # them. Artifacts are independent, models are built from them later.
+        with ThreadPoolExecutor(max_workers=self.warmup_workers) as pool:
+            futures = [
+                pool.submit(self._load_artifact, f)
+                for f in self._warmup_files()
+            ]
+            for future in futures:
+                future.result()
+
+        self._warm = True
+        print(self.timing_report())
+        print(f"DataCache warmup complete in {time.perf_counter() - start:.2f}s")
 
-        for f in self.FILES_ORDERED:
-            print(f"Loading {f}")
-            self.data[f] = self._load_file(f)
+    def _warmup_files(self) -> List[str]:
+        if not self.lazy:
+            return list(self.FILES_ORDERED)
 
-        print("DataCache warmup complete")
+        return [
+            f for f in self.FILES_ORDERED
+            if any(f == p or f.startswith(p.rstrip("/") + "/") for p in self.preload)
+        ]
 
     # ------------------------------------------------
     # Access
     # ------------------------------------------------
 
     def get(self, filename: str):
-        print(f"Retrieving {filename}")
-        if filename not in self.data:
+        if filename in self.data:
+            return self.data[filename]
+
+        if not self.lazy:
             raise RuntimeError(
                 f"{filename} not loaded. Call warmup() first."
             )
-        return self.data[filename]
+        if filename not in self.FILES_ORDERED:
+            raise RuntimeError(f"{filename} is not a known artifact.")
+
+        return self._load_artifact(filename)
+
+    def timing_report(self) -> str:
+        """
+        Per-artifact download and load times, slowest first.
+        """
+        rows = sorted(
+            self.timings.items(),
+            key=lambda kv: kv[1]["download"] + kv[1]["load"],
+            reverse=True,
+        )
+        lines = [f"{'artifact':<45} {'download':>9} {'load':>9}"]
+        for f, t in rows:
+            lines.append(f"{f:<45} {t['download']:>8.2f}s {t['load']:>8.2f}s")
+        return "\n".join(lines)
+
+    def _content_hash(self, filename: str) -> str:
+        if filename not in self.hashes:
+            self.hashes[filename] = content_hash(self.paths[filename])
+        return self.hashes[filename]
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Per-artifact download/load times and memory size.
+
+        Memory-mapped arrays are flagged as they live in the page cache
+        rather than process memory, shared artifacts are counted once in
+        total_bytes.
+        """
+        artifacts = {}
+        counted = set()
+        total = 0
+        # Snapshot, lazy loads may add artifacts from other threads
+        for f, obj in list(self.data.items()):
+            owner = self.owners.get(f, f)
+
+            if owner not in counted:
+                counted.add(owner)
+                total += self.sizes.get(owner, 0)
+
+            timing = self.timings.get(f, {})
+            artifacts[f] = {
+                "download_s": timing.get("download"),
+                "load_s": timing.get("load"),
+                "bytes": self.sizes.get(f, 0),
+                "mapped": isinstance(obj, np.memmap),
+                "shared_with": owner if owner != f else None,
+            }
+
+        return {
+            "version": self.version,
+            "total_bytes": total,
+            "artifacts": artifacts,
+        }
+
+    def _lock_for(self, key) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _load_artifact(self, filename: str):
+        """
+        Resolve and load filename once, even under concurrent callers.
+        """
+        with self._lock_for(filename):
+            if filename in self.data:
+                return self.data[filename]
+
+            t0 = time.perf_counter()
+            if filename not in self.paths:
+                self.paths[filename] = self._resolve_path(filename)
+            t1 = time.perf_counter()
+
+            if self.dedup:
+                self.data[filename] = self._load_shared(filename)
+            else:
+                print(f"Loading {filename}")
+                self.data[filename] = self._load_file(filename)
+            t2 = time.perf_counter()
+
+            self.timings[filename] = {"download": t1 - t0, "load": t2 - t1}
+            self.sizes[filename] = artifact_nbytes(self.data[filename], self.paths[filename])
+            return self.data[filename]
+
+    def _load_shared(self, filename: str):
+        """
+        Load filename, reusing the object of an artifact with the same
+        content and loader.
+
+        Artifacts are grouped by quick_key, and only compared by full
+        content hash against others of the same group, so unique local
+        artifacts are never read in full here.
+        """
+        # Same bytes may still load differently (e.g. mmap vs in memory)
+        key = (
+            Path(filename).suffix or "dir",
+            self._use_mmap(filename),
+            quick_key(self.paths[filename]),
+        )
+
+        with self._lock_for(key):
+            candidates = self._shared.setdefault(key, [])
+            for owner, obj in candidates:
+                if self._content_hash(owner) == self._content_hash(filename):
+                    self.owners[filename] = owner
+                    print(f"Sharing {filename} with {owner}")
+                    return obj
+
+            print(f"Loading {filename}")
+            obj = self._load_file(filename)
+            candidates.append((filename, obj))
+            return obj
 
     # ------------------------------------------------
     # Internal loading logic
     # ------------------------------------------------
 
+    def _use_mmap(self, filename: str) -> bool:
+        """
+        Whether filename (with or without medium prefix) is memory-mapped.
+        """
+        if filename in self.mmap_files:
+            return True
+        _, _, name = filename.partition("/")
+        return name in self.mmap_files
+
     def _load_file(self, filename: str):
         path = self.paths[filename]
 
+        if self.shm_dir is not None:
+            # one copy in the shared store, attached by every worker
+            key = self._content_hash(filename)
+            if filename.endswith(".npy"):
+                register_keys([key], self.shm_dir)
+                return attach_npy(path, key, self.shm_dir)
+            if filename.endswith(".npz"):
+                register_keys([key], self.shm_dir)
+                return attach_csr(path, key, self.shm_dir)
+
         if filename.endswith(".npy"):
-            # fully load into RAM (no mmap)
+            if self._use_mmap(filename):
+                # read-only, backed by the page cache and shared across workers
+                return np.load(path, mmap_mode="r")
+            # fully load into RAM
             return np.load(path)
 
         if filename.endswith(".npz"):
@@ -164,10 +697,15 @@ class DataCache:
                 return pickle.load(f)
 
         if filename.endswith(".index"):
-            return load_faiss_index(str(path))
+            # nprobe / efSearch are stored in the index, env values override
+            return set_search_params(
+                load_faiss_index(str(path)),
+                nprobe=int(FAISS_NPROBE) if FAISS_NPROBE else None,
+                ef_search=int(FAISS_EF_SEARCH) if FAISS_EF_SEARCH else None,
+            )
 
         if "sbert/sbert_model" in filename:
-            return SentenceTransformer(str(path))
+            return load_sbert_model(path)
 
         return path
 # ----------------------------------------------------------------------
@@ -180,9 +718,149 @@ _CACHE: Optional[DataCache] = None
 def get_data_cache(local_dir: Optional[str] = None) -> DataCache:
     global _CACHE
     if _CACHE is None:
+        # Workers started after a reload serve the version it published
+        published = published_version() or {}
         _CACHE = DataCache(
             repo_id=None if local_dir else HF_REPO,
             local_dir=local_dir,
+            revision=published.get("revision"),
         )
         _CACHE.warmup()
     return _CACHE
+
+
+# ----------------------------------------------------------------------
+# Hot-swap reload
+# ----------------------------------------------------------------------
+
+_RELOAD_LOCK = threading.Lock()
+
+# Last published version sync_data_cache() reloaded for
+_SYNCED_VERSION: Optional[str] = None
+
+
+def publish_version(cache: DataCache):
+    """
+    Write the version of cache to CACHE_VERSION_FILE for the other workers.
+    """
+    path = Path(CACHE_VERSION_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.parent / f"{path.name}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps({"version": cache.version, "revision": cache.revision}))
+    os.replace(tmp, path)
+
+
+def published_version() -> Optional[Dict[str, Optional[str]]]:
+    """
+    Version and revision last published by a reload, None if there is none.
+    """
+    try:
+        return json.loads(Path(CACHE_VERSION_FILE).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def reload_data_cache(revision: Optional[str] = None, publish: bool = True) -> DataCache:
+    """
+    Load, warm and validate a new artifact version next to the active one,
+    then make it the active cache.
+
+    Requests that already hold the previous cache finish on it, later
+    get_data_cache() calls return the new one. Only this process is
+    reloaded, the new version is published to CACHE_VERSION_FILE and the
+    other workers switch to it in sync_data_cache().
+
+    Args:
+        revision (Optional[str]):
+            HuggingFace revision (branch, tag or commit) to load.
+            Defaults to the latest commit.
+        publish (bool): Publish the new version to the other workers
+
+    Returns:
+        DataCache: The new active cache
+
+    Raises:
+        RuntimeError: If a reload is already in progress
+        ValueError: If the new artifacts fail validation
+        Exception: If the HuggingFace Hub cannot resolve the revision
+    """
+    global _CACHE
+    if not _RELOAD_LOCK.acquire(blocking=False):
+        raise RuntimeError("DataCache reload already in progress")
+
+    try:
+        current = _CACHE or DataCache._instance
+        if current is None:
+            return get_data_cache()
+
+        new = DataCache._create(
+            current.repo_id,
+            local_dir=str(current.local_dir) if current.local_dir else None,
+            mmap_files=current.mmap_files,
+            lazy=current.lazy,
+            preload=current.preload,
+            warmup_workers=current.warmup_workers,
+            dedup=current.dedup,
+            shm_dir=str(current.shm_dir) if current.shm_dir else None,
+            revision=revision,
+        )
+        # Reloads must know what they switch to, no offline fallback
+        new.resolve_version(strict=True)
+        new.warmup()
+        new.validate()
+
+        # Single reference assignments, atomic for concurrent readers
+        DataCache._instance = new
+        _CACHE = new
+        print(f"DataCache switched from version {current.version} to {new.version}")
+
+        if publish:
+            try:
+                publish_version(new)
+            except OSError as e:
+                print(f"Publishing artifact version failed: {e}")
+
+        if new.shm_dir is not None:
+            # Drop the shared copies no worker uses any more, those of the
+            # previous version stay until the last worker has switched
+            try:
+                keys = set(new.hashes.values())
+                register_keys(keys, new.shm_dir, replace=True)
+                prune_store(keys, new.shm_dir)
+            except OSError as e:
+                print(f"Pruning shared artifact store failed: {e}")
+        return new
+    finally:
+        _RELOAD_LOCK.release()
+
+
+def sync_data_cache() -> bool:
+    """
+    Reload this worker onto the version published by a reload in another
+    worker, if it serves a different one.
+
+    Each published version is tried once, so a worker whose reload resolves
+    to another version (e.g. local files changed again) does not retry it.
+
+    Returns:
+        bool: Whether the cache was reloaded
+
+    Raises:
+        RuntimeError: If a reload is already in progress
+        ValueError: If the new artifacts fail validation
+    """
+    global _SYNCED_VERSION
+    published = published_version()
+    if published is None or _CACHE is None or reload_in_progress():
+        return False
+    if published.get("version") in (_CACHE.version, _SYNCED_VERSION):
+        return False
+
+    _SYNCED_VERSION = published.get("version")
+    print(f"DataCache following published version {_SYNCED_VERSION}")
+    reload_data_cache(published.get("revision"), publish=False)
+    return True
+
+
+def reload_in_progress() -> bool:
+    return _RELOAD_LOCK.locked()
@@ -0,0 +1,122 @@
+import os
+import time
+import threading
+import numpy as np
+
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from media_rs.utils.load_data import norm
+
+# Maximum number of cached description embeddings per medium and method.
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+
+# Seconds before a cached embedding is recomputed. 0 disables expiry.
+EMBEDDING_CACHE_TTL = float(os.getenv("EMBEDDING_CACHE_TTL", "3600"))
+
+
+def cache_key(text: str) -> str:
+    # norm strips before replacing punctuation, so strip again
+    return norm(text).strip()
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU cache of query embeddings with optional expiry.
+
+    Keys are normalised with `norm`, so descriptions differing only in case,
+    punctuation or whitespace share one entry.
+    """
+    def __init__(
+        self,
+        max_size: int = EMBEDDING_CACHE_SIZE,
+        ttl_seconds: float = EMBEDDING_CACHE_TTL
+    ):
+        """
+        Initialisation
+
+        Args:
+            max_size (int): Maximum number of entries. 0 disables caching.
+            ttl_seconds (float): Entry lifetime in seconds. 0 disables expiry.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.entries: "OrderedDict[str, Tuple[float, np.ndarray]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Cached embedding of text, or None on a miss.
+        """
+        key = cache_key(text)
+        now = time.monotonic()
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is not None and self.ttl_seconds and now - entry[0] > self.ttl_seconds:
+                del self.entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, text: str, embedding: np.ndarray):
+        """
+        Store embedding for text, evicting the least recently used entry.
+        """
+        if self.max_size <= 0:
+            return
+
+        # Shared between requests, so never modified in place
+        embedding.setflags(write=False)
+
+        key = cache_key(text)
+        with self.lock:
+            self.entries[key] = (time.monotonic(), embedding)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def get_or_compute(
+        self,
+        text: str,
+        compute: Callable[[str], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Cached embedding of text, computing and storing it on a miss.
+
+        Args:
+            text (str): Query text
+            compute (Callable[[str], np.ndarray]): Embeds the raw text
+
+        Returns:
+            np.ndarray: Read-only embedding
+        """
+        embedding = self.get(text)
+        if embedding is None:
+            embedding = compute(text)
+            self.put(text, embedding)
+        return embedding
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -10,7 +10,9 @@ from media_rs.training.features.embeddings import (
     compute_user_embeddings
 )
 from media_rs.training.build.build_topk_graphs import build_item_cf_topk, build_topk_content
-from media_rs.training.build.build_faiss_indices import build_faiss_indices
+from media_rs.training.build.build_faiss_indices import build_faiss_indices, report_user_index
+from media_rs.training.features.faiss import FaissIndexType
+from media_rs.training.features.sbert_onnx import export_sbert_onnx, report_sbert_backends
 
 from media_rs.utils.movies.build_item_index import build_movie_item_index
 from media_rs.utils.load_data import save_pickle, save_numpy, save_faiss_index
@@ -20,6 +22,9 @@ file_dir = Path("data/movies/raw/ml-latest/")
 # save_dir = Path("data/movies/raw/ml-latest-small/cache/tfidf_simple_year_incl_norm")
 # file_dir = Path("data/movies/raw/ml-latest-small/")
 
+# Exact FLAT search, or IVF_FLAT / IVF_PQ / HNSW to trade recall for latency
+USER_INDEX_TYPE = FaissIndexType.FLAT
+
 sbert_dir = save_dir / "sbert"
 tfidf_dir = save_dir / "tfidf"
 
@@ -83,8 +88,16 @@ topk_cf = build_item_cf_topk(user_item_matrix)
 # -----------------------------
 # Build FAISS indices
 # -----------------------------
-faiss_item_sbert, faiss_users_sbert = build_faiss_indices(sbert_item_embeddings, sbert_user_embeddings)
-faiss_item_tfidf, faiss_users_tfidf = build_faiss_indices(tfidf_item_embeddings, tfidf_user_embeddings)
+faiss_item_sbert, faiss_users_sbert = build_faiss_indices(
+    sbert_item_embeddings, sbert_user_embeddings, user_index_type=USER_INDEX_TYPE
+)
+faiss_item_tfidf, faiss_users_tfidf = build_faiss_indices(
+    tfidf_item_embeddings, tfidf_user_embeddings, user_index_type=USER_INDEX_TYPE
+)
+
+if USER_INDEX_TYPE != FaissIndexType.FLAT:
+    report_user_index(faiss_users_sbert, sbert_user_embeddings)
+    report_user_index(faiss_users_tfidf, tfidf_user_embeddings)
 
 # -----------------------------
 # Save artifacts
@@ -102,11 +115,18 @@ save_numpy(sbert_user_embeddings, sbert_dir.joinpath("user_embeddings.npy"))
 
 sbert_model.save(str(sbert_dir.joinpath("sbert_model")))
 
+# ONNX / int8 exports for the serving backend (SBERT_BACKEND)
+try:
+    export_sbert_onnx(sbert_dir.joinpath("sbert_model"))
+    report_sbert_backends(sbert_dir.joinpath("sbert_model"), list(content[:500]))
+except ImportError as e:
+    print(f"Skipping SBERT ONNX export: {e}")
+
 
-save_pickle(topk_content_tfidf, tfidf_dir.joinpath("item_topk_content.pkl"))
-save_pickle(topk_content_sbert, sbert_dir.joinpath("item_topk_content.pkl"))
+topk_content_tfidf.save(tfidf_dir.joinpath("item_topk_content"))
+topk_content_sbert.save(sbert_dir.joinpath("item_topk_content"))
 
-save_pickle(topk_cf, save_dir.joinpath("item_topk_cf.pkl"))
+topk_cf.save(save_dir.joinpath("item_topk_cf"))
 
 save_npz(save_dir.joinpath("user_item_matrix.npz"), user_item_matrix)
 
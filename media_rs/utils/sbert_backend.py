@@ -0,0 +1,92 @@
+import os
+import json
+
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Union
+
+from sentence_transformers import SentenceTransformer
+
+# Inference backend of the served SBERT model: torch, onnx or onnx_int8.
+# The ONNX backends need sentence-transformers[onnx] and the files written
+# by export_sbert_onnx at precompute time.
+SBERT_BACKEND = os.getenv("SBERT_BACKEND", "torch")
+
+# Instruction set of the int8 export, part of its file name.
+SBERT_QUANTIZATION = os.getenv("SBERT_QUANTIZATION", "avx2")
+
+
+# Parity reports of the ONNX exports against torch, relative to the model
+# directory and keyed by export file name. Written at precompute time.
+PARITY_REPORT = "onnx/parity.json"
+
+
+class SbertBackend(str, Enum):
+    TORCH = "torch"
+    ONNX = "onnx"
+    ONNX_INT8 = "onnx_int8"
+
+
+def onnx_file_name(
+    backend: SbertBackend,
+    quantization: str = SBERT_QUANTIZATION
+) -> str:
+    """
+    Model file of an ONNX backend, relative to the model directory.
+    """
+    if backend == SbertBackend.ONNX_INT8:
+        return f"onnx/model_qint8_{quantization}.onnx"
+    return "onnx/model.onnx"
+
+
+def read_parity_report(path: Union[str, Path]) -> Dict[str, Dict[str, Any]]:
+    """
+    Parity reports of the model's ONNX exports, empty if none were written.
+    """
+    report = Path(path, PARITY_REPORT)
+    if not report.exists():
+        return {}
+    return json.loads(report.read_text())
+
+
+def load_sbert_model(
+    path: Union[str, Path],
+    backend: Union[str, SbertBackend] = SBERT_BACKEND
+) -> SentenceTransformer:
+    """
+    Load a saved SBERT model with the requested inference backend.
+
+    Falls back to torch, with a message, when the ONNX export is missing,
+    did not pass its parity check against torch, or onnxruntime is not
+    installed.
+
+    Args:
+        path (Union[str, Path]): Saved model directory
+        backend (Union[str, SbertBackend]): Inference backend. Defaults to SBERT_BACKEND.
+
+    Returns:
+        SentenceTransformer: Loaded model
+    """
+    backend = SbertBackend(backend)
+    if backend == SbertBackend.TORCH:
+        return SentenceTransformer(str(path))
+
+    file_name = onnx_file_name(backend)
+    if not Path(path, file_name).exists():
+        print(f"{file_name} not found in {path}, using torch backend")
+        return SentenceTransformer(str(path))
+
+    parity = read_parity_report(path).get(file_name)
+    if not parity or not parity.get("passed"):
+        print(f"{file_name} has no passing parity report in {path}, using torch backend")
+        return SentenceTransformer(str(path))
+
+    try:
+        return SentenceTransformer(
+            str(path),
+            backend="onnx",
+            model_kwargs={"file_name": file_name}
+        )
+    except ImportError as e:
+        print(f"ONNX backend unavailable ({e}), using torch backend")
+        return SentenceTransformer(str(path))
@@ -0,0 +1,207 @@
+import os
+import fcntl
+import shutil
+import threading
+import numpy as np
+
+from contextlib import contextmanager
+from pathlib import Path
+from scipy.sparse import csr_matrix, load_npz
+from typing import Iterable, Iterator, Set, Union
+
+# Directory of the shared artifact store. /dev/shm is RAM backed, so every
+# worker process maps the same pages instead of loading its own copy.
+SHM_STORE_DIR = os.getenv("SHM_STORE_DIR", "/dev/shm/media_rs")
+
+CSR_COMPONENTS = ("data", "indices", "indptr", "shape")
+
+# Keys of the stored artifacts each process uses are listed in a key file
+# named after its pid, so pruning in one worker keeps those of the others.
+KEY_FILE_PREFIX = ".keys-"
+
+_REGISTERED: Set[str] = set()
+_REGISTERED_LOCK = threading.Lock()
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Exclusive inter-process lock held on path for the duration of the block.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _materialize(target: Path, write) -> Path:
+    """
+    Create target once across processes: write into a temporary sibling
+    under a lock, then rename into place so readers never see partial data.
+    """
+    if target.exists():
+        return target
+
+    with file_lock(target.parent / f"{target.name}.lock"):
+        if target.exists():
+            return target
+
+        tmp = target.parent / f".{target.name}.{os.getpid()}.tmp"
+        try:
+            write(tmp)
+            os.replace(tmp, target)
+        finally:
+            if tmp.is_dir():
+                shutil.rmtree(tmp)
+            elif tmp.exists():
+                tmp.unlink()
+
+    return target
+
+
+def attach_npy(
+    path: Union[str, Path],
+    key: str,
+    store_dir: Union[str, Path] = SHM_STORE_DIR
+) -> np.ndarray:
+    """
+    Read-only view of a .npy artifact from the shared store, copying it in
+    on first use.
+
+    Args:
+        path (Union[str, Path]): Source .npy file
+        key (str): Content hash of the source, names the stored copy
+        store_dir (Union[str, Path]): Shared store directory
+
+    Returns:
+        np.ndarray: Memory-mapped read-only array
+    """
+    target = Path(store_dir) / f"{key}.npy"
+    _materialize(target, lambda tmp: shutil.copyfile(path, tmp))
+    return np.load(target, mmap_mode="r")
+
+
+def attach_csr(
+    path: Union[str, Path],
+    key: str,
+    store_dir: Union[str, Path] = SHM_STORE_DIR
+) -> csr_matrix:
+    """
+    CSR matrix over read-only component arrays in the shared store, writing
+    them from the .npz artifact on first use.
+
+    Args:
+        path (Union[str, Path]): Source .npz file saved with save_npz
+        key (str): Content hash of the source, names the stored copy
+        store_dir (Union[str, Path]): Shared store directory
+
+    Returns:
+        csr_matrix: Matrix whose data, indices and indptr are memory-mapped
+    """
+    def write(tmp: Path):
+        matrix = load_npz(path).tocsr()
+        tmp.mkdir()
+        for name in CSR_COMPONENTS:
+            np.save(tmp / f"{name}.npy", np.asarray(getattr(matrix, name)))
+
+    target = _materialize(Path(store_dir) / f"{key}_csr", write)
+
+    data, indices, indptr = (
+        np.load(target / f"{name}.npy", mmap_mode="r")
+        for name in ("data", "indices", "indptr")
+    )
+    shape = tuple(np.load(target / "shape.npy"))
+    return csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+
+def register_keys(
+    keys: Iterable[str],
+    store_dir: Union[str, Path] = SHM_STORE_DIR,
+    replace: bool = False
+):
+    """
+    Record stored artifacts this process uses in its key file, so that
+    prune_store in other processes keeps them.
+
+    Args:
+        keys (Iterable[str]): Keys of the artifacts
+        store_dir (Union[str, Path]): Shared store directory
+        replace (bool): Forget the keys registered so far, e.g. those of an
+            artifact version this process no longer serves
+    """
+    store_dir = Path(store_dir)
+    with _REGISTERED_LOCK:
+        if replace:
+            _REGISTERED.clear()
+        _REGISTERED.update(keys)
+
+        store_dir.mkdir(parents=True, exist_ok=True)
+        path = store_dir / f"{KEY_FILE_PREFIX}{os.getpid()}"
+        tmp = store_dir / f"{path.name}.tmp"
+        tmp.write_text("\n".join(sorted(_REGISTERED)))
+        os.replace(tmp, path)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def registered_keys(store_dir: Union[str, Path] = SHM_STORE_DIR) -> Set[str]:
+    """
+    Keys registered by the other live processes. Key files of processes
+    that have exited are removed.
+    """
+    keys = set()
+    for entry in Path(store_dir).glob(f"{KEY_FILE_PREFIX}*"):
+        pid = entry.name[len(KEY_FILE_PREFIX):]
+        if not pid.isdigit() or int(pid) == os.getpid():
+            continue
+
+        if not _process_alive(int(pid)):
+            entry.unlink(missing_ok=True)
+            continue
+
+        try:
+            keys.update(entry.read_text().split())
+        except FileNotFoundError:
+            pass
+    return keys
+
+
+def prune_store(
+    keep_keys: Iterable[str],
+    store_dir: Union[str, Path] = SHM_STORE_DIR
+):
+    """
+    Remove stored artifacts whose key is neither in keep_keys nor registered
+    by another live process, e.g. those of an artifact version no worker
+    serves any more. Processes still mapping them keep their pages until
+    they unmap.
+    """
+    store_dir = Path(store_dir)
+    if not store_dir.exists():
+        return
+
+    keep = set(keep_keys) | registered_keys(store_dir)
+    for entry in store_dir.iterdir():
+        if entry.name.startswith(".") or entry.suffix == ".lock":
+            continue
+
+        key = entry.name[:-len("_csr")] if entry.is_dir() else entry.stem
+        if key in keep:
+            continue
+
+        with file_lock(store_dir / f"{entry.name}.lock"):
+            if entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                entry.unlink(missing_ok=True)
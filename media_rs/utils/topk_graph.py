@@ -0,0 +1,240 @@
+import numpy as np
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from media_rs.rs_types.model import ContentSimilarity
+
+# Legacy pickled format: item index -> [(neighbour index, score), ...]
+TopKDict = Dict[int, List[ContentSimilarity]]
+
+
+class TopKGraph:
+    """
+    Compact, array-backed top-K neighbour graph.
+
+    Row i of `indices` holds the neighbours of item i sorted by descending
+    score, with `scores` holding the matching similarities. Rows of items
+    with fewer than K neighbours are padded with -1.
+    """
+    def __init__(
+        self,
+        indices: np.ndarray,
+        scores: np.ndarray,
+    ):
+        """
+        Initialisation
+
+        Args:
+            indices (np.ndarray):
+                int32 neighbour matrix of shape (num_items, k)
+
+            scores (np.ndarray):
+                float32/float16 score matrix of shape (num_items, k)
+        """
+        if indices.shape != scores.shape:
+            raise ValueError("indices and scores must have the same shape")
+        if indices.ndim != 2:
+            raise ValueError("indices and scores must be 2D arrays")
+
+        self.indices = indices
+        self.scores = scores
+
+    def __len__(self) -> int:
+        return self.indices.shape[0]
+
+    @property
+    def k(self) -> int:
+        return self.indices.shape[1]
+
+    def neighbours(
+        self,
+        item_id: int,
+        top_n: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Neighbour indices and scores of item_id, padding removed.
+
+        Args:
+            item_id (int): Index of item
+            top_n (Optional[int]): Maximum number of neighbours. Defaults to all.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Neighbour indices and scores
+        """
+        idx = self.indices[item_id, :top_n]
+        scores = self.scores[item_id, :top_n]
+        valid = idx >= 0
+        return idx[valid], scores[valid]
+
+    def recommend(self, item_id: int, top_n: int) -> List[ContentSimilarity]:
+        """
+        Top-N neighbours of item_id as (index, score) tuples.
+        """
+        idx, scores = self.neighbours(item_id, top_n)
+        return [(int(i), float(s)) for i, s in zip(idx, scores)]
+
+    # ------------------------------------------------
+    # Conversion
+    # ------------------------------------------------
+
+    @classmethod
+    def from_dict(
+        cls,
+        graph: TopKDict,
+        num_items: Optional[int] = None,
+        score_dtype: np.dtype = np.float32,
+    ) -> "TopKGraph":
+        """
+        Build from the legacy dict-of-lists format.
+
+        Args:
+            graph (TopKDict): Item index -> list of (neighbour, score)
+            num_items (Optional[int]): Number of rows. Defaults to max key + 1.
+            score_dtype (np.dtype): float32 or float16. Defaults to float32.
+
+        Returns:
+            TopKGraph: Compact graph
+        """
+        if num_items is None:
+            num_items = max(graph, default=-1) + 1
+        k = max((len(n) for n in graph.values()), default=0)
+
+        indices = np.full((num_items, k), -1, dtype=np.int32)
+        scores = np.zeros((num_items, k), dtype=score_dtype)
+
+        for item_id, neighbours in graph.items():
+            if neighbours:
+                idx, sc = zip(*neighbours)
+                indices[item_id, :len(idx)] = idx
+                scores[item_id, :len(sc)] = sc
+
+        return cls(indices, scores)
+
+    def to_dict(self) -> TopKDict:
+        """
+        Convert to the legacy dict-of-lists format.
+        """
+        return {i: self.recommend(i, self.k) for i in range(len(self))}
+
+    # ------------------------------------------------
+    # Persistence
+    # ------------------------------------------------
+
+    def save(self, path: Union[str, Path]):
+        """
+        Save as `{path}_indices.npy` and `{path}_scores.npy`.
+        """
+        indices_path, scores_path = topk_graph_paths(path)
+        np.save(indices_path, self.indices)
+        np.save(scores_path, self.scores)
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        mmap_mode: Optional[str] = "r"
+    ) -> "TopKGraph":
+        """
+        Load a graph saved with save(), memory-mapped by default.
+        """
+        indices_path, scores_path = topk_graph_paths(path)
+        return cls(
+            np.load(indices_path, mmap_mode=mmap_mode),
+            np.load(scores_path, mmap_mode=mmap_mode),
+        )
+
+
+def topk_graph_paths(path: Union[str, Path]) -> Tuple[str, str]:
+    """
+    File names of the index and score arrays for a graph base path.
+    """
+    path = str(path)
+    return f"{path}_indices.npy", f"{path}_scores.npy"
+
+
+def select_topk(
+    sim: np.ndarray,
+    k: int,
+    row_offset: int = 0,
+    inplace: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k columns of every row of a similarity block, excluding self matches.
+
+    Args:
+        sim (np.ndarray):
+            Similarity block of shape (batch_items, num_items) where row i
+            belongs to item row_offset + i.
+
+        k (int):
+            Number of neighbours to keep. Must be < num_items.
+
+        row_offset (int, optional):
+            Item index of the first row. Defaults to 0.
+
+        inplace (bool, optional):
+            Mask self matches directly in a float32 sim instead of a copy.
+            Defaults to False.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]:
+            int32 neighbour indices and float32 scores, each (batch_items, k),
+            sorted by descending score
+    """
+    sim = np.asarray(sim, dtype=np.float32) if inplace else np.array(sim, dtype=np.float32)
+    rows = np.arange(sim.shape[0])
+    sim[rows, rows + row_offset] = -np.inf
+
+    top = np.argpartition(-sim, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(sim, top, axis=1)
+
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return (
+        np.take_along_axis(top, order, axis=1).astype(np.int32),
+        np.take_along_axis(top_scores, order, axis=1),
+    )
+
+
+def drop_self_matches(
+    indices: np.ndarray,
+    scores: np.ndarray,
+    k: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Remove each query's own index from a (num_queries, k + 1) FAISS result.
+
+    Rows where the query was not returned (e.g. ties with duplicates) drop
+    their last column instead, so every row keeps exactly k neighbours.
+
+    Args:
+        indices (np.ndarray): FAISS result indices, shape (num_queries, k + 1)
+        scores (np.ndarray): FAISS result distances, shape (num_queries, k + 1)
+        k (int): Number of neighbours to keep
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: int32 indices and float32 scores, (num_queries, k)
+    """
+    num_queries = indices.shape[0]
+
+    is_self = indices == np.arange(num_queries)[:, None]
+    is_self[~is_self.any(axis=1), -1] = True
+
+    keep = ~is_self
+    return (
+        indices[keep].reshape(num_queries, -1)[:, :k].astype(np.int32),
+        scores[keep].reshape(num_queries, -1)[:, :k].astype(np.float32),
+    )
+
+
+def topk_neighbours(
+    graph: Union[TopKGraph, TopKDict],
+    item_id: int,
+    top_n: int
+) -> List[ContentSimilarity]:
+    """
+    Top-N neighbours of item_id from either graph format.
+    """
+    if isinstance(graph, TopKGraph):
+        return graph.recommend(item_id, top_n)
+    return graph[item_id][:top_n]
@@ -131,6 +131,31 @@ def test_user_cf_api_e2e(api_client, embedding_method, medium):
     assert len(data) != 0
 
 
+@pytest.mark.parametrize("embedding_method", ["SBERT", "TFIDF"])
+@pytest.mark.parametrize("medium", ["movies", "books"])
+def test_user_cf_batch_api_e2e(api_client, embedding_method, medium):
+    payload = {
+        "profiles": [USER_RATINGS[medium], USER_RATINGS[medium][:1]],
+        "top_n": 2,
+        "k_similar_users": 2,
+        "embedding_method": embedding_method,
+        "medium": medium,
+    }
+
+    response = api_client.post(
+        "/api/recommend/user-cf/batch",
+        json=payload,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert isinstance(data, list)
+    assert len(data) == 2
+    for recs in data:
+        assert isinstance(recs, list)
+        assert len(recs) != 0
+
+
 # -----------------------------
 # Hybrid recommendation
 # -----------------------------
@@ -199,4 +224,25 @@ def test_data_api_e2e(api_client, medium):
 
     for item in data:
         for k,v in item.items():
-            assert v is not None
\ No newline at end of file
+            assert v is not None
+
+
+# -----------------------------
+# Admin
+# -----------------------------
+def test_version_api_e2e(api_client, monkeypatch):
+    monkeypatch.setattr("api.views.ADMIN_TOKEN", "test-token")
+    response = api_client.get("/api/admin/version", headers={"X-Admin-Token": "test-token"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert isinstance(data["version"], str)
+    assert data["reloading"] is False
+
+
+def test_reload_api_requires_token_e2e(api_client):
+    response = api_client.post("/api/admin/reload", headers={"X-Admin-Token": "wrong"})
+    assert response.status_code in (401, 403)
+
+    for path in ("/api/admin/version", "/api/admin/metrics"):
+        assert api_client.get(path).status_code in (401, 403)
@@ -0,0 +1,72 @@
+import os
+import pytest
+
+from pydantic import ValidationError
+
+os.environ.setdefault("HF_REPO_ID", "test/repo")
+os.environ.setdefault("HF_TOKEN", "test-token")
+os.environ.setdefault("CACHE_FOLDER", "/tmp/hf_cache")
+
+import api.services.collab_services as collab_services
+from api.serializers import USER_CF_BATCH_MAX_PROFILES, UserCFBatchInput
+from media_rs.utils.item_index import ItemIndex
+from media_rs.rs_types.model import EmbeddingMethod, Medium
+
+TITLES = ["toy story", "forrest gump", "chronicles of narnia"]
+
+
+class FakeUserCFModel:
+    def __init__(self):
+        self.batches = []
+
+    def recommend_batch(self, ratings_batch, top_n, k_similar_users):
+        self.batches.append(ratings_batch)
+        # Recommend the highest unrated index of each profile
+        return [[(max(set(range(len(TITLES))) - set(r)), 1.0)] for r in ratings_batch]
+
+
+class FakeRegistry:
+    def __init__(self):
+        self.model = FakeUserCFModel()
+        self.index = ItemIndex({
+            "num_items": len(TITLES),
+            "idx_to_itemId": {i: i for i in range(len(TITLES))},
+            "itemId_to_idx": {i: i for i in range(len(TITLES))},
+            "itemId_to_title": dict(enumerate(TITLES)),
+            "title_to_itemId": {t: i for i, t in enumerate(TITLES)},
+        })
+
+    def item_index(self, medium):
+        return self.index
+
+    def user_cf_model(self, medium, method):
+        return self.model
+
+
+def test_batch_handles_invalid_profiles(monkeypatch):
+    registry = FakeRegistry()
+    monkeypatch.setattr(collab_services, "get_model_registry", lambda: registry)
+
+    results = collab_services.get_user_cf_recommendations_batch(
+        ratings_batch=[
+            [{"name": "toy story", "value": 5.0}],
+            [{"name": "unknown", "value": 4.0}],
+            [{"name": "unknown", "value": 4.0}, {"name": "chronicles of narnia", "value": 3.0}],
+            [],
+        ],
+        top_n=1,
+        k_similar_users=2,
+        method=EmbeddingMethod.SBERT,
+        medium=Medium.MOVIES
+    )
+
+    # Invalid titles are dropped, profiles left empty get no recommendations
+    assert results == [["chronicles of narnia"], [], ["forrest gump"], []]
+    assert registry.model.batches == [[{0: 5.0}, {2: 3.0}]]
+
+
+def test_batch_input_size_limit():
+    profile = [{"name": "toy story", "value": 5.0}]
+    UserCFBatchInput(profiles=[profile] * USER_CF_BATCH_MAX_PROFILES, medium="movies")
+    with pytest.raises(ValidationError):
+        UserCFBatchInput(profiles=[profile] * (USER_CF_BATCH_MAX_PROFILES + 1), medium="movies")
@@ -0,0 +1,68 @@
+import time
+import pytest
+import threading
+
+pytest.importorskip("requests")
+
+from api.services.media_data.concurrent_fetch import fetch_all, get_http_session
+
+
+def test_fetch_all_preserves_order_and_overlaps():
+    threads = set()
+
+    def fetch(title):
+        threads.add(threading.get_ident())
+        time.sleep(0.1)
+        return title.upper()
+
+    titles = [f"title {i}" for i in range(5)]
+    start = time.perf_counter()
+    data = fetch_all(titles, fetch, fallback=lambda title: None)
+    elapsed = time.perf_counter() - start
+
+    assert data == [t.upper() for t in titles]
+    assert elapsed < 0.4
+    assert len(threads) > 1
+
+
+def test_fetch_all_partial_results():
+    def fetch(title):
+        if title == "bad":
+            raise RuntimeError("API error")
+        if title == "slow":
+            time.sleep(1)
+        return title
+
+    data = fetch_all(
+        ["a", "bad", "slow", "b"],
+        fetch,
+        fallback=lambda title: f"placeholder {title}",
+        deadline=0.2
+    )
+    assert data == ["a", "placeholder bad", "placeholder slow", "b"]
+
+
+def test_http_session_shared():
+    assert get_http_session() is get_http_session()
+
+
+def test_fetch_all_bounds_concurrency_and_times_each_title():
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def fetch(title):
+        with lock:
+            running.append(title)
+            peak.append(len(running))
+        time.sleep(0.15)
+        with lock:
+            running.remove(title)
+        return title
+
+    titles = ["a", "b", "c", "d"]
+    # The page takes two rounds, longer than the deadline of one title
+    data = fetch_all(titles, fetch, fallback=lambda title: None, deadline=0.25, max_concurrency=2)
+
+    assert data == titles
+    assert max(peak) == 2
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import pytest
+
+from api.executors import BoundedExecutor, ExecutorSaturated
+
+
+def test_run_returns_result_off_loop():
+    executor = BoundedExecutor("test", max_workers=2, max_queue=0)
+
+    async def main():
+        return await executor.run(lambda x, y=0: (x + y, threading.current_thread().name), 1, y=2)
+
+    result, thread_name = asyncio.run(main())
+    assert result == 3
+    assert thread_name.startswith("api-test")
+    assert executor.stats()["in_flight"] == 0
+    executor.shutdown()
+
+
+def test_saturated_executor_sheds_load():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def main():
+        # One call running and one queued fill the executor
+        running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert executor.stats()["in_flight"] == 2
+
+        with pytest.raises(ExecutorSaturated):
+            await executor.run(release.wait)
+
+        release.set()
+        await asyncio.gather(*running)
+
+        # Capacity is back once the calls finish
+        return await executor.run(lambda: "ok")
+
+    assert asyncio.run(main()) == "ok"
+    stats = executor.stats()
+    assert stats["in_flight"] == 0
+    assert stats["rejected"] == 1
+    executor.shutdown()
+
+
+def test_errors_propagate_and_release_slot():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+
+    def fail():
+        raise ValueError("boom")
+
+    async def main():
+        with pytest.raises(ValueError, match="boom"):
+            await executor.run(fail)
+        return await executor.run(lambda: 1)
+
+    assert asyncio.run(main()) == 1
+    assert executor.stats()["in_flight"] == 0
+    executor.shutdown()
@@ -4,10 +4,17 @@ import pytest
 from scipy.sparse import csr_matrix
 import faiss
 
+from sklearn.metrics.pairwise import cosine_similarity
+
+from scipy.sparse import random as sparse_random
+
 from media_rs.training.build.build_topk_graphs import (
     build_item_cf_topk,
-    build_topk_content
+    build_topk_content,
+    normalize_item_rows,
+    batch_size_for_budget
 )
+from media_rs.utils.topk_graph import TopKGraph
 
 # -----------------------------
 # Fixtures
@@ -32,7 +39,7 @@ def item_embeddings():
 # Test build_item_cf_topk
 # -----------------------------
 def test_build_item_cf_topk_basic(user_item_matrix):
-    topk_cf = build_item_cf_topk(user_item_matrix, k=2)
+    topk_cf = build_item_cf_topk(user_item_matrix, k=2, as_dict=True)
     
     assert isinstance(topk_cf, dict)
     # Should have one entry per item
@@ -47,14 +54,14 @@ def test_build_item_cf_topk_basic(user_item_matrix):
 
 def test_build_item_cf_topk_k_greater_than_items(user_item_matrix):
     # k greater than number of items
-    topk_cf = build_item_cf_topk(user_item_matrix, k=10)
+    topk_cf = build_item_cf_topk(user_item_matrix, k=10, as_dict=True)
     for neighbors in topk_cf.values():
         # Should not exceed total items - 1 (exclude self)
         assert len(neighbors) <= user_item_matrix.shape[1] - 1
 
 def test_build_item_cf_topk_batch_size(user_item_matrix):
     # Batch size smaller than number of items
-    topk_cf = build_item_cf_topk(user_item_matrix, k=2, batch_size=2)
+    topk_cf = build_item_cf_topk(user_item_matrix, k=2, batch_size=2, as_dict=True)
     # Check all items present
     assert set(topk_cf.keys()) == set(range(user_item_matrix.shape[1]))
 
@@ -62,7 +69,7 @@ def test_build_item_cf_topk_batch_size(user_item_matrix):
 # Test build_topk_content
 # -----------------------------
 def test_build_topk_content_basic(item_embeddings):
-    topk_content = build_topk_content(item_embeddings, top_k=2)
+    topk_content = build_topk_content(item_embeddings, top_k=2, as_dict=True)
     
     assert isinstance(topk_content, dict)
     assert len(topk_content) == item_embeddings.shape[0]
@@ -75,14 +82,86 @@ def test_build_topk_content_basic(item_embeddings):
             assert isinstance(score, float)
 
 def test_build_topk_content_top_k_greater_than_items(item_embeddings):
-    topk_content = build_topk_content(item_embeddings, top_k=10)
+    topk_content = build_topk_content(item_embeddings, top_k=10, as_dict=True)
     for neighbors in topk_content.values():
         # Should not exceed total items - 1 (exclude self)
         assert len(neighbors) <= item_embeddings.shape[0] - 1
 
 def test_build_topk_content_self_excluded(item_embeddings):
-    topk_content = build_topk_content(item_embeddings, top_k=3)
+    topk_content = build_topk_content(item_embeddings, top_k=3, as_dict=True)
     for idx, neighbors in topk_content.items():
         neighbor_indices = [n for n, _ in neighbors]
         # Self should not be included
         assert idx not in neighbor_indices
+
+# -----------------------------
+# Compact graph output
+# -----------------------------
+def test_build_item_cf_topk_compact_matches_brute_force(user_item_matrix):
+    k = 3
+    graph = build_item_cf_topk(user_item_matrix, k=k, batch_size=3)
+
+    assert isinstance(graph, TopKGraph)
+    assert graph.indices.shape == (user_item_matrix.shape[1], k)
+    assert graph.indices.dtype == np.int32
+    assert graph.scores.dtype == np.float32
+
+    sim = cosine_similarity(user_item_matrix.T)
+    for i in range(user_item_matrix.shape[1]):
+        assert i not in graph.indices[i]
+        expected = np.sort(np.delete(sim[i], i))[::-1][:k]
+        np.testing.assert_allclose(graph.scores[i], expected, rtol=1e-5)
+        np.testing.assert_allclose(sim[i, graph.indices[i]], graph.scores[i], rtol=1e-5)
+
+def test_build_topk_content_compact_matches_dict(item_embeddings):
+    graph = build_topk_content(item_embeddings, top_k=2)
+    topk_dict = build_topk_content(item_embeddings, top_k=2, as_dict=True)
+
+    assert isinstance(graph, TopKGraph)
+    assert graph.to_dict() == topk_dict
+    for i in range(len(graph)):
+        assert i not in graph.indices[i]
+
+# -----------------------------
+# Sparse, memory-bounded CF build
+# -----------------------------
+def test_normalize_item_rows(user_item_matrix):
+    item_user, user_item = normalize_item_rows(user_item_matrix)
+
+    assert item_user.shape == (4, 3)
+    assert user_item.shape == (3, 4)
+    assert item_user.dtype == np.float32
+    np.testing.assert_allclose(
+        np.linalg.norm(item_user.toarray(), axis=1), np.ones(4), rtol=1e-6
+    )
+
+def test_normalize_item_rows_empty_item():
+    matrix = csr_matrix(np.array([[1, 0], [2, 0]], dtype=np.float32))
+    item_user, _ = normalize_item_rows(matrix)
+    np.testing.assert_array_equal(item_user.toarray()[1], [0, 0])
+
+def test_batch_size_for_budget():
+    assert batch_size_for_budget(1000, 1) == 32
+    assert batch_size_for_budget(10**9, 1) == 1
+
+def test_build_item_cf_topk_memory_budget_matches_default():
+    matrix = sparse_random(50, 40, density=0.2, format="csr", dtype=np.float32, random_state=0)
+
+    default = build_item_cf_topk(matrix, k=5)
+    budgeted = build_item_cf_topk(matrix, k=5, memory_budget_mb=0.01)
+
+    np.testing.assert_allclose(budgeted.scores, default.scores, rtol=1e-6)
+
+    sim = cosine_similarity(matrix.T)
+    np.fill_diagonal(sim, -np.inf)
+    expected = -np.sort(-sim, axis=1)[:, :5]
+    np.testing.assert_allclose(default.scores, expected, rtol=1e-5, atol=1e-6)
+
+def test_build_item_cf_topk_parallel_matches_serial():
+    matrix = sparse_random(60, 45, density=0.2, format="csr", dtype=np.float32, random_state=1)
+
+    serial = build_item_cf_topk(matrix, k=5, batch_size=7)
+    parallel = build_item_cf_topk(matrix, k=5, batch_size=7, workers=2)
+
+    np.testing.assert_array_equal(parallel.indices, serial.indices)
+    np.testing.assert_array_equal(parallel.scores, serial.scores)
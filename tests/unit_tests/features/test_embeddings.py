@@ -118,3 +118,31 @@ def test_compute_user_embeddings():
     faiss.normalize_L2(expected)
 
     np.testing.assert_array_almost_equal(user_embeds, expected)
+
+
+def test_compute_user_embeddings_matches_per_user_loop():
+    rng = np.random.default_rng(0)
+    item_embeddings = rng.random((30, 8), dtype=np.float32)
+
+    dense = rng.integers(0, 6, size=(25, 30)).astype(np.float32)
+    dense[rng.random((25, 30)) < 0.7] = 0
+    dense[3] = 0  # user with no ratings
+    user_item_matrix = csr_matrix(dense)
+    original = user_item_matrix.copy()
+
+    # Reference: per-user mean-centred average of item vectors
+    expected = np.zeros((25, 8), dtype=np.float32)
+    for uid in range(25):
+        row = user_item_matrix.getrow(uid)
+        if row.nnz == 0:
+            continue
+        ratings = row.data - row.data.mean()
+        expected[uid] = (item_embeddings[row.indices] * ratings[:, None]).mean(axis=0)
+    faiss.normalize_L2(expected)
+
+    user_embeds = compute_user_embeddings(user_item_matrix, item_embeddings, chunk_size=7)
+
+    np.testing.assert_allclose(user_embeds, expected, rtol=1e-5, atol=1e-6)
+    np.testing.assert_array_equal(user_embeds[3], np.zeros(8))
+    # Input matrix is not modified
+    assert (user_item_matrix != original).nnz == 0
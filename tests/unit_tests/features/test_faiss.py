@@ -6,8 +6,12 @@ import faiss
 from media_rs.training.features.faiss import (
     build_faiss_index, 
     query_faiss_topk,
-    FaissMethod
+    set_search_params,
+    evaluate_faiss_index,
+    FaissMethod,
+    FaissIndexType
 )
+from media_rs.utils.topk_graph import TopKGraph
 
 @pytest.fixture
 def dummy_embeddings():
@@ -45,7 +49,7 @@ def test_build_faiss_index_invalid_metric(dummy_embeddings):
 # -----------------------------
 def test_query_faiss_topk(dummy_embeddings):
     index = build_faiss_index(dummy_embeddings.copy(), metric=FaissMethod.COSINE)
-    topk = query_faiss_topk(index, dummy_embeddings.copy(), k=3)
+    topk = query_faiss_topk(index, dummy_embeddings.copy(), k=3, as_dict=True)
 
     # Should return a dict with same number of items as embeddings
     assert isinstance(topk, dict)
@@ -63,10 +67,82 @@ def test_query_faiss_topk(dummy_embeddings):
 def test_query_faiss_topk_k_greater_than_index(dummy_embeddings):
     index = build_faiss_index(dummy_embeddings.copy(), metric=FaissMethod.L2)
     k = 10  # More than number of items
-    topk = query_faiss_topk(index, dummy_embeddings.copy(), k=k)
+    topk = query_faiss_topk(index, dummy_embeddings.copy(), k=k, as_dict=True)
     
     expected_neighbors = dummy_embeddings.shape[0] - 1
     
     for neighbors in topk.values():
         # Should return only the number of items in the index
         assert len(neighbors) == expected_neighbors
+
+def test_query_faiss_topk_compact(dummy_embeddings):
+    index = build_faiss_index(dummy_embeddings.copy(), metric=FaissMethod.COSINE)
+    graph = query_faiss_topk(index, dummy_embeddings.copy(), k=3)
+
+    assert isinstance(graph, TopKGraph)
+    assert graph.indices.shape == (dummy_embeddings.shape[0], 3)
+    for i in range(len(graph)):
+        # Self match removed and scores sorted descending
+        assert i not in graph.indices[i]
+        assert np.all(np.diff(graph.scores[i]) <= 0)
+
+
+# -----------------------------
+# Test ANN index types
+# -----------------------------
+@pytest.fixture
+def ann_embeddings():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((2000, 16)).astype(np.float32)
+
+@pytest.mark.parametrize("index_type", list(FaissIndexType))
+def test_build_faiss_index_types(index_type, ann_embeddings):
+    index = build_faiss_index(
+        ann_embeddings.copy(), index_type=index_type, nlist=16, pq_m=4
+    )
+
+    assert index.ntotal == ann_embeddings.shape[0]
+    assert index.is_trained
+
+    _, I = index.search(ann_embeddings[:5].copy(), 5)
+    assert I.shape == (5, 5)
+
+def test_search_params_persist(tmp_path, ann_embeddings):
+    ivf = build_faiss_index(
+        ann_embeddings.copy(), index_type=FaissIndexType.IVF_FLAT, nlist=16, nprobe=4
+    )
+    hnsw = build_faiss_index(
+        ann_embeddings.copy(), index_type=FaissIndexType.HNSW, ef_search=80
+    )
+
+    faiss.write_index(ivf, str(tmp_path / "ivf.index"))
+    faiss.write_index(hnsw, str(tmp_path / "hnsw.index"))
+
+    assert faiss.read_index(str(tmp_path / "ivf.index")).nprobe == 4
+    assert faiss.read_index(str(tmp_path / "hnsw.index")).hnsw.efSearch == 80
+
+def test_set_search_params(ann_embeddings):
+    ivf = build_faiss_index(
+        ann_embeddings.copy(), index_type=FaissIndexType.IVF_FLAT, nlist=16
+    )
+    hnsw = build_faiss_index(ann_embeddings.copy(), index_type=FaissIndexType.HNSW)
+    flat = build_faiss_index(ann_embeddings.copy())
+
+    assert set_search_params(ivf, nprobe=8).nprobe == 8
+    assert set_search_params(hnsw, ef_search=128).hnsw.efSearch == 128
+    # Options that do not apply are ignored
+    assert set_search_params(flat, nprobe=8, ef_search=128) is flat
+
+def test_evaluate_faiss_index(ann_embeddings):
+    baseline = build_faiss_index(ann_embeddings.copy())
+    exact = evaluate_faiss_index(baseline, baseline, ann_embeddings[:50], k=10)
+
+    assert exact["recall@10"] == pytest.approx(1.0)
+    assert exact["latency_ms"] >= 0 and exact["baseline_latency_ms"] >= 0
+
+    ivf = build_faiss_index(
+        ann_embeddings.copy(), index_type=FaissIndexType.IVF_FLAT, nlist=16, nprobe=16
+    )
+    # Probing every list is exhaustive
+    report = evaluate_faiss_index(ivf, baseline, ann_embeddings[:50], k=10)
+    assert report["recall@10"] == pytest.approx(1.0)
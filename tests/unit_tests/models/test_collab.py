@@ -5,6 +5,7 @@ import faiss
 from scipy.sparse import csr_matrix
 
 from media_rs.serving.recommender.models.collab import ItemItemCollaborativeModel, UserCollaborativeModel
+from media_rs.utils.topk_graph import TopKGraph
 
 # Define ContentSimilarity for testing
 ContentSimilarity = tuple[int, float]
@@ -29,6 +30,18 @@ def test_item_item_recommend(mock_item_item_model: ItemItemCollaborativeModel):
     assert res == [(0, 0.9), (2, 0.7)]
 
 
+def test_item_item_recommend_compact_graph():
+    graph = TopKGraph(
+        indices=np.array([[1, 2], [0, -1]], dtype=np.int32),
+        scores=np.array([[0.75, 0.5], [0.75, 0.0]], dtype=np.float32),
+    )
+    model = ItemItemCollaborativeModel(graph)
+
+    assert model.recommend(0, 1) == [(1, 0.75)]
+    # Padding is never returned
+    assert model.recommend(1, 5) == [(0, 0.75)]
+
+
 @pytest.fixture
 def mock_user_collaborative_model():
     # small FAISS index with 2 users, embedding_dim=3
@@ -89,3 +102,80 @@ def test_user_recommend_no_ratings(mock_user_collaborative_model: UserCollaborat
     res = mock_user_collaborative_model.recommend(ratings, top_n=2, k_similar_users=2)
     # Should still return top items
     assert len(res) <= mock_user_collaborative_model.num_items
+
+
+def test_user_recommend_k_exceeds_users(mock_user_collaborative_model: UserCollaborativeModel):
+    # FAISS pads missing neighbours with -1; they must not be aggregated
+    res = mock_user_collaborative_model.recommend({0: 5.0}, top_n=3, k_similar_users=5)
+    assert res == mock_user_collaborative_model.recommend({0: 5.0}, top_n=3, k_similar_users=2)
+
+
+def test_user_recommend_matches_reference_aggregation():
+    rng = np.random.default_rng(0)
+    num_users, num_items, dim = 40, 30, 6
+
+    user_embeddings = rng.random((num_users, dim), dtype=np.float32) - 0.5
+    faiss.normalize_L2(user_embeddings)
+    index = faiss.IndexFlatIP(dim)
+    index.add(user_embeddings)
+
+    dense = rng.integers(0, 6, size=(num_users, num_items)).astype(np.float32)
+    dense[rng.random((num_users, num_items)) < 0.8] = 0
+    user_item_matrix = csr_matrix(dense)
+    item_embeddings = rng.random((num_items, dim), dtype=np.float32)
+
+    model = UserCollaborativeModel(index, user_item_matrix, item_embeddings)
+    ratings = {1: 5.0, 4: 2.0, 7: 4.0}
+    res = model.recommend(ratings, top_n=8, k_similar_users=10)
+
+    # Reference: weighted sum of neighbour rows, one user at a time
+    user_emb = np.zeros(dim, dtype=np.float32)
+    for item_idx, rating in ratings.items():
+        user_emb += rating * item_embeddings[item_idx]
+    user_emb = user_emb[None, :]
+    faiss.normalize_L2(user_emb)
+    D, I = index.search(user_emb, 10)
+
+    expected = np.zeros(num_items, dtype=np.float32)
+    for u, sim in zip(I[0], D[0]):
+        if sim > 0:
+            expected += dense[u] * sim
+    expected[list(ratings)] = -np.inf
+    order = np.argsort(-expected, kind="stable")[:8]
+
+    np.testing.assert_allclose([s for _, s in res], expected[order], rtol=1e-5)
+    assert all(i not in ratings for i, _ in res)
+
+
+def test_user_recommend_batch_matches_single():
+    rng = np.random.default_rng(1)
+    num_users, num_items, dim = 50, 25, 5
+
+    user_embeddings = rng.random((num_users, dim), dtype=np.float32) - 0.5
+    faiss.normalize_L2(user_embeddings)
+    index = faiss.IndexFlatIP(dim)
+    index.add(user_embeddings)
+
+    dense = rng.integers(0, 6, size=(num_users, num_items)).astype(np.float32)
+    dense[rng.random((num_users, num_items)) < 0.8] = 0
+    model = UserCollaborativeModel(
+        index, csr_matrix(dense), rng.random((num_items, dim), dtype=np.float32)
+    )
+
+    ratings_batch = [
+        {0: 5.0, 3: 1.0},
+        {10: 4.0},
+        {2: 0.0, 7: 3.0, 20: 5.0},
+    ]
+    batch = model.recommend_batch(ratings_batch, top_n=6, k_similar_users=8)
+
+    assert len(batch) == len(ratings_batch)
+    for ratings, res in zip(ratings_batch, batch):
+        single = model.recommend(ratings, top_n=6, k_similar_users=8)
+        assert [i for i, _ in res] == [i for i, _ in single]
+        np.testing.assert_allclose([s for _, s in res], [s for _, s in single], rtol=1e-5)
+        assert all(i not in ratings for i, _ in res)
+
+
+def test_user_recommend_batch_empty(mock_user_collaborative_model: UserCollaborativeModel):
+    assert mock_user_collaborative_model.recommend_batch([], top_n=2, k_similar_users=2) == []
@@ -1,5 +1,6 @@
 # tests/unit_tests/models/test_content.py
 import pytest
+import faiss
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -8,7 +9,10 @@ from sklearn.decomposition import TruncatedSVD
 from media_rs.serving.recommender.models.content import (
     ContentSimilaritySBERTModel,
     ContentSimilarityTFIDFModel,
+    search_item_embeddings,
 )
+from media_rs.utils.topk_graph import TopKGraph
+from media_rs.utils.embedding_cache import EmbeddingCache
 
 # Define IdType and ContentSimilarity for testing purposes
 IdType = int
@@ -153,3 +157,100 @@ def test_recommend_from_description_top_n_exceeds(
     )
     result = tfidf_model.recommend_from_description(description, top_n)
     assert len(result) == embeddings.shape[0]
+
+
+def test_recommend_compact_graph(
+    mock_topk_graph,
+    mock_sbert_transformer,
+    mock_sbert_embeddings
+):
+    model = ContentSimilaritySBERTModel(
+        topk_graph=TopKGraph.from_dict(mock_topk_graph),
+        embeddings=mock_sbert_embeddings,
+        transformer=mock_sbert_transformer
+    )
+
+    result = model.recommend(0, 2)
+    assert [i for i, _ in result] == [1, 2]
+    assert result[0][1] == pytest.approx(0.9)
+
+    # Only real neighbours, not padding
+    assert len(model.recommend(3, 10)) == len(mock_topk_graph[3])
+
+
+def test_search_item_embeddings_matches_full_sort():
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((200, 8)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    emb = embeddings[:1] + 0.1
+    emb /= np.linalg.norm(emb)
+
+    sims = (emb @ embeddings.T).ravel()
+    expected = np.argsort(-sims)[:10]
+
+    result = search_item_embeddings(emb, embeddings, 10)
+    assert [i for i, _ in result] == expected.tolist()
+    assert [s for _, s in result] == pytest.approx(sims[expected].tolist())
+
+    # Flat inner product index gives the same ranking
+    index = faiss.IndexFlatIP(embeddings.shape[1])
+    index.add(embeddings)
+    faiss_result = search_item_embeddings(emb, embeddings, 10, faiss_index=index)
+    assert [i for i, _ in faiss_result] == expected.tolist()
+    assert [s for _, s in faiss_result] == pytest.approx(sims[expected].tolist(), abs=1e-5)
+
+
+def test_recommend_from_description_faiss_index(
+    mock_topk_graph,
+    mock_sbert_transformer,
+    mock_sbert_embeddings
+):
+    embeddings = mock_sbert_embeddings / np.linalg.norm(mock_sbert_embeddings, axis=1, keepdims=True)
+    index = faiss.IndexFlatIP(embeddings.shape[1])
+    index.add(embeddings)
+
+    exact = ContentSimilaritySBERTModel(
+        topk_graph=mock_topk_graph,
+        embeddings=embeddings,
+        transformer=mock_sbert_transformer
+    )
+    indexed = ContentSimilaritySBERTModel(
+        topk_graph=mock_topk_graph,
+        embeddings=embeddings,
+        transformer=mock_sbert_transformer,
+        faiss_index=index
+    )
+
+    expected = exact.recommend_from_description("adventure", 10)
+    result = indexed.recommend_from_description("adventure", 10)
+
+    assert len(result) == embeddings.shape[0]
+    assert [i for i, _ in result] == [i for i, _ in expected]
+
+
+def test_recommend_from_description_embedding_cache(
+    mock_topk_graph,
+    mock_sbert_transformer,
+    mock_sbert_embeddings
+):
+    calls = []
+
+    class CountingTransformer:
+        def encode(self, texts, **kwargs):
+            calls.append(texts)
+            return mock_sbert_transformer.encode(texts, **kwargs)
+
+    cache = EmbeddingCache(max_size=10, ttl_seconds=0)
+    model = ContentSimilaritySBERTModel(
+        topk_graph=mock_topk_graph,
+        embeddings=mock_sbert_embeddings,
+        transformer=CountingTransformer(),
+        embedding_cache=cache
+    )
+
+    first = model.recommend_from_description("Fun adventure", 2)
+    second = model.recommend_from_description("fun adventure!", 2)
+
+    assert first == second
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
@@ -1,10 +1,17 @@
 # tests/test_hybrid_model.py
+import time
 import pytest
+import threading
 import numpy as np
 from typing import Dict, List, Tuple
 
-from media_rs.serving.recommender.models.hybrid import HybridModel
-from media_rs.rs_types.model import ContentSimilarity
+from media_rs.serving.recommender.models.hybrid import (
+    HybridModel,
+    RRF_K,
+    normalize_scores,
+    to_score_arrays
+)
+from media_rs.rs_types.model import ContentSimilarity, ScoreNormalization
 
 # --- Mock models ---
 class MockContentModel:
@@ -35,13 +42,21 @@ def hybrid_model():
     )
 
 
+def as_arrays(scores: Dict[int, float]):
+    return to_score_arrays(list(scores.items()))
+
+def combine(hybrid_model: HybridModel, *components, **weights) -> Dict[int, float]:
+    ids, scores = hybrid_model._combine_scores(*(as_arrays(c) for c in components), **weights)
+    return dict(zip(ids.tolist(), scores.tolist()))
+
+
 # --- Tests ---
 def test_combine_scores(hybrid_model: HybridModel):
     content_scores = {0: 0.9, 1: 0.8, 2: 0.7}
     item_scores = {1: 0.85, 2: 0.75, 3: 0.65}
     user_scores = {2: 0.95, 3: 0.6, 4: 0.5}
 
-    combined = hybrid_model._combine_scores(content_scores, item_scores, user_scores)
+    combined = combine(hybrid_model, content_scores, item_scores, user_scores)
 
     # Check all keys are included
     assert set(combined.keys()) == {0, 1, 2, 3, 4}
@@ -55,7 +70,7 @@ def test_combine_scores(hybrid_model: HybridModel):
 
 def test_top_n(hybrid_model: HybridModel):
     scores = {0: 0.9, 1: 0.8, 2: 0.95, 3: 0.6}
-    top_items = hybrid_model._top_n(scores, top_n=2)
+    top_items = hybrid_model._top_n(*as_arrays(scores), top_n=2)
 
     # Should return 2 items
     assert len(top_items) == 2
@@ -89,3 +104,185 @@ def test_recommend(hybrid_model: HybridModel):
     # Scores are sorted descending
     scores = [s for _, s in results]
     assert all(scores[i] >= scores[i+1] for i in range(len(scores)-1))
+
+
+def test_weights_per_call(hybrid_model: HybridModel):
+    content_scores = {0: 0.9}
+    item_scores = {1: 0.85}
+    user_scores = {2: 0.95}
+
+    combined = combine(
+        hybrid_model, content_scores, item_scores, user_scores, alpha=0.2, beta=0.5
+    )
+    assert combined[0] == pytest.approx(0.2*0.9)
+    assert combined[1] == pytest.approx(0.5*0.85)
+    assert combined[2] == pytest.approx(0.3*0.95)
+
+    # Content scores only
+    results = hybrid_model.recommend(
+        item_idx=0, ratings={0: 5.0}, k_similar_users=2, top_n=3, alpha=1.0, beta=0.0
+    )
+    assert [i for i, _ in results] == [0, 1, 2]
+
+    # Defaults are unchanged
+    assert (hybrid_model.alpha, hybrid_model.beta) == (0.4, 0.3)
+
+
+def _reference_ranking(content_scores, item_scores, user_scores, alpha, beta, top_n):
+    # Dict fusion and full sort the vectorised version must reproduce
+    gamma = 1.0 - alpha - beta
+    all_ids = set(content_scores) | set(item_scores) | set(user_scores)
+    combined = {
+        i: alpha * content_scores.get(i, 0.0) +
+           beta * item_scores.get(i, 0.0) +
+           gamma * user_scores.get(i, 0.0)
+        for i in all_ids
+    }
+    return sorted(combined.items(), key=lambda kv: (-kv[1], kv[0]))[:top_n]
+
+
+def test_fusion_matches_dict_reference(hybrid_model: HybridModel):
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        components = [
+            dict(zip(rng.choice(100, size=30, replace=False).tolist(), rng.random(30).tolist()))
+            for _ in range(3)
+        ]
+        ids, scores = hybrid_model._combine_scores(*(as_arrays(c) for c in components))
+        result = hybrid_model._top_n(ids, scores, top_n=10)
+
+        expected = _reference_ranking(*components, alpha=0.4, beta=0.3, top_n=10)
+        assert [i for i, _ in result] == [i for i, _ in expected]
+        assert [s for _, s in result] == pytest.approx([s for _, s in expected])
+
+
+def test_top_n_ties_and_bounds(hybrid_model: HybridModel):
+    ids = np.array([5, 1, 3, 2], dtype=np.int64)
+    scores = np.array([0.5, 0.5, 0.9, 0.5])
+
+    # Ties at the cut-off go to the lowest item index
+    assert [i for i, _ in hybrid_model._top_n(ids, scores, 2)] == [3, 1]
+    assert len(hybrid_model._top_n(ids, scores, 10)) == 4
+    assert hybrid_model._top_n(ids[:0], scores[:0], 5) == []
+
+
+def test_combine_scores_empty_components(hybrid_model: HybridModel):
+    combined = combine(hybrid_model, {}, {1: 1.0}, {})
+    assert combined == {1: pytest.approx(0.3)}
+
+
+class RecordingModel:
+    def __init__(self, recommendations: List[ContentSimilarity]):
+        self.recommendations = recommendations
+        self.requested = []
+
+    def recommend(self, item_idx: int = None, top_n: int = None, **kwargs) -> List[ContentSimilarity]:
+        self.requested.append(top_n)
+        return self.recommendations[:top_n]
+
+
+def test_candidate_pool():
+    content = RecordingModel([(i, 1.0 - i / 100) for i in range(50)])
+    item = RecordingModel([(i, 0.5) for i in range(40, 60)])
+    user = RecordingModel([(i, 0.9) for i in range(45, 55)])
+    model = HybridModel(content, item, user, candidate_pool=30)
+
+    result = model.recommend(0, {0: 5.0}, k_similar_users=2, top_n=5)
+    assert len(result) == 5
+    assert content.requested == item.requested == user.requested == [30]
+
+    # Per-call pool overrides the default and never drops below top_n
+    model.recommend(0, {0: 5.0}, k_similar_users=2, top_n=5, candidate_pool=200)
+    model.recommend(0, {0: 5.0}, k_similar_users=2, top_n=5, candidate_pool=2)
+    assert content.requested[1:] == [200, 5]
+
+
+def test_normalize_scores():
+    ids = np.array([3, 1, 2, 0], dtype=np.int64)
+    scores = np.array([2.0, 4.0, 6.0, 4.0])
+
+    none = normalize_scores(ids, scores, ScoreNormalization.NONE)
+    assert none is scores
+
+    minmax = normalize_scores(ids, scores, ScoreNormalization.MINMAX)
+    np.testing.assert_allclose(minmax, [0.0, 0.5, 1.0, 0.5])
+
+    zscore = normalize_scores(ids, scores, ScoreNormalization.ZSCORE)
+    assert zscore.mean() == pytest.approx(0.0)
+    assert zscore.std() == pytest.approx(1.0)
+
+    # Ranks 1..n by descending score, ties broken by item index
+    rrf = normalize_scores(ids, scores, ScoreNormalization.RRF)
+    np.testing.assert_allclose(rrf, 1.0 / (RRF_K + np.array([4, 3, 1, 2])))
+
+    constant = np.full(3, 0.7)
+    constant_ids = np.arange(3)
+    np.testing.assert_allclose(normalize_scores(constant_ids, constant, "minmax"), 1.0)
+    np.testing.assert_allclose(normalize_scores(constant_ids, constant, "zscore"), 0.0)
+
+
+def test_combine_scores_normalization(hybrid_model: HybridModel):
+    # Raw scores on very different scales
+    content_scores = {0: 0.2, 1: 0.1}
+    item_scores = {0: 10.0, 1: 50.0}
+
+    raw = combine(hybrid_model, content_scores, item_scores, {})
+    assert raw[1] > raw[0]
+
+    minmax = combine(hybrid_model, content_scores, item_scores, {}, normalization="minmax")
+    assert minmax == {0: pytest.approx(0.4), 1: pytest.approx(0.3)}
+
+    rrf = combine(hybrid_model, content_scores, item_scores, {}, normalization="rrf")
+    assert rrf[0] > rrf[1]
+
+
+class SlowModel(RecordingModel):
+    def __init__(self, recommendations: List[ContentSimilarity], delay: float):
+        super().__init__(recommendations)
+        self.delay = delay
+        self.threads = set()
+
+    def recommend(self, *args, **kwargs) -> List[ContentSimilarity]:
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        return super().recommend(*args, **kwargs)
+
+
+def test_parallel_components():
+    models = [SlowModel([(i, 0.5)], delay=0.2) for i in range(3)]
+    sequential = HybridModel(*models, parallel=False)
+    parallel = HybridModel(*models, parallel=True)
+
+    expected = sequential.recommend(0, {0: 5.0}, k_similar_users=2, top_n=3)
+
+    start = time.perf_counter()
+    result = parallel.recommend(0, {0: 5.0}, k_similar_users=2, top_n=3)
+    elapsed = time.perf_counter() - start
+
+    assert result == expected
+    # Overlapping calls take about as long as the slowest one
+    assert elapsed < 0.5
+    assert len(set.union(*(m.threads for m in models))) > 1
+
+
+def test_component_timings():
+    models = [SlowModel([(0, 0.5)], delay=0.01) for _ in range(3)]
+    hybrid = HybridModel(*models, parallel=True)
+    for _ in range(3):
+        hybrid.recommend(0, {0: 5.0}, k_similar_users=2, top_n=1)
+
+    stats = hybrid.timing_stats()
+    assert set(stats) == {"content", "item_cf", "user_cf", "fusion"}
+    for name in ("content", "item_cf", "user_cf"):
+        assert stats[name]["count"] == 3
+        assert 10 <= stats[name]["mean_ms"] <= stats[name]["max_ms"]
+
+
+def test_parallel_component_error():
+    class FailingModel:
+        def recommend(self, *args, **kwargs):
+            raise RuntimeError("component failed")
+
+    hybrid = HybridModel(MockContentModel(), FailingModel(), MockUserCollabModel(), parallel=True)
+    with pytest.raises(RuntimeError, match="component failed"):
+        hybrid.recommend(0, {0: 5.0}, k_similar_users=2, top_n=3)
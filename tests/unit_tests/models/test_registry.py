@@ -0,0 +1,221 @@
+# tests/unit_tests/models/test_registry.py
+import os
+import gc
+import weakref
+import faiss
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.decomposition import TruncatedSVD
+
+os.environ.setdefault("HF_REPO_ID", "test/repo")
+os.environ.setdefault("HF_TOKEN", "test-token")
+os.environ.setdefault("CACHE_FOLDER", "/tmp/hf_cache")
+
+import media_rs.serving.recommender.registry as registry_module
+from media_rs.serving.recommender.registry import ModelRegistry, get_model_registry
+from media_rs.serving.recommender.models.hybrid import HybridModel
+from media_rs.rs_types.model import EmbeddingMethod, Medium
+
+NUM_ITEMS = 4
+NUM_USERS = 6
+TITLES = ["toy story", "forrest gump", "chronicles of narnia", "wizard of oz"]
+
+
+class MockTransformer:
+    def encode(self, texts, convert_to_numpy=True, normalize_embeddings=True, **kwargs):
+        return np.tile(np.array([[1.0, 0.0, 0.0]], dtype=np.float32), (len(texts), 1))
+
+
+class FakeCache:
+    """
+    Minimal stand-in for DataCache with real artifacts for both media.
+    """
+    def __init__(self, version="v1"):
+        self.version = version
+        self.lazy = False
+        self.gets = []
+        self.data = {}
+
+        vectorizer = TfidfVectorizer().fit(TITLES)
+        svd = TruncatedSVD(n_components=3, random_state=0).fit(vectorizer.transform(TITLES))
+        rng = np.random.default_rng(0)
+        matrix = sp.random(NUM_USERS, NUM_ITEMS, density=0.6, format="csr", dtype=np.float32, random_state=0)
+
+        for medium in Medium:
+            m = medium.value
+            self.data[f"{m}/item_index.pkl"] = {
+                "num_items": NUM_ITEMS,
+                "idx_to_itemId": {i: i for i in range(NUM_ITEMS)},
+                "itemId_to_idx": {i: i for i in range(NUM_ITEMS)},
+                "itemId_to_title": dict(enumerate(TITLES)),
+                "title_to_itemId": {t: i for i, t in enumerate(TITLES)},
+            }
+            self.data[f"{m}/user_item_matrix.npz"] = matrix
+            self.data[f"{m}/item_topk_cf_indices.npy"] = np.array([[1, 2], [0, 2], [0, 1], [0, 1]], dtype=np.int32)
+            self.data[f"{m}/item_topk_cf_scores.npy"] = np.full((NUM_ITEMS, 2), 0.5, dtype=np.float32)
+            self.data[f"{m}/tfidf/tfidf_vectorizer.pkl"] = vectorizer
+            self.data[f"{m}/tfidf/svd.pkl"] = svd
+            self.data[f"{m}/sbert/sbert_model"] = MockTransformer()
+
+            for method in ("tfidf", "sbert"):
+                items = rng.standard_normal((NUM_ITEMS, 3)).astype(np.float32)
+                items /= np.linalg.norm(items, axis=1, keepdims=True)
+                users = rng.standard_normal((NUM_USERS, 3)).astype(np.float32)
+                users /= np.linalg.norm(users, axis=1, keepdims=True)
+
+                item_index = faiss.IndexFlatIP(3)
+                item_index.add(items)
+                user_index = faiss.IndexFlatIP(3)
+                user_index.add(users)
+
+                self.data[f"{m}/{method}/item_embeddings.npy"] = items
+                self.data[f"{m}/{method}/faiss_index_items.index"] = item_index
+                self.data[f"{m}/{method}/faiss_index_users.index"] = user_index
+                self.data[f"{m}/{method}/item_topk_content_indices.npy"] = self.data[f"{m}/item_topk_cf_indices.npy"]
+                self.data[f"{m}/{method}/item_topk_content_scores.npy"] = self.data[f"{m}/item_topk_cf_scores.npy"]
+
+    def get(self, filename):
+        self.gets.append(filename)
+        return self.data[filename]
+
+
+@pytest.fixture
+def registry():
+    reg = ModelRegistry(FakeCache())
+    yield reg
+    reg.close()
+
+
+def test_models_built_once(registry):
+    model = registry.content_model(Medium.MOVIES, EmbeddingMethod.TFIDF)
+    item_idx = registry.item_index(Medium.MOVIES)
+    gets = len(registry.cache.gets)
+
+    assert registry.content_model(Medium.MOVIES, EmbeddingMethod.TFIDF) is model
+    assert registry.item_index(Medium.MOVIES) is item_idx
+    assert item_idx.title_to_idx("toy story") == 0
+
+    # Shared instances need no further cache lookups
+    assert len(registry.cache.gets) == gets
+
+
+def test_models_keyed_by_medium_and_method(registry):
+    assert registry.content_model(Medium.MOVIES, EmbeddingMethod.SBERT) is not registry.content_model(Medium.MOVIES, EmbeddingMethod.TFIDF)
+    assert registry.item_cf_model(Medium.MOVIES) is not registry.item_cf_model(Medium.BOOKS)
+    assert registry.embedding_cache(Medium.MOVIES, EmbeddingMethod.SBERT) is not registry.embedding_cache(Medium.BOOKS, EmbeddingMethod.SBERT)
+
+
+def test_hybrid_shares_sub_models(registry):
+    hybrid = registry.hybrid_model(Medium.MOVIES, EmbeddingMethod.SBERT)
+
+    assert isinstance(hybrid, HybridModel)
+    assert hybrid.content_model is registry.content_model(Medium.MOVIES, EmbeddingMethod.SBERT)
+    assert hybrid.item_collab_model is registry.item_cf_model(Medium.MOVIES)
+    assert hybrid.user_collab_model is registry.user_cf_model(Medium.MOVIES, EmbeddingMethod.SBERT)
+
+
+def test_hybrid_weights_per_call(registry):
+    hybrid = registry.hybrid_model(Medium.MOVIES, EmbeddingMethod.TFIDF)
+    ratings = {0: 5.0, 1: 3.0}
+
+    content_only = hybrid.recommend(0, ratings, k_similar_users=3, top_n=2, alpha=1.0, beta=0.0)
+    expected = registry.content_model(Medium.MOVIES, EmbeddingMethod.TFIDF).recommend(0, 2)
+    assert [i for i, _ in content_only] == [i for i, _ in expected]
+
+    # Per-call weights do not change the shared model
+    assert (hybrid.alpha, hybrid.beta) == (0.5, 0.3)
+
+
+def test_parallel_hybrid_matches_sequential(registry):
+    hybrid = registry.hybrid_model(Medium.MOVIES, EmbeddingMethod.TFIDF)
+    ratings = {0: 5.0, 1: 3.0}
+
+    sequential = hybrid.recommend(0, ratings, k_similar_users=3, top_n=3)
+    hybrid.parallel = True
+    parallel = hybrid.recommend(0, ratings, k_similar_users=3, top_n=3)
+    assert parallel == sequential
+
+    timings = registry.hybrid_timings()["movies/tfidf"]
+    assert {"content", "item_cf", "user_cf", "fusion"} <= set(timings)
+    assert timings["content"]["count"] == 2
+
+
+def test_description_search_uses_shared_caches(registry):
+    model = registry.content_model(Medium.BOOKS, EmbeddingMethod.SBERT)
+    model.recommend_from_description("wizard", 2)
+    model.recommend_from_description("Wizard!", 2)
+
+    assert registry.embedding_cache(Medium.BOOKS, EmbeddingMethod.SBERT).stats()["hits"] == 1
+    assert registry.embedding_cache_stats()["books/sbert"] == {"size": 1, "hits": 1, "misses": 1}
+
+
+def test_lookup_counts(registry):
+    registry.content_model(Medium.MOVIES, EmbeddingMethod.SBERT)
+    assert registry.lookup_counts() == {}
+
+    registry.count_lookups = True
+    for _ in range(3):
+        registry.content_model(Medium.MOVIES, EmbeddingMethod.SBERT)
+    registry.item_cf_model(Medium.BOOKS)
+
+    counts = registry.lookup_counts()
+    assert counts["content/movies/sbert"] == 3
+    assert counts["item_cf/books"] == 1
+
+
+def test_built_checks(registry):
+    assert not registry.content_model_built(Medium.MOVIES, EmbeddingMethod.SBERT)
+    assert not registry.item_cf_model_built(Medium.MOVIES)
+
+    registry.content_model(Medium.MOVIES, EmbeddingMethod.SBERT)
+    assert not registry.content_model_built(Medium.MOVIES, EmbeddingMethod.SBERT)
+
+    registry.item_index(Medium.MOVIES)
+    registry.item_cf_model(Medium.MOVIES)
+    assert registry.content_model_built(Medium.MOVIES, EmbeddingMethod.SBERT)
+    assert not registry.content_model_built(Medium.MOVIES, EmbeddingMethod.TFIDF)
+    assert registry.item_cf_model_built(Medium.MOVIES)
+    assert not registry.item_cf_model_built(Medium.BOOKS)
+
+
+def test_warmup_builds_everything(registry):
+    registry.warmup()
+    for medium in Medium:
+        for method in EmbeddingMethod:
+            assert ("hybrid", medium, method) in registry.objects
+
+
+def test_registry_replaced_on_new_cache_version(monkeypatch):
+    caches = [FakeCache("v1")]
+    monkeypatch.setattr(registry_module, "get_data_cache", lambda: caches[-1])
+    monkeypatch.setattr(registry_module, "_REGISTRY", None)
+
+    first = get_model_registry()
+    assert get_model_registry() is first
+
+    caches.append(FakeCache("v2"))
+    second = get_model_registry()
+    assert second is not first
+    assert second.version == "v2"
+    second.close()
+
+
+def test_replaced_version_can_be_freed(monkeypatch):
+    caches = [FakeCache("v1")]
+    monkeypatch.setattr(registry_module, "get_data_cache", lambda: caches[-1])
+    monkeypatch.setattr(registry_module, "_REGISTRY", None)
+
+    get_model_registry().warmup()
+    old_cache = weakref.ref(caches[0])
+    old_model = weakref.ref(get_model_registry().hybrid_model(Medium.MOVIES, EmbeddingMethod.SBERT))
+
+    caches[:] = [FakeCache("v2")]
+    get_model_registry().close()
+    gc.collect()
+
+    assert old_cache() is None
+    assert old_model() is None
+
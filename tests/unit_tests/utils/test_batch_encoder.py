@@ -0,0 +1,97 @@
+import threading
+import numpy as np
+import pytest
+
+from media_rs.utils.batch_encoder import BatchingEncoder
+
+
+class RecordingTransformer:
+    """
+    Embeds text as [len(text), 1] and records every forward pass.
+    """
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def encode(self, sentences, convert_to_numpy=True, normalize_embeddings=False, **kwargs):
+        texts = [sentences] if isinstance(sentences, str) else list(sentences)
+        with self.lock:
+            self.batches.append(texts)
+        emb = np.array([[len(t), 1.0] for t in texts], dtype=np.float32).reshape(-1, 2)
+        if normalize_embeddings:
+            emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+        return emb[0] if isinstance(sentences, str) else emb
+
+
+def test_matches_direct_encode():
+    transformer = RecordingTransformer()
+    encoder = BatchingEncoder(transformer, max_batch_size=8, max_wait_ms=1)
+
+    texts = ["a", "bbb", "cc"]
+    for normalize in (False, True):
+        expected = transformer.encode(texts, normalize_embeddings=normalize)
+        result = encoder.encode(texts, convert_to_numpy=True, normalize_embeddings=normalize)
+        np.testing.assert_allclose(result, expected)
+
+    single = encoder.encode("abcd")
+    assert single.shape == (2,)
+    encoder.close()
+
+
+def test_concurrent_calls_share_batches():
+    transformer = RecordingTransformer()
+    encoder = BatchingEncoder(transformer, max_batch_size=16, max_wait_ms=200)
+
+    results = {}
+    barrier = threading.Barrier(8)
+
+    def call(i):
+        barrier.wait()
+        results[i] = encoder.encode(["x" * (i + 1)], normalize_embeddings=False)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Every caller gets its own row back
+    for i in range(8):
+        assert results[i].shape == (1, 2)
+        assert results[i][0, 0] == i + 1
+
+    # Fewer forward passes than requests
+    assert len(transformer.batches) < 8
+    assert sum(len(b) for b in transformer.batches) == 8
+    encoder.close()
+
+
+def test_max_batch_size():
+    transformer = RecordingTransformer()
+    encoder = BatchingEncoder(transformer, max_batch_size=2, max_wait_ms=50)
+
+    encoder.encode(["a", "b", "c", "d", "e"])
+    assert all(len(b) <= 2 for b in transformer.batches)
+    encoder.close()
+
+
+def test_errors_reach_callers():
+    class FailingTransformer:
+        def encode(self, *args, **kwargs):
+            raise RuntimeError("boom")
+
+    encoder = BatchingEncoder(FailingTransformer(), max_batch_size=4, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="boom"):
+        encoder.encode(["a"])
+    encoder.close()
+
+
+def test_closed_encoder_falls_back_to_transformer():
+    transformer = RecordingTransformer()
+    encoder = BatchingEncoder(transformer, max_batch_size=4, max_wait_ms=1)
+    encoder.encode(["a"])
+    encoder.close()
+    encoder.worker.join(timeout=1)
+
+    assert not encoder.worker.is_alive()
+    np.testing.assert_allclose(encoder.encode(["ab"]), transformer.encode(["ab"]))
@@ -0,0 +1,530 @@
+# tests/unit_tests/utils/test_data_cache.py
+import os
+import gc
+import time
+import pytest
+import weakref
+import numpy as np
+import scipy.sparse as sp
+
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("HF_REPO_ID", "test/repo")
+os.environ.setdefault("HF_TOKEN", "test-token")
+os.environ.setdefault("CACHE_FOLDER", "/tmp/hf_cache")
+
+import media_rs.utils.data_cache as data_cache
+from media_rs.utils.data_cache import (
+    DataCache,
+    parse_artifact_list,
+    content_hash,
+    quick_key,
+    artifact_nbytes,
+    reload_data_cache
+)
+
+
+# -----------------------------
+# Fixtures
+# -----------------------------
+@pytest.fixture
+def local_dir(tmp_path):
+    # Placeholder for every artifact so path resolution succeeds
+    for f in DataCache.FILES_ORDERED:
+        path = tmp_path / f
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if "." in f:
+            path.touch()
+        else:
+            path.mkdir(exist_ok=True)
+
+    embeddings = np.arange(12, dtype=np.float32).reshape(4, 3)
+    for medium in ("movies", "books"):
+        np.save(tmp_path / medium / "sbert/item_embeddings.npy", embeddings)
+        np.save(tmp_path / medium / "tfidf/item_embeddings.npy", embeddings)
+
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def reset_singleton():
+    DataCache._instance = None
+    data_cache._CACHE = None
+    yield
+    DataCache._instance = None
+    data_cache._CACHE = None
+
+
+@pytest.fixture(autouse=True)
+def version_file(tmp_path_factory, monkeypatch):
+    # Outside local_dir, whose files make up the local version
+    path = tmp_path_factory.mktemp("shared") / "active_version"
+    monkeypatch.setattr(data_cache, "CACHE_VERSION_FILE", str(path))
+    monkeypatch.setattr(data_cache, "_SYNCED_VERSION", None)
+    return path
+
+
+# -----------------------------
+# Tests
+# -----------------------------
+def test_parse_artifact_list():
+    assert parse_artifact_list(None) is None
+    assert parse_artifact_list("none") == []
+    assert parse_artifact_list(" a.npy, b.npy ,") == ["a.npy", "b.npy"]
+
+
+def test_default_mmap_files(local_dir):
+    cache = DataCache(repo_id=None, local_dir=str(local_dir))
+
+    arr = cache._load_artifact("movies/sbert/item_embeddings.npy")
+    assert isinstance(arr, np.memmap)
+    assert not arr.flags.writeable
+    np.testing.assert_array_equal(arr, np.arange(12).reshape(4, 3))
+
+
+def test_mmap_configurable_per_artifact(local_dir):
+    cache = DataCache(
+        repo_id=None,
+        local_dir=str(local_dir),
+        mmap_files=["tfidf/item_embeddings.npy"],
+    )
+
+    assert isinstance(cache._load_artifact("books/tfidf/item_embeddings.npy"), np.memmap)
+
+    arr = cache._load_artifact("books/sbert/item_embeddings.npy")
+    assert not isinstance(arr, np.memmap)
+    assert arr.flags.writeable
+
+
+def test_mmap_disabled(local_dir):
+    cache = DataCache(repo_id=None, local_dir=str(local_dir), mmap_files=[])
+    arr = cache._load_artifact("movies/sbert/item_embeddings.npy")
+    assert not isinstance(arr, np.memmap)
+
+
+def test_eager_get_requires_warmup(local_dir):
+    cache = DataCache(repo_id=None, local_dir=str(local_dir), lazy=False)
+    with pytest.raises(RuntimeError):
+        cache.get("movies/sbert/item_embeddings.npy")
+
+
+def test_lazy_get_loads_on_first_access(local_dir):
+    cache = DataCache(repo_id=None, local_dir=str(local_dir), lazy=True)
+    cache.warmup()
+    assert cache.data == {}
+
+    arr = cache.get("movies/tfidf/item_embeddings.npy")
+    assert arr.shape == (4, 3)
+    assert list(cache.data) == ["movies/tfidf/item_embeddings.npy"]
+
+    with pytest.raises(RuntimeError):
+        cache.get("movies/unknown.npy")
+
+
+def test_lazy_concurrent_get_loads_once(local_dir, monkeypatch):
+    cache = DataCache(repo_id=None, local_dir=str(local_dir), lazy=True)
+    calls = []
+    original = cache._load_file
+
+    def slow_load(filename):
+        calls.append(filename)
+        time.sleep(0.05)
+        return original(filename)
+
+    monkeypatch.setattr(cache, "_load_file", slow_load)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(
+            lambda _: cache.get("books/sbert/item_embeddings.npy"), range(8)
+        ))
+
+    assert calls == ["books/sbert/item_embeddings.npy"]
+    assert all(r is results[0] for r in results)
+
+
+def test_lazy_preload(local_dir):
+    cache = DataCache(
+        repo_id=None,
+        local_dir=str(local_dir),
+        lazy=True,
+        preload=["movies/tfidf/item_embeddings.npy", "books/sbert/"],
+    )
+    cache._load_file = lambda filename: filename
+    cache.warmup()
+
+    assert "movies/tfidf/item_embeddings.npy" in cache.data
+    assert "books/sbert/faiss_index_users.index" in cache.data
+    assert "books/sbert/sbert_model" in cache.data
+    assert "movies/sbert/item_embeddings.npy" not in cache.data
+    assert "books/item_index.pkl" not in cache.data
+
+
+def test_warmup_loads_all_concurrently_with_timings(local_dir, monkeypatch):
+    cache = DataCache(
+        repo_id=None, local_dir=str(local_dir), lazy=False, warmup_workers=4
+    )
+    monkeypatch.setattr(cache, "_load_file", lambda filename: filename)
+    cache.warmup()
+
+    assert set(cache.data) == set(DataCache.FILES_ORDERED)
+    assert set(cache.timings) == set(DataCache.FILES_ORDERED)
+    assert "movies/sbert/sbert_model" in cache.timing_report()
+
+
+def test_content_hash(tmp_path):
+    (tmp_path / "a.bin").write_bytes(b"same")
+    (tmp_path / "b.bin").write_bytes(b"same")
+    (tmp_path / "c.bin").write_bytes(b"other")
+    assert content_hash(tmp_path / "a.bin") == content_hash(tmp_path / "b.bin")
+    assert content_hash(tmp_path / "a.bin") != content_hash(tmp_path / "c.bin")
+
+    for name in ("m1", "m2"):
+        (tmp_path / name / "sub").mkdir(parents=True)
+        (tmp_path / name / "sub" / "weights").write_bytes(b"w")
+    assert content_hash(tmp_path / "m1") == content_hash(tmp_path / "m2")
+
+    (tmp_path / "m2" / "sub" / "weights").write_bytes(b"x")
+    assert content_hash(tmp_path / "m1") != content_hash(tmp_path / "m2")
+
+
+def test_content_hash_uses_hf_blob_name(tmp_path):
+    blobs = tmp_path / "blobs"
+    blobs.mkdir()
+    (blobs / "abc123").write_bytes(b"data")
+    (tmp_path / "link.npy").symlink_to(blobs / "abc123")
+
+    assert content_hash(tmp_path / "link.npy") == "abc123"
+
+
+def test_identical_artifacts_loaded_once(local_dir, monkeypatch):
+    for medium in ("movies", "books"):
+        (local_dir / medium / "sbert/sbert_model/config.json").write_text("{}")
+
+    cache = DataCache(repo_id=None, local_dir=str(local_dir), mmap_files=[])
+    calls = []
+
+    def load(filename):
+        calls.append(filename)
+        return object()
+
+    monkeypatch.setattr(cache, "_load_file", load)
+
+    movies_model = cache._load_artifact("movies/sbert/sbert_model")
+    books_model = cache._load_artifact("books/sbert/sbert_model")
+    assert movies_model is books_model
+    assert calls == ["movies/sbert/sbert_model"]
+
+
+def test_different_artifacts_not_shared(local_dir):
+    np.save(local_dir / "books/sbert/item_embeddings.npy", np.ones((2, 3), dtype=np.float32))
+    cache = DataCache(
+        repo_id=None, local_dir=str(local_dir), mmap_files=["sbert/item_embeddings.npy"]
+    )
+
+    movies = cache._load_artifact("movies/sbert/item_embeddings.npy")
+    books = cache._load_artifact("books/sbert/item_embeddings.npy")
+    assert movies is not books
+    assert books.shape == (2, 3)
+
+    # Same bytes under a different loader (memory-mapped or not) stay separate
+    tfidf = cache._load_artifact("movies/tfidf/item_embeddings.npy")
+    assert tfidf is not movies
+    assert not isinstance(tfidf, np.memmap)
+
+
+def test_quick_key(tmp_path):
+    size = 3 * data_cache.QUICK_KEY_BYTES
+    middle = data_cache.QUICK_KEY_BYTES + 1
+    data = bytearray(size)
+    (tmp_path / "a.bin").write_bytes(data)
+    (tmp_path / "b.bin").write_bytes(data)
+    data[middle] = 1
+    (tmp_path / "c.bin").write_bytes(data)
+    (tmp_path / "d.bin").write_bytes(data[:-1])
+
+    assert quick_key(tmp_path / "a.bin") == quick_key(tmp_path / "b.bin")
+    # Only the ends are read, the full hash tells these apart
+    assert quick_key(tmp_path / "a.bin") == quick_key(tmp_path / "c.bin")
+    assert content_hash(tmp_path / "a.bin") != content_hash(tmp_path / "c.bin")
+    assert quick_key(tmp_path / "a.bin") != quick_key(tmp_path / "d.bin")
+
+
+def test_unique_artifacts_not_fully_hashed(local_dir, monkeypatch):
+    np.save(local_dir / "books/sbert/item_embeddings.npy", np.ones((2, 3), dtype=np.float32))
+    hashed = []
+
+    def record(path):
+        hashed.append(path)
+        return content_hash(path)
+
+    monkeypatch.setattr(data_cache, "content_hash", record)
+    cache = DataCache(repo_id=None, local_dir=str(local_dir), mmap_files=[])
+
+    cache._load_artifact("movies/sbert/item_embeddings.npy")
+    cache._load_artifact("books/sbert/item_embeddings.npy")
+    assert hashed == []
+
+    # A matching quick key is confirmed with the full hash before sharing
+    tfidf = cache._load_artifact("movies/tfidf/item_embeddings.npy")
+    assert tfidf is cache.get("movies/sbert/item_embeddings.npy")
+    assert len(hashed) == 2
+    assert cache.metrics()["artifacts"]["movies/tfidf/item_embeddings.npy"]["shared_with"] == (
+        "movies/sbert/item_embeddings.npy"
+    )
+
+
+def test_dedup_disabled(local_dir):
+    cache = DataCache(repo_id=None, local_dir=str(local_dir), dedup=False)
+
+    movies = cache._load_artifact("movies/sbert/item_embeddings.npy")
+    books = cache._load_artifact("books/sbert/item_embeddings.npy")
+    assert movies is not books
+
+
+def test_shared_memory_mode(local_dir, tmp_path):
+    matrix = sp.random(6, 4, density=0.5, format="csr", dtype=np.float32, random_state=0)
+    sp.save_npz(local_dir / "movies/user_item_matrix.npz", matrix)
+    store = tmp_path / "shm"
+
+    cache = DataCache(repo_id=None, local_dir=str(local_dir), mmap_files=[], shm_dir=str(store))
+
+    arr = cache._load_artifact("movies/sbert/item_embeddings.npy")
+    assert isinstance(arr, np.memmap)
+    assert not arr.flags.writeable
+    np.testing.assert_array_equal(arr, np.arange(12).reshape(4, 3))
+
+    attached = cache._load_artifact("movies/user_item_matrix.npz")
+    assert (attached != matrix).nnz == 0
+    assert not attached.data.flags.writeable
+
+    assert (store / f"{cache.hashes['movies/sbert/item_embeddings.npy']}.npy").exists()
+    assert (store / f"{cache.hashes['movies/user_item_matrix.npz']}_csr").is_dir()
+
+
+def test_reload_prunes_shared_store(local_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(DataCache, "validate", lambda self: None)
+    store = tmp_path / "shm"
+    files = ["movies/sbert/item_embeddings.npy", "books/sbert/item_embeddings.npy"]
+    np.save(local_dir / "books/sbert/item_embeddings.npy", np.zeros((4, 3), dtype=np.float32))
+
+    old = DataCache(repo_id=None, local_dir=str(local_dir), mmap_files=[], shm_dir=str(store), lazy=True, preload=files)
+    old.warmup()
+    old_key = old.hashes["books/sbert/item_embeddings.npy"]
+    assert (store / f"{old_key}.npy").exists()
+
+    np.save(local_dir / "books/sbert/item_embeddings.npy", np.ones((4, 3), dtype=np.float32))
+    new = reload_data_cache()
+
+    assert not (store / f"{old_key}.npy").exists()
+    for f in files:
+        assert (store / f"{new.hashes[f]}.npy").exists()
+
+
+def test_local_version_changes_with_files(local_dir):
+    first = DataCache._create(None, local_dir=str(local_dir)).resolve_version()
+    assert first.startswith("local-")
+    assert DataCache._create(None, local_dir=str(local_dir)).resolve_version() == first
+
+    np.save(local_dir / "movies/sbert/item_embeddings.npy", np.ones((5, 3), dtype=np.float32))
+    assert DataCache._create(None, local_dir=str(local_dir)).resolve_version() != first
+
+
+class OfflineHfApi:
+    def __init__(self, token=None):
+        pass
+
+    def dataset_info(self, repo_id, revision=None):
+        raise ConnectionError("Hub unreachable")
+
+
+def test_hub_version_falls_back_to_cached_ref(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(data_cache, "HfApi", OfflineHfApi)
+    monkeypatch.setattr(data_cache, "CACHE_FOLDER", str(tmp_path))
+
+    cache = DataCache._create("test/repo")
+    assert cache.resolve_version() == "unpinned"
+    assert cache.revision is None
+    assert "unpinned" in capsys.readouterr().out
+
+    sha = "a" * 40
+    refs = tmp_path / "datasets--test--repo" / "refs"
+    refs.mkdir(parents=True)
+    (refs / "main").write_text(sha)
+
+    cache = DataCache._create("test/repo")
+    assert cache.resolve_version() == sha
+    # Downloads keep resolving through the cached ref
+    assert cache.revision is None
+
+    with pytest.raises(ConnectionError):
+        DataCache._create("test/repo").resolve_version(strict=True)
+
+
+def test_reload_requires_hub(local_dir, monkeypatch):
+    monkeypatch.setattr(data_cache, "HfApi", OfflineHfApi)
+    active = DataCache._create("test/repo")
+    active.version = "v1"
+    data_cache._CACHE = active
+
+    with pytest.raises(ConnectionError):
+        reload_data_cache()
+    assert data_cache.get_data_cache() is active
+
+
+def test_validate_detects_inconsistent_artifacts(local_dir):
+    cache = DataCache._create(None, local_dir=str(local_dir))
+    cache.data["movies/item_index.pkl"] = {"num_items": 4}
+    cache.data["movies/sbert/item_embeddings.npy"] = np.zeros((4, 3))
+    cache.data["movies/user_item_matrix.npz"] = sp.csr_matrix((7, 4))
+    cache.data["movies/sbert/user_embeddings.npy"] = np.zeros((7, 3))
+    cache.validate()
+
+    cache.data["movies/tfidf/item_embeddings.npy"] = np.zeros((5, 3))
+    with pytest.raises(ValueError, match="items for movies"):
+        cache.validate()
+
+
+def test_reload_swaps_active_cache(local_dir, monkeypatch):
+    # Placeholders are identical, keep every artifact loading on its own
+    monkeypatch.setattr(data_cache, "CACHE_DEDUP", False)
+    monkeypatch.setattr(DataCache, "_load_file", lambda self, filename: f"{filename}@{self.version}")
+
+    old = data_cache.get_data_cache(local_dir=str(local_dir))
+    old_version = old.version
+    held = old.get("movies/item_index.pkl")
+
+    np.save(local_dir / "books/sbert/item_embeddings.npy", np.ones((4, 3), dtype=np.float32))
+    new = reload_data_cache()
+
+    assert new is not old
+    assert new.version != old_version
+    assert data_cache.get_data_cache() is new
+    assert DataCache(repo_id=None) is new
+    assert new.get("movies/item_index.pkl") == f"movies/item_index.pkl@{new.version}"
+
+    # Holders of the previous version keep a consistent view
+    assert old.get("movies/item_index.pkl") == held
+
+
+def test_workers_follow_published_version(local_dir, monkeypatch):
+    monkeypatch.setattr(data_cache, "CACHE_DEDUP", False)
+    monkeypatch.setattr(DataCache, "_load_file", lambda self, filename: filename)
+    monkeypatch.setattr(DataCache, "validate", lambda self: None)
+
+    worker = data_cache.get_data_cache(local_dir=str(local_dir))
+    assert data_cache.published_version() is None
+    assert not data_cache.sync_data_cache()
+
+    np.save(local_dir / "books/sbert/item_embeddings.npy", np.ones((4, 3), dtype=np.float32))
+    new = reload_data_cache()
+    assert data_cache.published_version() == {"version": new.version, "revision": None}
+
+    # A worker still serving the previous version switches to the published one
+    DataCache._instance = data_cache._CACHE = worker
+    assert data_cache.sync_data_cache()
+    assert data_cache.get_data_cache().version == new.version
+    assert not data_cache.sync_data_cache()
+
+
+def test_previous_version_freed_after_reload(local_dir, monkeypatch):
+    monkeypatch.setattr(data_cache, "CACHE_DEDUP", False)
+    monkeypatch.setattr(DataCache, "_load_file", lambda self, filename: np.zeros(3))
+    monkeypatch.setattr(DataCache, "validate", lambda self: None)
+
+    old = weakref.ref(data_cache.get_data_cache(local_dir=str(local_dir)))
+    old_embeddings = weakref.ref(old().get("movies/sbert/item_embeddings.npy"))
+
+    np.save(local_dir / "books/sbert/item_embeddings.npy", np.ones((4, 3), dtype=np.float32))
+    reload_data_cache()
+    gc.collect()
+
+    # Nothing in the module keeps the replaced version alive
+    assert old() is None
+    assert old_embeddings() is None
+
+
+def test_failed_reload_keeps_active_cache(local_dir, monkeypatch):
+    monkeypatch.setattr(DataCache, "_load_file", lambda self, filename: filename)
+    old = data_cache.get_data_cache(local_dir=str(local_dir))
+
+    def invalid(self):
+        raise ValueError("bad artifacts")
+
+    monkeypatch.setattr(DataCache, "validate", invalid)
+    with pytest.raises(ValueError):
+        reload_data_cache()
+
+    assert data_cache.get_data_cache() is old
+    assert not data_cache.reload_in_progress()
+
+
+def test_concurrent_reload_rejected(local_dir, monkeypatch):
+    monkeypatch.setattr(DataCache, "_load_file", lambda self, filename: filename)
+    data_cache.get_data_cache(local_dir=str(local_dir))
+
+    with data_cache._RELOAD_LOCK:
+        with pytest.raises(RuntimeError):
+            reload_data_cache()
+
+
+def test_get_does_not_log(local_dir, capsys):
+    cache = DataCache(repo_id=None, local_dir=str(local_dir), lazy=True)
+    cache.get("movies/sbert/item_embeddings.npy")
+    capsys.readouterr()
+
+    cache.get("movies/sbert/item_embeddings.npy")
+    assert capsys.readouterr().out == ""
+
+
+def test_metrics(local_dir):
+    cache = DataCache(repo_id=None, local_dir=str(local_dir), lazy=True, mmap_files=["sbert/item_embeddings.npy"])
+
+    cache.get("movies/sbert/item_embeddings.npy")
+    cache.get("movies/tfidf/item_embeddings.npy")
+    cache.get("books/tfidf/item_embeddings.npy")
+
+    metrics = cache.metrics()
+    movies = metrics["artifacts"]["movies/sbert/item_embeddings.npy"]
+    assert movies["bytes"] == 12 * 4
+    assert movies["mapped"] is True
+    assert movies["load_s"] >= 0
+
+    tfidf = metrics["artifacts"]["movies/tfidf/item_embeddings.npy"]
+    assert tfidf["mapped"] is False
+
+    # books/tfidf has identical content and is shared, counted once
+    assert metrics["artifacts"]["books/tfidf/item_embeddings.npy"]["shared_with"] == "movies/tfidf/item_embeddings.npy"
+    assert metrics["total_bytes"] == 2 * 12 * 4
+
+
+def test_metrics_during_lazy_loads(local_dir, monkeypatch):
+    monkeypatch.setattr(data_cache, "CACHE_DEDUP", False)
+    monkeypatch.setattr(DataCache, "_load_file", lambda self, filename: np.zeros(3))
+    cache = DataCache(repo_id=None, local_dir=str(local_dir), lazy=True)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        loads = [pool.submit(cache.get, f) for f in DataCache.FILES_ORDERED]
+        while not all(f.done() for f in loads):
+            cache.metrics()
+
+    assert set(cache.metrics()["artifacts"]) == set(DataCache.FILES_ORDERED)
+
+
+def test_artifact_nbytes(tmp_path):
+    import faiss
+
+    assert artifact_nbytes(np.zeros((10, 4), dtype=np.float32)) == 160
+
+    matrix = sp.csr_matrix(np.eye(5, dtype=np.float32))
+    assert artifact_nbytes(matrix) == matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+    flat = faiss.IndexFlatIP(8)
+    flat.add(np.zeros((20, 8), dtype=np.float32))
+    assert artifact_nbytes(flat) == 20 * 8 * 4
+
+    hnsw = faiss.IndexHNSWFlat(8, 16)
+    hnsw.add(np.zeros((20, 8), dtype=np.float32))
+    assert artifact_nbytes(hnsw) == 20 * 8 * 4
+
+    (tmp_path / "model.pkl").write_bytes(b"x" * 99)
+    assert artifact_nbytes(object(), tmp_path / "model.pkl") == 99
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from media_rs.utils.embedding_cache import EmbeddingCache
+
+
+def _embed(text):
+    return np.full((1, 3), len(text), dtype=np.float32)
+
+
+def test_hits_on_normalised_text():
+    cache = EmbeddingCache(max_size=10, ttl_seconds=0)
+    calls = []
+
+    def compute(text):
+        calls.append(text)
+        return _embed(text)
+
+    first = cache.get_or_compute("Space Opera!", compute)
+    second = cache.get_or_compute("  space   opera ", compute)
+
+    assert calls == ["Space Opera!"]
+    assert second is first
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+
+def test_cached_embeddings_are_read_only():
+    cache = EmbeddingCache(max_size=10, ttl_seconds=0)
+    emb = cache.get_or_compute("drama", _embed)
+
+    with pytest.raises(ValueError):
+        emb /= 2
+
+
+def test_lru_eviction():
+    cache = EmbeddingCache(max_size=2, ttl_seconds=0)
+    cache.put("a", _embed("a"))
+    cache.put("b", _embed("b"))
+
+    # Touch "a" so "b" is least recently used
+    assert cache.get("a") is not None
+    cache.put("c", _embed("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("media_rs.utils.embedding_cache.time.monotonic", lambda: now[0])
+
+    cache = EmbeddingCache(max_size=10, ttl_seconds=5)
+    cache.put("thriller", _embed("thriller"))
+
+    now[0] += 4
+    assert cache.get("thriller") is not None
+
+    now[0] += 2
+    assert cache.get("thriller") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_disabled_cache_always_computes():
+    cache = EmbeddingCache(max_size=0)
+    calls = []
+
+    def compute(text):
+        calls.append(text)
+        return _embed(text)
+
+    cache.get_or_compute("comedy", compute)
+    cache.get_or_compute("comedy", compute)
+
+    assert len(calls) == 2
+    assert cache.stats()["size"] == 0
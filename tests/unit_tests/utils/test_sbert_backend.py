@@ -0,0 +1,145 @@
+import json
+import numpy as np
+import pytest
+
+import media_rs.utils.sbert_backend as sbert_backend
+import media_rs.training.features.sbert_onnx as sbert_onnx
+from media_rs.utils.sbert_backend import (
+    PARITY_REPORT,
+    SbertBackend,
+    load_sbert_model,
+    onnx_file_name,
+    read_parity_report
+)
+from media_rs.training.features.sbert_onnx import compare_sbert_backends, report_sbert_backends
+
+
+@pytest.fixture
+def recorded_loads(monkeypatch):
+    calls = []
+
+    def fake_transformer(path, **kwargs):
+        calls.append((path, kwargs))
+        return object()
+
+    monkeypatch.setattr(sbert_backend, "SentenceTransformer", fake_transformer)
+    return calls
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    (tmp_path / "onnx").mkdir()
+    (tmp_path / "onnx" / "model.onnx").touch()
+    (tmp_path / onnx_file_name(SbertBackend.ONNX_INT8, "avx2")).touch()
+    write_parity(tmp_path, {
+        onnx_file_name(SbertBackend.ONNX): True,
+        onnx_file_name(SbertBackend.ONNX_INT8, "avx2"): True,
+    })
+    return tmp_path
+
+
+def write_parity(model_dir, passed):
+    reports = {name: {"min_cosine": 0.999 if ok else 0.9, "passed": ok} for name, ok in passed.items()}
+    (model_dir / PARITY_REPORT).write_text(json.dumps(reports))
+
+
+def test_torch_backend(recorded_loads, model_dir):
+    load_sbert_model(model_dir, "torch")
+    assert recorded_loads == [(str(model_dir), {})]
+
+
+@pytest.mark.parametrize("backend", [SbertBackend.ONNX, SbertBackend.ONNX_INT8])
+def test_onnx_backends(recorded_loads, model_dir, backend, monkeypatch):
+    monkeypatch.setattr(sbert_backend, "SBERT_QUANTIZATION", "avx2")
+    load_sbert_model(model_dir, backend)
+
+    path, kwargs = recorded_loads[0]
+    assert kwargs["backend"] == "onnx"
+    assert kwargs["model_kwargs"]["file_name"] == onnx_file_name(backend, "avx2")
+
+
+def test_missing_export_falls_back_to_torch(recorded_loads, tmp_path):
+    load_sbert_model(tmp_path, SbertBackend.ONNX_INT8)
+    assert recorded_loads == [(str(tmp_path), {})]
+
+
+@pytest.mark.parametrize("report", [None, False])
+def test_export_without_passing_parity_falls_back_to_torch(recorded_loads, model_dir, monkeypatch, report):
+    monkeypatch.setattr(sbert_backend, "SBERT_QUANTIZATION", "avx2")
+    int8 = onnx_file_name(SbertBackend.ONNX_INT8, "avx2")
+    if report is None:
+        (model_dir / PARITY_REPORT).unlink()
+    else:
+        write_parity(model_dir, {int8: report})
+
+    load_sbert_model(model_dir, SbertBackend.ONNX_INT8)
+    assert recorded_loads == [(str(model_dir), {})]
+
+
+def test_invalid_backend(model_dir):
+    with pytest.raises(ValueError):
+        load_sbert_model(model_dir, "tensorrt")
+
+
+class FakeModel:
+    def __init__(self, noise=0.0):
+        self.noise = noise
+
+    def encode(self, texts, convert_to_numpy=True, normalize_embeddings=True):
+        emb = np.array([[len(t), 1.0, 2.0] for t in texts], dtype=np.float32)
+        emb[:, 1] += self.noise
+        return emb / np.linalg.norm(emb, axis=1, keepdims=True)
+
+
+def test_compare_sbert_backends_parity():
+    texts = ["space opera", "romantic comedy", "heist"]
+
+    same = compare_sbert_backends(FakeModel(), FakeModel(), texts, threshold=0.99, repeats=1)
+    assert same["min_cosine"] == pytest.approx(1.0)
+    assert same["passed"] == 1.0
+    assert same["reference_ms"] >= 0 and same["candidate_ms"] >= 0
+
+    drifted = compare_sbert_backends(FakeModel(), FakeModel(noise=5.0), texts, threshold=0.99, repeats=1)
+    assert drifted["min_cosine"] < 0.99
+    assert drifted["passed"] == 0.0
+
+
+def test_report_sbert_backends_writes_parity(model_dir, monkeypatch):
+    monkeypatch.setattr(sbert_onnx, "load_sbert_model", lambda path, backend: FakeModel())
+    monkeypatch.setattr(
+        sbert_onnx,
+        "SentenceTransformer",
+        lambda path, backend, model_kwargs: FakeModel(noise=0.0 if model_kwargs["file_name"] == "onnx/model.onnx" else 5.0)
+    )
+    monkeypatch.setattr(sbert_onnx, "onnx_file_name", lambda backend: onnx_file_name(backend, "avx2"))
+
+    report_sbert_backends(model_dir, ["space opera", "heist"], threshold=0.99)
+
+    parity = read_parity_report(model_dir)
+    assert parity["onnx/model.onnx"]["passed"] is True
+    assert parity[onnx_file_name(SbertBackend.ONNX_INT8, "avx2")]["passed"] is False
+
+
+def test_onnx_round_trip_parity(tmp_path):
+    # Only runs where the ONNX extras and the model are available
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("optimum")
+    from sentence_transformers import SentenceTransformer
+    from media_rs.training.features.sbert_onnx import export_sbert_onnx
+
+    try:
+        model = SentenceTransformer("all-MiniLM-L6-v2")
+    except Exception:
+        pytest.skip("SBERT model not available")
+
+    model.save(str(tmp_path))
+    export_sbert_onnx(tmp_path, "avx2")
+
+    texts = ["a heist in space", "a quiet family drama"]
+    for backend in (SbertBackend.ONNX, SbertBackend.ONNX_INT8):
+        candidate = SentenceTransformer(
+            str(tmp_path), backend="onnx",
+            model_kwargs={"file_name": onnx_file_name(backend, "avx2")}
+        )
+        report = compare_sbert_backends(model, candidate, texts, threshold=0.95, repeats=1)
+        assert report["passed"] == 1.0
@@ -0,0 +1,118 @@
+import os
+import subprocess
+import multiprocessing
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from media_rs.utils.shm_store import (
+    KEY_FILE_PREFIX,
+    attach_npy,
+    attach_csr,
+    prune_store,
+    register_keys,
+)
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    return tmp_path / "shm"
+
+
+@pytest.fixture
+def npy_file(tmp_path):
+    path = tmp_path / "emb.npy"
+    np.save(path, np.arange(20, dtype=np.float32).reshape(5, 4))
+    return path
+
+
+@pytest.fixture
+def npz_file(tmp_path):
+    path = tmp_path / "matrix.npz"
+    matrix = sp.random(30, 20, density=0.2, format="csr", dtype=np.float32, random_state=0)
+    sp.save_npz(path, matrix)
+    return path, matrix
+
+
+def _is_mapped(arr):
+    # Views over a memmap keep it in their chain of bases
+    while arr is not None:
+        if isinstance(arr, np.memmap):
+            return True
+        arr = getattr(arr, "base", None)
+    return False
+
+
+def test_attach_npy(npy_file, store_dir):
+    arr = attach_npy(npy_file, "k1", store_dir)
+
+    assert isinstance(arr, np.memmap)
+    assert not arr.flags.writeable
+    np.testing.assert_array_equal(arr, np.load(npy_file))
+    assert (store_dir / "k1.npy").exists()
+
+    # Second attach maps the stored copy
+    again = attach_npy(npy_file, "k1", store_dir)
+    np.testing.assert_array_equal(again, arr)
+
+
+def test_attach_csr(npz_file, store_dir):
+    path, matrix = npz_file
+    attached = attach_csr(path, "k2", store_dir)
+
+    assert attached.shape == matrix.shape
+    assert (attached != matrix).nnz == 0
+    assert not attached.data.flags.writeable
+
+    # Components stay memory-mapped, not copied into the process
+    for name in ("data", "indices", "indptr"):
+        assert _is_mapped(getattr(attached, name))
+
+    # Row slicing used by the collaborative models still works
+    assert (attached[[0, 3]] != matrix[[0, 3]]).nnz == 0
+
+
+def _attach_sum(args):
+    path, store_dir = args
+    return float(attach_npy(path, "shared", store_dir).sum())
+
+
+def test_concurrent_processes_materialize_once(npy_file, store_dir):
+    ctx = multiprocessing.get_context("fork")
+    with ctx.Pool(4) as pool:
+        sums = pool.map(_attach_sum, [(npy_file, store_dir)] * 8)
+
+    assert sums == [float(np.load(npy_file).sum())] * 8
+    # No temporary files left behind
+    assert sorted(p.name for p in store_dir.iterdir()) == ["shared.npy", "shared.npy.lock"]
+
+
+def test_prune_store(npy_file, npz_file, store_dir):
+    attach_npy(npy_file, "old", store_dir)
+    attach_npy(npy_file, "new", store_dir)
+    attach_csr(npz_file[0], "oldcsr", store_dir)
+
+    prune_store(["new"], store_dir)
+
+    assert (store_dir / "new.npy").exists()
+    assert not (store_dir / "old.npy").exists()
+    assert not (store_dir / "oldcsr_csr").exists()
+
+
+def test_prune_store_keeps_keys_of_other_processes(npy_file, store_dir):
+    for key in ("mine", "other", "exited"):
+        attach_npy(npy_file, key, store_dir)
+
+    # Registrations of this process are replaced by keep_keys
+    register_keys(["exited"], store_dir, replace=True)
+    (store_dir / f"{KEY_FILE_PREFIX}{os.getppid()}").write_text("other")
+    exited = subprocess.Popen(["true"])
+    exited.wait()
+    (store_dir / f"{KEY_FILE_PREFIX}{exited.pid}").write_text("exited")
+
+    prune_store(["mine"], store_dir)
+
+    assert (store_dir / "mine.npy").exists()
+    assert (store_dir / "other.npy").exists()
+    assert not (store_dir / "exited.npy").exists()
+    assert not (store_dir / f"{KEY_FILE_PREFIX}{exited.pid}").exists()
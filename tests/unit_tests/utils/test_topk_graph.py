@@ -0,0 +1,83 @@
+# tests/unit_tests/utils/test_topk_graph.py
+import pytest
+import numpy as np
+
+from media_rs.utils.topk_graph import TopKGraph, topk_neighbours
+
+
+# -----------------------------
+# Fixtures
+# -----------------------------
+@pytest.fixture
+def topk_dict():
+    return {
+        0: [(1, 0.9), (2, 0.8), (3, 0.7)],
+        1: [(0, 0.9), (2, 0.85)],
+        2: [(0, 0.8), (1, 0.85)],
+        3: [(0, 0.7)],
+    }
+
+
+# -----------------------------
+# Tests
+# -----------------------------
+def test_from_dict_layout(topk_dict):
+    graph = TopKGraph.from_dict(topk_dict)
+
+    assert len(graph) == 4
+    assert graph.k == 3
+    assert graph.indices.dtype == np.int32
+    assert graph.scores.dtype == np.float32
+
+    # Short rows are padded with -1
+    np.testing.assert_array_equal(graph.indices[3], [0, -1, -1])
+
+
+def test_round_trip(topk_dict):
+    graph = TopKGraph.from_dict(topk_dict)
+    result = graph.to_dict()
+
+    assert result.keys() == topk_dict.keys()
+    for item_id, neighbours in topk_dict.items():
+        assert [n for n, _ in result[item_id]] == [n for n, _ in neighbours]
+        np.testing.assert_allclose(
+            [s for _, s in result[item_id]],
+            [s for _, s in neighbours],
+            rtol=1e-6,
+        )
+
+
+def test_recommend_matches_dict(topk_dict):
+    graph = TopKGraph.from_dict(topk_dict)
+
+    for item_id in topk_dict:
+        for top_n in (1, 2, 10):
+            res = topk_neighbours(graph, item_id, top_n)
+            expected = topk_neighbours(topk_dict, item_id, top_n)
+            assert [n for n, _ in res] == [n for n, _ in expected]
+            for n, s in res:
+                assert isinstance(n, int)
+                assert isinstance(s, float)
+
+
+def test_float16_scores(topk_dict):
+    graph = TopKGraph.from_dict(topk_dict, score_dtype=np.float16)
+    assert graph.scores.dtype == np.float16
+    assert graph.recommend(0, 1)[0][1] == pytest.approx(0.9, abs=1e-3)
+
+
+def test_save_and_load_mmap(topk_dict, tmp_path):
+    graph = TopKGraph.from_dict(topk_dict)
+    graph.save(tmp_path / "item_topk_cf")
+
+    assert (tmp_path / "item_topk_cf_indices.npy").exists()
+    assert (tmp_path / "item_topk_cf_scores.npy").exists()
+
+    loaded = TopKGraph.load(tmp_path / "item_topk_cf")
+    assert isinstance(loaded.indices, np.memmap)
+    assert loaded.recommend(1, 2) == graph.recommend(1, 2)
+
+
+def test_shape_mismatch():
+    with pytest.raises(ValueError):
+        TopKGraph(np.zeros((2, 3), dtype=np.int32), np.zeros((2, 2), dtype=np.float32))